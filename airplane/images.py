@@ -0,0 +1,173 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .models import Airplane
+
+logger = logging.getLogger(__name__)
+
+# variant field -> (resized to a thumbnail, format, None keeps the original one)
+VARIANTS = {
+    "thumbnail": (True, None),
+    "thumbnail_webp": (True, "WEBP"),
+    "image_webp": (False, "WEBP"),
+}
+EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp"}
+
+
+def variant_name(image_name, field_name, image_format):
+    """`uploads/airplanes/a.jpg` -> `uploads/airplanes/<field_name>/a.<ext>`"""
+    directory, filename = os.path.split(image_name)
+    stem = os.path.splitext(filename)[0].rstrip(".")
+    return os.path.join(directory, field_name, f"{stem}.{EXTENSIONS[image_format]}")
+
+
+def variants_outdated(airplane):
+    if not airplane.image:
+        return any(getattr(airplane, field_name) for field_name in VARIANTS)
+
+    return airplane.image_webp.name != variant_name(
+        airplane.image.name, "image_webp", "WEBP"
+    )
+
+
+def encode(image, image_format):
+    if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    elif image.mode not in ("RGB", "RGBA", "L", "LA"):
+        image = image.convert("RGBA")
+
+    quality = settings.AIRPLANE_IMAGE_QUALITY
+    if image_format == "WEBP":
+        options = {"quality": quality, "method": 4}
+    elif image_format == "JPEG":
+        options = {"quality": quality, "optimize": True, "progressive": True}
+    else:
+        options = {"optimize": True}
+
+    output = io.BytesIO()
+    image.save(output, image_format, **options)
+    return output.getvalue()
+
+
+def render_variants(file, image_name):
+    """Encoded variants of the image in `file`, by field name"""
+    with Image.open(file) as original:
+        original_format = "JPEG" if original.format == "JPEG" else "PNG"
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    thumbnail = image.copy()
+    size = settings.AIRPLANE_THUMBNAIL_SIZE
+    thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    variants = {}
+    for field_name, (resized, image_format) in VARIANTS.items():
+        image_format = image_format or original_format
+        variants[field_name] = (
+            variant_name(image_name, field_name, image_format),
+            encode(thumbnail if resized else image, image_format),
+        )
+
+    return variants
+
+
+def process_airplane_image(airplane_id, force=False):
+    """
+    Store thumbnails and WebP variants of the image of the airplane.
+
+    Variants are only recorded if the image was not replaced meanwhile,
+    files of outdated variants are removed. Return whether the airplane
+    was updated.
+    """
+    airplane = Airplane.objects.filter(pk=airplane_id).first()
+    if airplane is None or not (force or variants_outdated(airplane)):
+        return False
+
+    storage = Airplane._meta.get_field("image").storage
+    image_name = airplane.image.name
+    names = dict.fromkeys(VARIANTS)
+    if image_name:
+        with airplane.image.open("rb") as file:
+            variants = render_variants(file, image_name)
+        for field_name, (name, content) in variants.items():
+            storage.delete(name)
+            names[field_name] = storage.save(name, ContentFile(content))
+
+    updated = Airplane.objects.filter(pk=airplane_id, image=image_name).update(
+        updated_at=timezone.now(), **names
+    )
+    if updated:
+        stale = {getattr(airplane, field_name).name for field_name in VARIANTS}
+        stale -= set(names.values())
+    else:
+        # the image was replaced meanwhile, its own processing takes over
+        stale = set(names.values())
+    for name in stale:
+        if name:
+            storage.delete(name)
+
+    return bool(updated)
+
+
+def _process_logged(airplane_id):
+    try:
+        return process_airplane_image(airplane_id)
+    except Exception:
+        logger.exception("Processing the image of airplane %s failed", airplane_id)
+        return False
+
+
+def _process_in_worker(airplane_id):
+    close_old_connections()
+    try:
+        return _process_logged(airplane_id)
+    finally:
+        close_old_connections()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_image_executor():
+    """Worker pool processing images, None when processed in the request"""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None and settings.AIRPLANE_IMAGE_WORKERS:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.AIRPLANE_IMAGE_WORKERS,
+                thread_name_prefix="airplane-images",
+            )
+
+        return _executor
+
+
+def schedule_airplane_image(airplane_id):
+    executor = get_image_executor()
+    if executor is None:
+        return _process_logged(airplane_id)
+
+    return executor.submit(_process_in_worker, airplane_id)
+
+
+@receiver(setting_changed)
+def reset_image_executor(setting, **kwargs):
+    global _executor
+
+    if setting.startswith("AIRPLANE_IMAGE_"):
+        with _executor_lock:
+            if _executor is not None:
+                _executor.shutdown(wait=True)
+            _executor = None
@@ -0,0 +1,49 @@
+from django.core.management import BaseCommand
+
+from airplane.images import process_airplane_image, variants_outdated
+from airplane.models import Airplane
+
+
+class Command(BaseCommand):
+    """Django command to generate missing airplane thumbnails and WebP images"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report airplanes with outdated images without processing them.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate the variants of every image.",
+        )
+
+    def handle(self, *args, **options):
+        processed = failed = 0
+        for airplane in Airplane.objects.order_by("id").iterator():
+            if not (options["force"] and airplane.image) and not variants_outdated(
+                airplane
+            ):
+                continue
+
+            self.stdout.write(f"Airplane {airplane.id}: {airplane.image.name or '-'}")
+            if options["dry_run"]:
+                processed += 1
+                continue
+
+            try:
+                process_airplane_image(airplane.id, force=options["force"])
+            except Exception as error:
+                failed += 1
+                self.stderr.write(f"Airplane {airplane.id}: {error}")
+            else:
+                processed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Airplane images: {processed} outdated"
+                + (" (dry run)" if options["dry_run"] else " processed")
+                + (f", {failed} failed" if failed else "")
+            )
+        )
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.5 on 2026-10-18 20:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airplane", "0002_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="airplane",
+            name="image_webp",
+            field=models.ImageField(
+                blank=True, editable=False, null=True, upload_to=""
+            ),
+        ),
+        migrations.AddField(
+            model_name="airplane",
+            name="thumbnail",
+            field=models.ImageField(
+                blank=True, editable=False, null=True, upload_to=""
+            ),
+        ),
+        migrations.AddField(
+            model_name="airplane",
+            name="thumbnail_webp",
+            field=models.ImageField(
+                blank=True, editable=False, null=True, upload_to=""
+            ),
+        ),
+    ]
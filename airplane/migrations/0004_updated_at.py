@@ -0,0 +1,17 @@
+# Generated by Django 4.2.5 on 2026-10-18 20:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airplane", "0003_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="airplane",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
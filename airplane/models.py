@@ -34,6 +34,11 @@ class Airplane(models.Model):
     airline = models.ForeignKey(Airline, on_delete=models.CASCADE)
     airplane_type = models.ForeignKey(AirplaneType, on_delete=models.CASCADE)
     image = models.ImageField(null=True, upload_to=airplane_image_file_path)
+    # generated from `image` in the background, see airplane.images
+    thumbnail = models.ImageField(null=True, blank=True, editable=False)
+    thumbnail_webp = models.ImageField(null=True, blank=True, editable=False)
+    image_webp = models.ImageField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     @property
     def capacity(self):
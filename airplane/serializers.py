@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from airport_API_service.serializers import Computed, ValuesListSerializer
 from .models import AirplaneType, Airplane, Airline
 
 
@@ -33,6 +34,21 @@ class AirplaneListSerializer(AirplaneSerializer):
     airplane_type = serializers.CharField(source="airplane_type.name", read_only=True)
     airline_name = serializers.CharField(source="airline.name", read_only=True)
 
+    class Meta:
+        model = Airplane
+        fields = (
+            "id",
+            "name",
+            "rows",
+            "seats_in_row",
+            "airplane_type",
+            "airline_name",
+            "thumbnail",
+            "thumbnail_webp",
+        )
+
+
+class AirplaneDetailSerializer(AirplaneListSerializer):
     class Meta:
         model = Airplane
         fields = (
@@ -43,4 +59,25 @@ class AirplaneListSerializer(AirplaneSerializer):
             "airplane_type",
             "airline_name",
             "image",
+            "image_webp",
+            "thumbnail",
+            "thumbnail_webp",
         )
+
+
+class AirplaneImageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Airplane
+        fields = ("id", "image")
+        extra_kwargs = {"image": {"required": True, "allow_null": False}}
+
+
+# Airplane.__str__ from the columns of the row
+AIRPLANE_STR = Computed(
+    ("name", "rows", "seats_in_row"),
+    lambda name, rows, seats_in_row: f"{name}, capacity: {rows * seats_in_row}",
+)
+
+
+class AirplaneListValuesSerializer(ValuesListSerializer):
+    serializer_class = AirplaneListSerializer
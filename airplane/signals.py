@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from airport_API_service.cache import invalidate_cache_on_change
+from .images import schedule_airplane_image, variants_outdated
+from .models import Airline, Airplane, AirplaneType
+
+invalidate_cache_on_change(Airline, AirplaneType)
+
+
+@receiver(post_save, sender=Airplane)
+def process_uploaded_image(sender, instance, raw=False, **kwargs):
+    if not raw and variants_outdated(instance):
+        transaction.on_commit(lambda: schedule_airplane_image(instance.pk))
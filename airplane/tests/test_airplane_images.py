@@ -0,0 +1,288 @@
+import io
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airplane import images
+from airplane.images import (
+    VARIANTS,
+    process_airplane_image,
+    schedule_airplane_image,
+    variant_name,
+)
+from airplane.models import Airplane
+from airplane.uploads import ImageUploadHandler
+from airplane.tests.test_airplane_api import sample_airplane
+
+AIRPLANE_URL = reverse("airplane:airplane-list")
+
+
+def get_detail_url(airplane_id):
+    return reverse("airplane:airplane-detail", args=[airplane_id])
+
+
+def temporary_media_root(test):
+    """MEDIA_ROOT in a temporary directory until the end of `test`"""
+    directory = tempfile.TemporaryDirectory()
+    test.addCleanup(directory.cleanup)
+    media_settings = override_settings(MEDIA_ROOT=directory.name)
+    media_settings.enable()
+    test.addCleanup(media_settings.disable)
+    return Path(directory.name)
+
+
+def image_file(name="plane.jpg", size=(1200, 800), image_format="JPEG", mode="RGB"):
+    content = io.BytesIO()
+    Image.new(mode, size, "red").save(content, image_format)
+    return SimpleUploadedFile(name, content.getvalue())
+
+
+@override_settings(AIRPLANE_IMAGE_WORKERS=0, AIRPLANE_THUMBNAIL_SIZE=320)
+class AirplaneImageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.media_root = temporary_media_root(self)
+
+    def upload(self, airplane, file=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            airplane.image = file or image_file()
+            airplane.save()
+        airplane.refresh_from_db()
+        return airplane
+
+    def open(self, field):
+        return Image.open(self.media_root / field.name)
+
+    def test_variants_generated_on_upload(self):
+        airplane = self.upload(sample_airplane())
+
+        with self.open(airplane.thumbnail) as thumbnail:
+            self.assertEqual((thumbnail.format, thumbnail.size), ("JPEG", (320, 213)))
+        with self.open(airplane.thumbnail_webp) as thumbnail:
+            self.assertEqual((thumbnail.format, thumbnail.size), ("WEBP", (320, 213)))
+        with self.open(airplane.image_webp) as image:
+            self.assertEqual((image.format, image.size), ("WEBP", (1200, 800)))
+        self.assertEqual(
+            airplane.thumbnail.name,
+            variant_name(airplane.image.name, "thumbnail", "JPEG"),
+        )
+
+    def test_transparent_thumbnail_kept_as_png(self):
+        airplane = self.upload(
+            sample_airplane(),
+            image_file("plane.png", image_format="PNG", mode="RGBA"),
+        )
+
+        with self.open(airplane.thumbnail) as thumbnail:
+            self.assertEqual((thumbnail.format, thumbnail.mode), ("PNG", "RGBA"))
+
+    def test_saving_without_new_image_keeps_variants(self):
+        airplane = self.upload(sample_airplane())
+
+        with mock.patch.object(images, "render_variants") as render_variants:
+            with self.captureOnCommitCallbacks(execute=True):
+                airplane.rows = 10
+                airplane.save()
+
+        render_variants.assert_not_called()
+
+    def test_replaced_image_variants_removed(self):
+        airplane = self.upload(sample_airplane())
+        outdated = [getattr(airplane, field).name for field in VARIANTS]
+
+        airplane = self.upload(airplane, image_file("other.jpg"))
+
+        for name in outdated:
+            self.assertFalse((self.media_root / name).exists())
+        for field in VARIANTS:
+            self.assertTrue((self.media_root / getattr(airplane, field).name).exists())
+
+    def test_removed_image_clears_variants(self):
+        airplane = self.upload(sample_airplane())
+        thumbnail = airplane.thumbnail.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            airplane.image = None
+            airplane.save()
+
+        airplane.refresh_from_db()
+        self.assertFalse(airplane.thumbnail)
+        self.assertFalse((self.media_root / thumbnail).exists())
+
+    def test_image_replaced_while_processing(self):
+        airplane = self.upload(sample_airplane())
+        Airplane.objects.filter(id=airplane.id).update(
+            image="uploads/airplanes/new.jpg"
+        )
+
+        def replace_image(*args):
+            Airplane.objects.filter(id=airplane.id).update(
+                image="uploads/airplanes/newer.jpg"
+            )
+            return {
+                "image_webp": ("uploads/airplanes/image_webp/new.webp", b"webp"),
+            }
+
+        with mock.patch.object(images, "render_variants", side_effect=replace_image):
+            with mock.patch("django.db.models.fields.files.FieldFile.open"):
+                updated = process_airplane_image(airplane.id)
+
+        self.assertFalse(updated)
+        airplane.refresh_from_db()
+        self.assertNotIn("new.webp", airplane.image_webp.name)
+        self.assertFalse(
+            (self.media_root / "uploads/airplanes/image_webp/new.webp").exists()
+        )
+
+    def test_invalid_image_logged(self):
+        with self.assertLogs("airplane.images", "ERROR"):
+            airplane = self.upload(
+                sample_airplane(), SimpleUploadedFile("plane.jpg", b"not an image")
+            )
+
+        self.assertFalse(airplane.thumbnail)
+
+    def test_processed_by_worker_pool(self):
+        with override_settings(AIRPLANE_IMAGE_WORKERS=1):
+            with mock.patch.object(
+                images,
+                "process_airplane_image",
+                side_effect=lambda airplane_id: threading.current_thread().name,
+            ):
+                future = schedule_airplane_image(1)
+
+                self.assertTrue(future.result(timeout=5).startswith("airplane-images"))
+
+    def test_backfill_command(self):
+        airplanes = [self.upload(sample_airplane()) for _ in range(2)]
+        Airplane.objects.filter(id=airplanes[0].id).update(
+            thumbnail=None, thumbnail_webp=None, image_webp=None
+        )
+        out = StringIO()
+
+        call_command("backfill_airplane_images", "--dry-run", stdout=out)
+        self.assertIn("1 outdated (dry run)", out.getvalue())
+
+        call_command("backfill_airplane_images", stdout=out)
+        airplanes[0].refresh_from_db()
+        self.assertTrue(airplanes[0].thumbnail)
+        self.assertIn("1 outdated processed", out.getvalue())
+
+    def test_list_returns_thumbnails_and_detail_full_image(self):
+        user = get_user_model().objects.create_user("test@test.com", "testpass")
+        client = APIClient()
+        client.force_authenticate(user)
+        airplane = self.upload(sample_airplane())
+
+        listed = client.get(AIRPLANE_URL).json()[0]
+        detail = client.get(get_detail_url(airplane.id))
+
+        self.assertNotIn("image", listed)
+        self.assertEqual(
+            listed["thumbnail"], f"http://testserver/media/{airplane.thumbnail.name}"
+        )
+        self.assertTrue(listed["thumbnail_webp"].endswith(".webp"))
+        self.assertEqual(detail.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            detail.data["image"], f"http://testserver/media/{airplane.image.name}"
+        )
+        self.assertTrue(detail.data["image_webp"].endswith(".webp"))
+
+
+@override_settings(AIRPLANE_IMAGE_WORKERS=0, AIRPLANE_IMAGE_MAX_SIZE=1024 * 1024)
+class AirplaneImageUploadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.media_root = temporary_media_root(self)
+        self.admin = get_user_model().objects.create_superuser(
+            "admin@test.com", "testpass"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.airplane = sample_airplane()
+        self.url = reverse("airplane:airplane-upload-image", args=[self.airplane.id])
+
+    def upload(self, file):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, {"image": file}, format="multipart")
+
+    def test_upload_image(self):
+        response = self.upload(image_file())
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.airplane.refresh_from_db()
+        self.assertTrue((self.media_root / self.airplane.image.name).exists())
+        self.assertTrue(self.airplane.thumbnail)
+        self.assertEqual(
+            response.data["image"],
+            f"http://testserver/media/{self.airplane.image.name}",
+        )
+
+    def test_responds_before_processing(self):
+        processing = threading.Event()
+        release = threading.Event()
+
+        def process(airplane_id):
+            processing.set()
+            release.wait(5)
+
+        with override_settings(AIRPLANE_IMAGE_WORKERS=1):
+            with mock.patch.object(images, "_process_logged", side_effect=process):
+                response = self.upload(image_file())
+                self.assertTrue(processing.wait(5))
+                self.assertIsNone(response.data["thumbnail"])
+                release.set()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+    def test_not_an_image_rejected(self):
+        response = self.upload(SimpleUploadedFile("plane.jpg", b"GIF89a" + bytes(100)))
+
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        self.airplane.refresh_from_db()
+        self.assertFalse(self.airplane.image)
+
+    def test_image_too_large_rejected_while_reading(self):
+        with override_settings(AIRPLANE_IMAGE_MAX_SIZE=1000):
+            response = self.upload(image_file(size=(2000, 2000), image_format="PNG"))
+
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.airplane.refresh_from_db()
+        self.assertFalse(self.airplane.image)
+
+    def test_body_too_large_rejected_before_reading(self):
+        with override_settings(AIRPLANE_IMAGE_MAX_SIZE=1000):
+            with mock.patch.object(ImageUploadHandler, "receive_data_chunk") as read:
+                response = self.client.post(
+                    self.url,
+                    {"image": SimpleUploadedFile("plane.jpg", bytes(200 * 1024))},
+                    format="multipart",
+                )
+
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        read.assert_not_called()
+
+    def test_image_required(self):
+        response = self.client.post(self.url, {}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_upload_admin_only(self):
+        user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client.force_authenticate(user)
+
+        response = self.upload(image_file())
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airplane.models import Airplane
+from airplane.tests.test_airplane_api import sample_airplane
+
+AIRPLANE_URL = reverse("airplane:airplane-list")
+
+
+class AirplaneValuesSerializerParityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def get(self, fast, params=None):
+        cache.clear()
+        with override_settings(FAST_LIST_SERIALIZERS=fast):
+            return self.client.get(AIRPLANE_URL, params)
+
+    def test_airplane_list_parity(self):
+        sample_airplane(rows=10, seats_in_row=4)
+        airplane = sample_airplane()
+        Airplane.objects.filter(id=airplane.id).update(
+            image="uploads/airplanes/airplane.jpg",
+            thumbnail="uploads/airplanes/thumbnail/airplane.jpg",
+        )
+
+        fast, plain = self.get(fast=True), self.get(fast=False)
+
+        self.assertEqual(fast.content, plain.content)
+        self.assertIn(
+            b"http://testserver/media/uploads/airplanes/thumbnail/", fast.content
+        )
+
+    def test_filtered_airplane_list_parity(self):
+        sample_airplane(name="Boeing")
+        sample_airplane(name="Airbus")
+
+        fast = self.get(fast=True, params={"name": "boe"})
+        plain = self.get(fast=False, params={"name": "boe"})
+
+        self.assertEqual(fast.content, plain.content)
+        self.assertEqual(len(fast.json()), 1)
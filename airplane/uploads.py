@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.core.files.uploadhandler import StopUpload, TemporaryFileUploadHandler
+
+# leading bytes of the accepted image formats
+IMAGE_SIGNATURES = {
+    "JPEG": lambda data: data.startswith(b"\xff\xd8\xff"),
+    "PNG": lambda data: data.startswith(b"\x89PNG\r\n\x1a\n"),
+    "WEBP": lambda data: data[:4] == b"RIFF" and data[8:12] == b"WEBP",
+}
+
+# room for the multipart boundaries and headers around the image
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+def image_format(data):
+    for name, matches in IMAGE_SIGNATURES.items():
+        if matches(data):
+            return name
+    return None
+
+
+def upload_too_large(request):
+    """Whether the declared body is too large, before reading any of it"""
+    try:
+        content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return False
+    return content_length > settings.AIRPLANE_IMAGE_MAX_SIZE + MULTIPART_OVERHEAD
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+    """
+    Write uploaded images chunk by chunk to a temporary file, which storage
+    then moves in place. Reading the body stops at the first chunk that is
+    not an image or once the file exceeds `AIRPLANE_IMAGE_MAX_SIZE`, the
+    reason is kept in `error`.
+    """
+
+    TOO_LARGE = "too_large"
+    UNSUPPORTED = "unsupported"
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_size = settings.AIRPLANE_IMAGE_MAX_SIZE
+        self.error = None
+        self.received = 0
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        if start == 0 and image_format(raw_data) is None:
+            self.stop(self.UNSUPPORTED)
+
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            self.stop(self.TOO_LARGE)
+
+        return super().receive_data_chunk(raw_data, start)
+
+    def stop(self, error):
+        self.error = error
+        self.file.close()
+        # leave the rest of the body unread
+        raise StopUpload(connection_reset=True)
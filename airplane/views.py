@@ -1,38 +1,72 @@
-from rest_framework import mixins
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework import mixins, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from airport_API_service.cache import CachedListModelMixin
+from airport_API_service.conditional import (
+    ConditionalListModelMixin,
+    ConditionalRetrieveModelMixin,
+)
+from airport_API_service.views import ValuesListModelMixin
 from flight.permissions import IsAdminOrIfAuthenticatedReadOnly
 from .models import AirplaneType, Airplane, Airline
 from .serializers import (
     AirplaneTypeSerializer,
     AirplaneSerializer,
     AirplaneListSerializer,
+    AirplaneListValuesSerializer,
+    AirplaneDetailSerializer,
+    AirplaneImageSerializer,
     AirlineSerializer,
 )
+from .uploads import ImageUploadHandler, upload_too_large
 
 
-class AirlineViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
+class AirlineViewSet(
+    CachedListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    GenericViewSet,
+):
     queryset = Airline.objects.all()
     serializer_class = AirlineSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Airline,)
 
 
 class AirplaneTypeViewSet(
-    mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet
+    CachedListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    GenericViewSet,
 ):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (AirplaneType,)
 
 
-class AirplaneViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
+class AirplaneViewSet(
+    ConditionalListModelMixin,
+    ConditionalRetrieveModelMixin,
+    ValuesListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    GenericViewSet,
+):
     queryset = Airplane.objects.select_related("airplane_type", "airline")
     serializer_class = AirplaneSerializer
+    values_serializer_class = AirplaneListValuesSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    conditional_models = (Airline, AirplaneType)
 
     def get_queryset(self):
         name = self.request.query_params.get("name")
-        queryset = self.queryset
+        queryset = super().get_queryset()
 
         if name:
             queryset = queryset.filter(name__icontains=name)
@@ -43,4 +77,58 @@ class AirplaneViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericVie
         if self.action == "list":
             return AirplaneListSerializer
 
+        if self.action == "retrieve":
+            return AirplaneDetailSerializer
+
+        if self.action == "upload_image":
+            return AirplaneImageSerializer
+
         return AirplaneSerializer
+
+    @staticmethod
+    def image_rejected(error):
+        if error == ImageUploadHandler.TOO_LARGE:
+            return Response(
+                {"detail": "image is larger than allowed"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        return Response(
+            {"detail": "image must be a JPEG, PNG or WebP file"},
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+
+    @extend_schema(
+        request={"multipart/form-data": AirplaneImageSerializer},
+        responses={
+            202: AirplaneDetailSerializer,
+            413: OpenApiResponse(description="Image is larger than allowed"),
+            415: OpenApiResponse(description="Not a JPEG, PNG or WebP image"),
+        },
+    )
+    @action(
+        methods=["POST"],
+        detail=True,
+        url_path="upload-image",
+        parser_classes=(MultiPartParser,),
+    )
+    def upload_image(self, request, pk=None):
+        """Upload image to specific airplane, thumbnails follow in the background"""
+        airplane = self.get_object()
+        if upload_too_large(request):
+            return self.image_rejected(ImageUploadHandler.TOO_LARGE)
+
+        handler = ImageUploadHandler(request)
+        request.upload_handlers = [handler]
+        serializer = self.get_serializer(airplane, data=request.data)
+        if handler.error:
+            return self.image_rejected(handler.error)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(
+            AirplaneDetailSerializer(
+                airplane, context=self.get_serializer_context()
+            ).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
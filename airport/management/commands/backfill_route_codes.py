@@ -0,0 +1,35 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from airport.models import Route
+from airport_API_service.cache import invalidate_model_cache
+
+
+class Command(BaseCommand):
+    """Django command to recompute stored route codes and display names"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report outdated routes without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            outdated = Route.refresh_display_fields(
+                Route.objects.select_for_update(of=("self",)),
+                commit=not options["dry_run"],
+            )
+            for route in outdated:
+                self.stdout.write(f"Route {route.id}: {route.code}")
+
+        if outdated and not options["dry_run"]:
+            invalidate_model_cache(sender=Route)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Route codes: {len(outdated)} outdated"
+                + (" (dry run)" if options["dry_run"] else " fixed")
+            )
+        )
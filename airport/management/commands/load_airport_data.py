@@ -0,0 +1,100 @@
+import gzip
+import sys
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from airport_API_service.loader import BulkLoader, LoadError
+
+
+class Command(BaseCommand):
+    """Django command to bulk load fixtures (JSON or NDJSON, optionally gzipped)"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "files",
+            nargs="+",
+            help="Fixture files, '-' reads standard input.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows written per statement (5000 by default).",
+        )
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            default=None,
+            help="Write with PostgreSQL COPY (the default on PostgreSQL).",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_false",
+            dest="copy",
+            help="Write with multi-row INSERTs.",
+        )
+        parser.add_argument(
+            "--skip-invalid",
+            action="store_true",
+            help="Skip tickets for seats the airplane does not have.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to load into.",
+        )
+
+    def open(self, path):
+        if path == "-":
+            return sys.stdin
+        if path.endswith(".gz"):
+            return gzip.open(path, "rt", encoding="utf-8")
+        return open(path, encoding="utf-8")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        try:
+            loader = BulkLoader(
+                batch_size=options["batch_size"],
+                use_copy=options["copy"],
+                skip_invalid=options["skip_invalid"],
+                using=options["database"],
+            )
+        except LoadError as error:
+            raise CommandError(error) from error
+        try:
+            streams = [self.open(path) for path in options["files"]]
+        except OSError as error:
+            raise CommandError(error) from error
+
+        started = time.perf_counter()
+        try:
+            stats = loader.load(streams)
+        except LoadError as error:
+            raise CommandError(error) from error
+        finally:
+            for stream in streams:
+                if stream is not sys.stdin:
+                    stream.close()
+
+        for label, (rows, seconds) in stats.items():
+            self.stdout.write(f"{label}: {self.rate(rows, seconds)}")
+        if loader.skipped:
+            self.stdout.write(f"Skipped {loader.skipped} invalid tickets")
+
+        total_rows = sum(rows for rows, _ in stats.values())
+        total_seconds = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Loaded {self.rate(total_rows, total_seconds)}")
+        )
+
+    @staticmethod
+    def rate(rows, seconds):
+        return (
+            f"{rows} rows in {seconds:.2f} s "
+            f"({rows / seconds if seconds else 0:,.0f} rows/s)"
+        )
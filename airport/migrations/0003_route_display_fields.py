@@ -0,0 +1,71 @@
+# Generated by Django 4.2.5 on 2026-10-18 19:38
+
+from django.db import migrations, models
+
+
+def populate_display_fields(apps, schema_editor):
+    Route = apps.get_model("airport", "Route")
+
+    routes = list(
+        Route.objects.select_related(
+            "source__city__country", "destination__city__country"
+        )
+    )
+    for route in routes:
+        source, destination = route.source, route.destination
+        route.source_name = source.name
+        route.source_city = f"{source.city.country.name}: {source.city.name}"
+        route.destination_name = destination.name
+        route.destination_city = (
+            f"{destination.city.country.name}: {destination.city.name}"
+        )
+        route.code = (
+            f"{route.source_city}: {source.airport_code} - "
+            f"{route.destination_city}: {destination.airport_code}"
+        )
+    Route.objects.bulk_update(
+        routes,
+        (
+            "code",
+            "source_name",
+            "source_city",
+            "destination_name",
+            "destination_city",
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0002_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="route",
+            name="code",
+            field=models.CharField(default="", editable=False, max_length=1040),
+        ),
+        migrations.AddField(
+            model_name="route",
+            name="destination_city",
+            field=models.CharField(default="", editable=False, max_length=512),
+        ),
+        migrations.AddField(
+            model_name="route",
+            name="destination_name",
+            field=models.CharField(default="", editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="route",
+            name="source_city",
+            field=models.CharField(default="", editable=False, max_length=512),
+        ),
+        migrations.AddField(
+            model_name="route",
+            name="source_name",
+            field=models.CharField(default="", editable=False, max_length=255),
+        ),
+        migrations.RunPython(populate_display_fields, migrations.RunPython.noop),
+    ]
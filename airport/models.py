@@ -1,6 +1,5 @@
 from django.db import models
-from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import extend_schema_field
+from django.utils import timezone
 
 
 class Country(models.Model):
@@ -17,6 +16,7 @@ class Country(models.Model):
 class City(models.Model):
     name = models.CharField(max_length=255, unique=True)
     country = models.ForeignKey(Country, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "city"
@@ -31,6 +31,7 @@ class Airport(models.Model):
     name = models.CharField(max_length=255, unique=True)
     airport_code = models.CharField(max_length=3, unique=True)
     city = models.ForeignKey(City, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["city"]
@@ -45,6 +46,21 @@ class Route(models.Model):
         Airport, on_delete=models.CASCADE, related_name="destination"
     )
     distance = models.IntegerField()
+    # display names copied from the airports, kept in sync by signals
+    code = models.CharField(max_length=1040, editable=False, default="")
+    source_name = models.CharField(max_length=255, editable=False, default="")
+    source_city = models.CharField(max_length=512, editable=False, default="")
+    destination_name = models.CharField(max_length=255, editable=False, default="")
+    destination_city = models.CharField(max_length=512, editable=False, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    DISPLAY_FIELDS = (
+        "code",
+        "source_name",
+        "source_city",
+        "destination_name",
+        "destination_city",
+    )
 
     class Meta:
         unique_together = ("source", "destination")
@@ -52,10 +68,47 @@ class Route(models.Model):
     def __str__(self):
         return f"{self.source} - {self.destination}"
 
-    @property
-    @extend_schema_field(OpenApiTypes.STR)
-    def code(self):
-        return (
-            f"{self.source.city}: {self.source.airport_code} - "
-            f"{self.destination.city}: {self.destination.airport_code}"
+    def set_display_fields(self):
+        """Copy names of the airports, their cities and countries"""
+        self.source_name = self.source.name
+        self.source_city = str(self.source.city)
+        self.destination_name = self.destination.name
+        self.destination_city = str(self.destination.city)
+        self.code = (
+            f"{self.source_city}: {self.source.airport_code} - "
+            f"{self.destination_city}: {self.destination.airport_code}"
         )
+
+    @classmethod
+    def refresh_display_fields(cls, queryset=None, commit=True):
+        """Recompute display fields of routes, return the outdated ones"""
+        if queryset is None:
+            queryset = cls.objects.all()
+
+        outdated = []
+        for route in queryset.select_related(
+            "source__city__country", "destination__city__country"
+        ):
+            stored = [getattr(route, field) for field in cls.DISPLAY_FIELDS]
+            route.set_display_fields()
+            if stored != [getattr(route, field) for field in cls.DISPLAY_FIELDS]:
+                outdated.append(route)
+
+        if commit:
+            # bulk_update skips `auto_now`
+            now = timezone.now()
+            for route in outdated:
+                route.updated_at = now
+            cls.objects.bulk_update(
+                outdated, (*cls.DISPLAY_FIELDS, "updated_at"), batch_size=500
+            )
+
+        return outdated
+
+    def save(
+        self, force_insert=False, force_update=False, using=None, update_fields=None
+    ):
+        self.set_display_fields()
+        if update_fields is not None:
+            update_fields = {*update_fields, *self.DISPLAY_FIELDS}
+        return super(Route, self).save(force_insert, force_update, using, update_fields)
@@ -0,0 +1,153 @@
+import re
+import threading
+
+from airport_API_service.cache import get_model_versions
+from .models import Airport, City, Country
+
+# Lower rank is better: an exact IATA code beats a name prefix, which beats
+# a match on the city or the country the airport is located in
+CODE_RANK = 0
+NAME_RANK = 1
+NAME_WORD_RANK = 2
+CITY_RANK = 3
+COUNTRY_RANK = 4
+
+TOKEN_SPLIT = re.compile(r"[\W_]+")
+
+
+def tokenize(text):
+    return [token for token in TOKEN_SPLIT.split(text.lower()) if token]
+
+
+class TrieNode:
+    __slots__ = ("children", "matches")
+
+    def __init__(self):
+        self.children = {}
+        self.matches = {}
+
+
+class PrefixTrie:
+    """Maps every prefix of inserted words to the best rank of each entry"""
+
+    def __init__(self):
+        self.root = TrieNode()
+
+    def insert(self, word, entry_id, rank):
+        node = self.root
+        for char in word:
+            node = node.children.setdefault(char, TrieNode())
+            if rank < node.matches.get(entry_id, rank + 1):
+                node.matches[entry_id] = rank
+
+    def find(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return {}
+
+        return node.matches
+
+
+class AirportSearchIndex:
+    """In-process autocomplete over airport names, codes, cities and countries"""
+
+    models = (Airport, City, Country)
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._versions = None
+        self.entries = {}
+        self.codes = {}
+        self.trie = PrefixTrie()
+
+    def clear(self):
+        with self._lock:
+            self._versions = None
+
+    def build(self):
+        with self._lock:
+            self._versions = get_model_versions(self.models)
+            self.entries = {}
+            self.codes = {}
+            self.trie = PrefixTrie()
+            for airport in Airport.objects.values(
+                "id", "name", "airport_code", "city__name", "city__country__name"
+            ):
+                self._add_airport(airport)
+
+    def ensure_fresh(self):
+        with self._lock:
+            if (
+                self._versions is None
+                or get_model_versions(self.models) != self._versions
+            ):
+                self.build()
+
+    def _add_airport(self, airport):
+        entry = {
+            "id": airport["id"],
+            "name": airport["name"],
+            "airport_code": airport["airport_code"],
+            "city": airport["city__name"],
+            "country": airport["city__country__name"],
+        }
+        self.entries[entry["id"]] = entry
+        self.codes[entry["airport_code"].upper()] = entry["id"]
+
+        name = " ".join(tokenize(entry["name"]))
+        self.trie.insert(name, entry["id"], NAME_RANK)
+        for field, rank in (
+            ("airport_code", NAME_WORD_RANK),
+            ("name", NAME_WORD_RANK),
+            ("city", CITY_RANK),
+            ("country", COUNTRY_RANK),
+        ):
+            for token in tokenize(entry[field]):
+                self.trie.insert(token, entry["id"], rank)
+
+    def search(self, q, limit=10):
+        """
+        Return up to `limit` airports matching every word of `q`.
+
+        Each word has to be a prefix of a word in the airport name, code,
+        city or country. Results are ordered by rank and then by name.
+        """
+        self.ensure_fresh()
+
+        terms = tokenize(q)
+        if not terms:
+            return []
+
+        with self._lock:
+            ranks = None
+            phrase_matches = self.trie.find(" ".join(terms))
+            for term in terms:
+                matches = self.trie.find(term)
+                if ranks is None:
+                    ranks = dict(matches)
+                else:
+                    ranks = {
+                        entry_id: rank + matches[entry_id]
+                        for entry_id, rank in ranks.items()
+                        if entry_id in matches
+                    }
+                if not ranks:
+                    break
+
+            for entry_id, rank in phrase_matches.items():
+                ranks[entry_id] = min(ranks.get(entry_id, rank), rank)
+
+            code_match = self.codes.get(q.strip().upper())
+            if code_match is not None:
+                ranks[code_match] = CODE_RANK
+
+            results = sorted(
+                ranks.items(),
+                key=lambda item: (item[1], self.entries[item[0]]["name"]),
+            )
+            return [self.entries[entry_id] for entry_id, _ in results[:limit]]
+
+
+airport_search_index = AirportSearchIndex()
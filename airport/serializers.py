@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from airport_API_service.serializers import ValuesListSerializer
 from .models import Country, City, Airport, Route
 
 
@@ -47,14 +48,15 @@ class RouteSerializer(serializers.ModelSerializer):
 
 
 class RouteListSerializer(RouteSerializer):
-    source_name = serializers.CharField(source="source.name", read_only=True)
-    destination_name = serializers.CharField(source="destination.name", read_only=True)
-
     class Meta:
         model = Route
         fields = ("id", "code", "source_name", "destination_name", "distance")
 
 
+class RouteListValuesSerializer(ValuesListSerializer):
+    serializer_class = RouteListSerializer
+
+
 class RouteDetailSerializer(RouteSerializer):
     source = AirportSerializer(many=False, read_only=True)
     destination = AirportSerializer(many=False, read_only=True)
@@ -62,3 +64,16 @@ class RouteDetailSerializer(RouteSerializer):
     class Meta:
         model = Route
         fields = ("id", "code", "source", "destination", "distance")
+
+
+class AirportSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(help_text="Airport name, IATA code, city or country")
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class AirportSearchSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    airport_code = serializers.CharField()
+    city = serializers.CharField()
+    country = serializers.CharField()
@@ -0,0 +1,45 @@
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from airport_API_service.cache import invalidate_cache_on_change, invalidate_model_cache
+from .models import Country, City, Airport, Route
+from .search import airport_search_index
+
+invalidate_cache_on_change(Country, City, Airport, Route)
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+def reset_airport_search_index(sender, **kwargs):
+    airport_search_index.clear()
+
+
+ROUTE_AIRPORT_LOOKUPS = {
+    Airport: "",
+    City: "__city",
+    Country: "__city__country",
+}
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_save, sender=City)
+@receiver(post_save, sender=Country)
+def refresh_route_display_fields(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    lookup = ROUTE_AIRPORT_LOOKUPS[sender]
+    outdated = Route.refresh_display_fields(
+        Route.objects.filter(
+            Q(**{f"source{lookup}": instance}) | Q(**{f"destination{lookup}": instance})
+        )
+    )
+
+    # bulk_update does not send signals
+    if outdated:
+        invalidate_model_cache(sender=Route)
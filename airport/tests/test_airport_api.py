@@ -1,13 +1,22 @@
 from random import choices
 from string import ascii_uppercase, ascii_lowercase
+from unittest import skipUnless
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from airport.models import Country, City, Airport, Route
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
 from airport.serializers import (
     AirportSerializer,
     RouteListSerializer,
@@ -75,6 +84,7 @@ class UnauthenticatedAirportApiTests(TestCase):
 
 class AuthenticatedAirportApiTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             "test@test.com",
@@ -208,6 +218,7 @@ class AuthenticatedAirportApiTests(TestCase):
 
 class AdminAirportApiTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             "admin@admin.com", "testpass", is_staff=True
@@ -255,3 +266,95 @@ class AdminAirportApiTests(TestCase):
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class CachedAirportApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_served_from_cache(self):
+        sample_airport()
+        self.client.get(AIRPORTS_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(AIRPORTS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+
+    def test_query_params_cached_separately(self):
+        sample_airport()
+        self.client.get(AIRPORTS_URL)
+
+        response = self.client.get(AIRPORTS_URL, {"city": "not match"})
+
+        self.assertEqual(response.data, [])
+
+    def test_cache_invalidated_on_related_change(self):
+        route = sample_route()
+        self.client.get(ROUTES_URL)
+        country = route.source.city.country
+        country.name = "renamed_country"
+        country.save()
+
+        response = self.client.get(ROUTES_URL)
+
+        self.assertTrue(response.data[0]["code"].startswith("renamed_country"))
+
+    def test_cache_invalidated_on_delete(self):
+        route = sample_route()
+        self.client.get(get_detail_route_url(route.id))
+        route.delete()
+
+        response = self.client.get(get_detail_route_url(route.id))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @skipUnless(fakeredis, "fakeredis is not installed")
+    def test_redis_cache_backend(self):
+        redis_cache = {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://fake:6379/0",
+            "OPTIONS": {"connection_class": fakeredis.FakeConnection},
+        }
+        with override_settings(
+            CACHES={"default": redis_cache}, API_CACHE_ALIAS="default"
+        ):
+            cache.clear()
+            city = sample_city()
+            original_name = city.name
+            self.client.get(CITIES_URL)
+
+            with self.assertNumQueries(0):
+                cached_response = self.client.get(CITIES_URL)
+
+            city.name = "renamed_city"
+            city.save()
+            response = self.client.get(CITIES_URL)
+
+        self.assertEqual(cached_response.data[0]["name"], original_name)
+        self.assertEqual(response.data[0]["name"], "renamed_city")
+
+
+@skipUnless(connection.vendor == "postgresql", "trigram indexes need PostgreSQL")
+class RouteTrigramIndexTests(TestCase):
+    def test_airport_filter_uses_trigram_indexes(self):
+        for _ in range(3):
+            sample_route()
+        with connection.cursor() as cursor:
+            # tiny tables are scanned sequentially otherwise
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        plan = Route.objects.filter(
+            Q(source_name__icontains="heathrow")
+            | Q(destination_name__icontains="heathrow")
+        ).explain()
+
+        self.assertIn("airport_route_source_name_trgm", plan)
+        self.assertIn("airport_route_destination_name_trgm", plan)
@@ -0,0 +1,205 @@
+import json
+import random
+import tempfile
+from collections import Counter
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from airport.models import Country, Route
+from airport.tests.test_airport_api import sample_route
+from airport_API_service.loader import LoadError, iter_objects
+from flight.models import Flight, Order, SeatInventory, Ticket
+
+
+class BackfillRouteCodesTests(TestCase):
+    def setUp(self):
+        self.route = sample_route()
+        self.code = self.route.code
+        Route.objects.filter(id=self.route.id).update(
+            code="", source_name="", destination_city=""
+        )
+
+    def test_outdated_routes_backfilled(self):
+        call_command("backfill_route_codes", stdout=StringIO())
+
+        self.route.refresh_from_db()
+        self.assertEqual(self.route.code, self.code)
+        self.assertEqual(self.route.source_name, self.route.source.name)
+        self.assertEqual(self.route.destination_city, str(self.route.destination.city))
+
+    def test_dry_run_does_not_fix(self):
+        out = StringIO()
+
+        call_command("backfill_route_codes", "--dry-run", stdout=out)
+
+        self.route.refresh_from_db()
+        self.assertEqual(self.route.code, "")
+        self.assertIn("1 outdated (dry run)", out.getvalue())
+
+
+class LoadAirportDataTests(TestCase):
+    fixture = Path(settings.BASE_DIR) / "airport_data.json"
+
+    def setUp(self):
+        self.records = json.loads(self.fixture.read_text())
+        # orders of the fixture belong to a second user it does not contain
+        user = next(r for r in self.records if r["model"] == "user.user")
+        self.records.append(
+            {
+                "model": "user.user",
+                "pk": 2,
+                "fields": {**user["fields"], "email": "second@test.com"},
+            }
+        )
+
+    def temporary_path(self, name):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return Path(directory.name) / name
+
+    def load(self, *args, records=None):
+        path = self.temporary_path("data.json")
+        path.write_text(json.dumps(self.records if records is None else records))
+        out = StringIO()
+        call_command("load_airport_data", str(path), *args, stdout=out)
+        return out.getvalue()
+
+    def counts(self):
+        return {
+            label: apps.get_model(label).objects.count()
+            for label in {record["model"] for record in self.records}
+        }
+
+    def test_loads_fixture(self):
+        out = self.load()
+
+        self.assertEqual(
+            self.counts(),
+            Counter(record["model"] for record in self.records),
+        )
+        order = next(r for r in self.records if r["model"] == "flight.order")
+        self.assertEqual(
+            Order.objects.get(id=order["pk"]).created_at,
+            timezone.make_naive(parse_datetime(order["fields"]["created_at"])),
+        )
+        flight = next(r for r in self.records if r["model"] == "flight.flight")
+        self.assertEqual(
+            sorted(
+                Flight.objects.get(id=flight["pk"]).crew_members.values_list(
+                    "id", flat=True
+                )
+            ),
+            sorted(flight["fields"]["crew_members"]),
+        )
+        self.assertIn("flight.ticket: 5 rows", out)
+        self.assertIn("rows/s", out)
+
+    def test_ndjson_in_any_order(self):
+        path = self.temporary_path("data.ndjson")
+        records = self.records[:]
+        random.Random(0).shuffle(records)
+        path.write_text("\n".join(json.dumps(record) for record in records))
+
+        call_command(
+            "load_airport_data", str(path), "--batch-size=2", stdout=StringIO()
+        )
+
+        self.assertEqual(Ticket.objects.count(), 5)
+        self.assertEqual(Flight.objects.get(id=1).crew_members.count(), 3)
+
+    def test_display_fields_and_inventories_rebuilt(self):
+        self.load()
+
+        route = Route.objects.get(id=1)
+        flight = Flight.objects.get(id=1)
+        self.assertNotEqual(route.code, "")
+        self.assertEqual(Route.refresh_display_fields(commit=False), [])
+        self.assertEqual(
+            flight.inventory.tickets_sold, Ticket.objects.filter(flight=flight).count()
+        )
+        self.assertEqual(SeatInventory.objects.count(), Flight.objects.count())
+
+    def test_objects_created_after_loading(self):
+        self.load()
+
+        country = Country.objects.create(name="New country")
+
+        self.assertGreater(
+            country.id,
+            max(
+                record["pk"]
+                for record in self.records
+                if record["model"] == "airport.country"
+            ),
+        )
+
+    def test_invalid_ticket_rejected(self):
+        ticket = next(r for r in self.records if r["model"] == "flight.ticket")
+        ticket["fields"]["row"] = 1000
+
+        with self.assertRaisesMessage(CommandError, "does not exist on flight"):
+            self.load()
+
+        self.assertFalse(Country.objects.exists())
+
+    def test_invalid_ticket_skipped(self):
+        ticket = next(r for r in self.records if r["model"] == "flight.ticket")
+        ticket["fields"]["seat"] = 0
+
+        out = self.load("--skip-invalid")
+
+        self.assertEqual(Ticket.objects.count(), 4)
+        self.assertFalse(Ticket.objects.filter(id=ticket["pk"]).exists())
+        self.assertIn("Skipped 1 invalid tickets", out)
+
+    def test_unknown_model_rejected(self):
+        with self.assertRaisesMessage(CommandError, "Unknown model: airport.gate"):
+            self.load(records=[{"model": "airport.gate", "pk": 1, "fields": {}}])
+
+    @skipUnless(connection.vendor != "postgresql", "COPY is available")
+    def test_copy_needs_postgresql(self):
+        with self.assertRaisesMessage(CommandError, "COPY needs PostgreSQL"):
+            self.load("--copy")
+
+    @skipUnless(connection.vendor == "postgresql", "COPY needs PostgreSQL")
+    def test_copy_matches_inserts(self):
+        self.load("--copy")
+        copied = self.counts()
+        route = Route.objects.values().get(id=1)
+
+        with transaction.atomic():
+            for model in reversed(apps.get_models()):
+                model._base_manager.all().delete()
+        self.load("--no-copy")
+
+        self.assertEqual(copied, self.counts())
+        self.assertEqual(route, Route.objects.values().get(id=1))
+
+
+class IterObjectsTests(SimpleTestCase):
+    def test_array_and_ndjson(self):
+        objects = [{"a": 1}, {"b": "x, ]"}, {"c": [1, {"d": None}]}]
+
+        self.assertEqual(list(iter_objects(StringIO(json.dumps(objects)))), objects)
+        self.assertEqual(
+            list(
+                iter_objects(
+                    StringIO("\n".join(json.dumps(obj) for obj in objects)),
+                    chunk_size=3,
+                )
+            ),
+            objects,
+        )
+
+    def test_invalid_json(self):
+        with self.assertRaises(LoadError):
+            list(iter_objects(StringIO('[{"a": 1}, {"b": ')))
@@ -55,3 +55,54 @@ class AirportModelsTests(TestCase):
                 f"{route.destination.city}: {route.destination.airport_code}"
             ),
         )
+
+    def test_route_display_fields_stored(self):
+        route = Route.objects.first()
+
+        self.assertEqual(route.source_name, "test_airport_1")
+        self.assertEqual(route.source_city, "test_country_1: test_city_1")
+        self.assertEqual(route.destination_name, "test_airport_2")
+        self.assertEqual(route.destination_city, "test_country_2: test_city_2")
+
+    def test_route_code_updated_on_airport_change(self):
+        airport = Airport.objects.get(airport_code="TES")
+        airport.name = "renamed_airport"
+        airport.airport_code = "REN"
+        airport.save()
+
+        route = Route.objects.first()
+
+        self.assertEqual(route.source_name, "renamed_airport")
+        self.assertTrue(route.code.startswith("test_country_1: test_city_1: REN - "))
+
+    def test_route_code_updated_on_city_rename(self):
+        city = City.objects.get(name="test_city_2")
+        city.name = "renamed_city"
+        city.save()
+
+        self.assertEqual(
+            Route.objects.first().destination_city, "test_country_2: renamed_city"
+        )
+
+    def test_route_code_updated_on_country_rename(self):
+        country = Country.objects.get(name="test_country_1")
+        country.name = "renamed_country"
+        country.save()
+
+        route = Route.objects.first()
+
+        self.assertEqual(route.source_city, "renamed_country: test_city_1")
+        self.assertTrue(route.code.startswith("renamed_country: test_city_1: TES"))
+
+    def test_route_code_updated_on_airport_change_of_route(self):
+        route = Route.objects.first()
+        route.destination = Airport.objects.create(
+            name="test_airport_3",
+            city=City.objects.get(name="test_city_1"),
+            airport_code="THR",
+        )
+        route.save(update_fields=["destination"])
+        route.refresh_from_db()
+
+        self.assertEqual(route.destination_name, "test_airport_3")
+        self.assertTrue(route.code.endswith("test_country_1: test_city_1: THR"))
@@ -0,0 +1,109 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Airport, City, Country
+
+SEARCH_URL = reverse("airport:search-list")
+
+
+class AirportSearchApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+        uk = Country.objects.create(name="United Kingdom")
+        ukraine = Country.objects.create(name="Ukraine")
+        london = City.objects.create(name="London", country=uk)
+        kyiv = City.objects.create(name="Kyiv", country=ukraine)
+        self.heathrow = Airport.objects.create(
+            name="Heathrow", airport_code="LHR", city=london
+        )
+        self.gatwick = Airport.objects.create(
+            name="Gatwick", airport_code="LGW", city=london
+        )
+        self.boryspil = Airport.objects.create(
+            name="Boryspil International", airport_code="KBP", city=kyiv
+        )
+
+    def search(self, q, **params):
+        response = self.client.get(SEARCH_URL, {"q": q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [airport["airport_code"] for airport in response.data]
+
+    def test_search_auth_required(self):
+        response = APIClient().get(SEARCH_URL, {"q": "lon"})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_search_by_name_prefix(self):
+        response = self.client.get(SEARCH_URL, {"q": "heat"})
+
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "id": self.heathrow.id,
+                    "name": "Heathrow",
+                    "airport_code": "LHR",
+                    "city": "London",
+                    "country": "United Kingdom",
+                }
+            ],
+        )
+
+    def test_search_by_city_and_country(self):
+        self.assertEqual(self.search("lond"), ["LGW", "LHR"])
+        self.assertEqual(self.search("ukr"), ["KBP"])
+        self.assertEqual(self.search("united kingdom"), ["LGW", "LHR"])
+
+    def test_search_requires_every_word(self):
+        self.assertEqual(self.search("london heat"), ["LHR"])
+        self.assertEqual(self.search("boryspil heat"), [])
+
+    def test_exact_code_ranked_first(self):
+        london_code = Airport.objects.create(
+            name="Kbp Heliport",
+            airport_code="KBH",
+            city=City.objects.get(name="London"),
+        )
+
+        self.assertEqual(self.search("KBP"), ["KBP", london_code.airport_code])
+        self.assertEqual(self.search("kb"), [london_code.airport_code, "KBP"])
+
+    def test_name_ranked_before_city(self):
+        Airport.objects.create(
+            name="Kyiv Zhuliany",
+            airport_code="IEV",
+            city=City.objects.get(name="Kyiv"),
+        )
+
+        self.assertEqual(self.search("kyiv"), ["IEV", "KBP"])
+
+    def test_search_limit(self):
+        self.assertEqual(len(self.search("l", limit=1)), 1)
+
+    def test_index_rebuilt_on_change(self):
+        self.assertEqual(self.search("heat"), ["LHR"])
+
+        self.heathrow.name = "London Heathrow"
+        self.heathrow.save()
+        self.gatwick.delete()
+
+        self.assertEqual(self.search("london heat"), ["LHR"])
+        self.assertEqual(self.search("gat"), [])
+
+    def test_invalid_params(self):
+        response = self.client.get(SEARCH_URL, {"limit": 0})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("q", response.data)
+        self.assertIn("limit", response.data)
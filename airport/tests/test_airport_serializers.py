@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.tests.test_airport_api import sample_route
+
+ROUTE_URL = reverse("airport:route-list")
+
+
+class RouteValuesSerializerParityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def get(self, fast, params=None):
+        cache.clear()
+        with override_settings(FAST_LIST_SERIALIZERS=fast):
+            return self.client.get(ROUTE_URL, params)
+
+    def test_route_list_parity(self):
+        routes = [sample_route() for _ in range(3)]
+
+        fast, plain = self.get(fast=True), self.get(fast=False)
+
+        self.assertEqual(fast.content, plain.content)
+        self.assertEqual(fast.json()[0]["code"], routes[0].code)
+
+    def test_filtered_route_list_parity(self):
+        route = sample_route()
+        sample_route()
+        params = {"airport": route.source.name}
+
+        fast = self.get(fast=True, params=params)
+        plain = self.get(fast=False, params=params)
+
+        self.assertEqual(fast.content, plain.content)
+        self.assertEqual(len(fast.json()), 1)
@@ -1,14 +1,33 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework import routers
 
-from .views import CountryViewSet, CityViewSet, AirportViewSet, RouteViewSet
+from .views import (
+    CountryViewSet,
+    CityViewSet,
+    AirportViewSet,
+    AirportSearchViewSet,
+    RouteViewSet,
+)
 
 router = routers.DefaultRouter()
 router.register("countries", CountryViewSet)
 router.register("cities", CityViewSet)
 router.register("airports", AirportViewSet)
 router.register("routes", RouteViewSet)
+router.register("search", AirportSearchViewSet, basename="search")
 
-urlpatterns = [path("", include(router.urls))]
+# served instead of the router views when ASYNC_READ_VIEWS is enabled
+async_urlpatterns = [
+    path(
+        "routes/",
+        RouteViewSet.as_async_view({"get": "list", "post": "create"}),
+        name="route-list",
+    ),
+]
+
+urlpatterns = (async_urlpatterns if settings.ASYNC_READ_VIEWS else []) + [
+    path("", include(router.urls))
+]
 
 app_name = "airport"
@@ -1,9 +1,19 @@
 from django.db.models import Q
+from drf_spectacular.utils import extend_schema
 from rest_framework import mixins
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from airport_API_service.cache import CachedListModelMixin, CachedRetrieveModelMixin
+from airport_API_service.conditional import (
+    ConditionalListModelMixin,
+    ConditionalRetrieveModelMixin,
+)
+from airport_API_service.throttling import ScopedSlidingWindowThrottle
+from airport_API_service.views import AsyncReadMixin, ValuesListModelMixin
 from flight.permissions import IsAdminOrIfAuthenticatedReadOnly
 from .models import Country, City, Airport, Route
+from .search import airport_search_index
 from .serializers import (
     CountrySerializer,
     CitySerializer,
@@ -11,25 +21,45 @@ from .serializers import (
     RouteSerializer,
     RouteDetailSerializer,
     RouteListSerializer,
+    RouteListValuesSerializer,
     CityListSerializer,
     AirportListSerializer,
+    AirportSearchQuerySerializer,
+    AirportSearchSerializer,
 )
 
 
-class CountryViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, GenericViewSet):
+class CountryViewSet(
+    ConditionalListModelMixin,
+    CachedListModelMixin,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    GenericViewSet,
+):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Country,)
+    conditional_lookups = ()
+    conditional_models = (Country,)
 
 
-class CityViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, GenericViewSet):
+class CityViewSet(
+    ConditionalListModelMixin,
+    CachedListModelMixin,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    GenericViewSet,
+):
     queryset = City.objects.select_related("country")
     serializer_class = CitySerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (City, Country)
+    conditional_models = (Country,)
 
     def get_queryset(self):
         country = self.request.query_params.get("country")
-        queryset = self.queryset
+        queryset = super().get_queryset()
 
         if country:
             queryset = queryset.filter(country__name__icontains=country)
@@ -43,13 +73,22 @@ class CityViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, GenericViewSet
         return CitySerializer
 
 
-class AirportViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, GenericViewSet):
+class AirportViewSet(
+    ConditionalListModelMixin,
+    CachedListModelMixin,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    GenericViewSet,
+):
     queryset = Airport.objects.select_related("city__country")
     serializer_class = AirportSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Airport, City, Country)
+    conditional_lookups = ("updated_at", "city__updated_at")
+    conditional_models = (Country,)
 
     def get_queryset(self):
-        queryset = self.queryset
+        queryset = super().get_queryset()
 
         city = self.request.query_params.get("city")
 
@@ -65,28 +104,57 @@ class AirportViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, GenericView
         return AirportSerializer
 
 
+class AirportSearchViewSet(GenericViewSet):
+    serializer_class = AirportSearchSerializer
+    permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_classes = (ScopedSlidingWindowThrottle,)
+    throttle_scope = "search"
+
+    @extend_schema(parameters=[AirportSearchQuerySerializer])
+    def list(self, request):
+        """Autocomplete airports by name, IATA code, city or country"""
+        query = AirportSearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        airports = airport_search_index.search(**query.validated_data)
+        serializer = self.get_serializer(airports, many=True)
+
+        return Response(serializer.data)
+
+
 class RouteViewSet(
+    ConditionalListModelMixin,
+    ConditionalRetrieveModelMixin,
+    CachedListModelMixin,
+    CachedRetrieveModelMixin,
+    ValuesListModelMixin,
+    AsyncReadMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     GenericViewSet,
 ):
-    queryset = Route.objects.select_related(
-        "destination__city__country",
-        "source__city__country",
-    )
+    queryset = Route.objects.select_related("source", "destination")
     serializer_class = RouteSerializer
+    values_serializer_class = RouteListValuesSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Route, Airport, City, Country)
+    # renamed cities and countries refresh display fields of routes
+    conditional_lookups = (
+        "updated_at",
+        "source__updated_at",
+        "destination__updated_at",
+    )
 
     def get_queryset(self):
-        queryset = self.queryset
+        queryset = super().get_queryset()
 
         airport = self.request.query_params.get("airport")
 
         if airport:
             queryset = queryset.filter(
-                Q(source__name__icontains=airport)
-                | Q(destination__name__icontains=airport)
+                Q(source_name__icontains=airport)
+                | Q(destination_name__icontains=airport)
             )
 
         return queryset
@@ -0,0 +1,127 @@
+import hashlib
+import threading
+import time
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_save, post_delete
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def get_api_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def model_version_key(model):
+    return f"api-cache:version:{model._meta.label_lower}"
+
+
+def get_model_versions(models):
+    """Return current cache versions of models, initializing missing ones"""
+    cache = get_api_cache()
+    keys = [model_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), timeout=None)
+        versions.update(cache.get_many(missing))
+
+    return [versions.get(key) for key in keys]
+
+
+_bumped_versions = threading.local()
+
+
+def bumped_version(model):
+    """Return the cache version of model last set by the current thread"""
+    return getattr(_bumped_versions, "versions", {}).get(model_version_key(model))
+
+
+def invalidate_model_cache(sender, **kwargs):
+    cache = get_api_cache()
+    key = model_version_key(sender)
+    cache.add(key, time.time_ns(), timeout=None)
+    try:
+        version = cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, timeout=None)
+
+    if not hasattr(_bumped_versions, "versions"):
+        _bumped_versions.versions = {}
+    _bumped_versions.versions[key] = version
+
+
+def invalidate_cache_on_change(*models):
+    for model in models:
+        uid = f"api-cache:{model._meta.label_lower}"
+        post_save.connect(invalidate_model_cache, sender=model, dispatch_uid=uid)
+        post_delete.connect(invalidate_model_cache, sender=model, dispatch_uid=uid)
+
+
+class CachedResponseMixin:
+    """Cache responses of safe actions until one of `cache_models` changes"""
+
+    cache_models = ()
+
+    def get_response_cache_key(self, request):
+        serializer_class = self.get_serializer_class()
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        raw_key = "|".join(
+            (
+                request.path,
+                query,
+                f"{serializer_class.__module__}.{serializer_class.__qualname__}",
+                ",".join(map(str, get_model_versions(self.cache_models))),
+            )
+        )
+        return "api-cache:response:" + hashlib.md5(raw_key.encode()).hexdigest()
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        cache = get_api_cache()
+        key = self.get_response_cache_key(request)
+
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout=settings.API_CACHE_TIMEOUT)
+
+        return response
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        cache = get_api_cache()
+        key = await sync_to_async(self.get_response_cache_key)(request)
+
+        data = await cache.aget(key)
+        if data is not None:
+            return Response(data)
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            await cache.aset(key, response.data, timeout=settings.API_CACHE_TIMEOUT)
+
+        return response
+
+
+class CachedListModelMixin(CachedResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(super().alist, request, *args, **kwargs)
+
+
+class CachedRetrieveModelMixin(CachedResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(super().aretrieve, request, *args, **kwargs)
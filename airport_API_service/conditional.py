@@ -0,0 +1,165 @@
+import calendar
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from airport_API_service.cache import get_api_cache, get_model_versions
+
+
+class ConditionalResponseMixin:
+    """Answer conditional GET requests with 304 before serializing anything"""
+
+    # The ETag comes from one aggregate over the queryset of the action: the
+    # row count and the latest `updated_at` of every lookup, plus the cache
+    # versions of `conditional_models` (small tables without such a column).
+    # Keyset paginated lists only read the timestamps of the current page.
+    # Views with cached responses keep the validators next to the response.
+    conditional_lookups = ("updated_at",)
+    conditional_models = ()
+
+    def get_conditional_queryset(self, detail):
+        queryset = self.filter_queryset(self.get_queryset())
+        if detail:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset
+
+    def get_conditional_page(self, queryset):
+        """Unevaluated current page of a keyset paginated list, None otherwise"""
+        paginator = self.paginator
+        if paginator is None or not hasattr(paginator, "get_page_queryset"):
+            return None
+
+        # a fresh paginator, the one of the view paginates the response
+        return type(paginator)().get_page_queryset(queryset, self.request, self)
+
+    def get_validators(self, request, detail):
+        """ETag and last modification of the response, None when it is missing"""
+        if not getattr(self, "cache_models", ()):
+            return self.compute_validators(request, detail)
+
+        cache = get_api_cache()
+        raw_key = (
+            f"{self.get_response_cache_key(request)}|{request.accepted_media_type}"
+        )
+        key = "api-cache:validators:" + hashlib.md5(raw_key.encode()).hexdigest()
+        validators = cache.get(key)
+        if validators is None:
+            validators = self.compute_validators(request, detail)
+            cache.set(key, validators, timeout=settings.API_CACHE_TIMEOUT)
+
+        return validators
+
+    def get_conditional_state(self, detail):
+        """Row count and latest timestamps, or every timestamp of a page"""
+        queryset = self.get_conditional_queryset(detail)
+        page = None if detail else self.get_conditional_page(queryset)
+        if page is not None:
+            # the rows themselves, a deleted row moves the next one into the page
+            rows = list(
+                page.prefetch_related(None).values_list("pk", *self.conditional_lookups)
+            )
+            return len(rows), [value for row in rows for value in row]
+
+        aggregates = {
+            f"updated_at_{index}": Max(lookup)
+            for index, lookup in enumerate(self.conditional_lookups)
+        }
+        values = queryset.aggregate(count=Count("pk"), **aggregates)
+        return values["count"], [values[name] for name in aggregates]
+
+    def compute_validators(self, request, detail):
+        try:
+            count, values = self.get_conditional_state(detail)
+        except (TypeError, ValueError):
+            # malformed lookup value, left to the action to reject
+            return None, None
+        if detail and not count:
+            return None, None
+
+        serializer_class = self.get_serializer_class()
+        raw_etag = "|".join(
+            (
+                request.get_full_path(),
+                request.accepted_media_type,
+                f"{serializer_class.__module__}.{serializer_class.__qualname__}",
+                str(count),
+                ",".join(map(str, values)),
+                ",".join(map(str, get_model_versions(self.conditional_models))),
+            )
+        )
+        etag = f'"{hashlib.md5(raw_etag.encode()).hexdigest()}"'
+
+        # a deleted row does not move the latest timestamp of a list
+        timestamps = [value for value in values if value is not None]
+        last_modified = None
+        if detail and timestamps and not self.conditional_models:
+            last_modified = calendar.timegm(max(timestamps).utctimetuple())
+
+        return etag, last_modified
+
+    def not_modified(self, request, etag, last_modified):
+        if etag is None:
+            return None
+
+        return get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+
+    @staticmethod
+    def set_validators(response, etag, last_modified):
+        if etag is not None and response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def conditional_response(self, handler, request, *args, detail=False, **kwargs):
+        if not settings.CONDITIONAL_REQUESTS:
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators(request, detail)
+        response = self.not_modified(request, etag, last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        return self.set_validators(response, etag, last_modified)
+
+    async def aconditional_response(
+        self, handler, request, *args, detail=False, **kwargs
+    ):
+        if not settings.CONDITIONAL_REQUESTS:
+            return await handler(request, *args, **kwargs)
+
+        etag, last_modified = await sync_to_async(self.get_validators)(request, detail)
+        response = self.not_modified(request, etag, last_modified)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+
+        return self.set_validators(response, etag, last_modified)
+
+
+class ConditionalListModelMixin(ConditionalResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.aconditional_response(super().alist, request, *args, **kwargs)
+
+
+class ConditionalRetrieveModelMixin(ConditionalResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, detail=True, **kwargs
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.aconditional_response(
+            super().aretrieve, request, *args, detail=True, **kwargs
+        )
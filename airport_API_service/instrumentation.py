@@ -0,0 +1,190 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+from .serializers import ValuesListSerializer
+
+logger = logging.getLogger("airport_API_service.requests")
+slow_sql_logger = logging.getLogger("airport_API_service.slow_sql")
+
+_current_metrics = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    __slots__ = (
+        "started",
+        "view_started",
+        "queries",
+        "sql_time",
+        "serializer_time",
+        "statements",
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.statements = []
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.queries += 1
+            self.sql_time += duration
+            if len(self.statements) < settings.INSTRUMENTATION_MAX_SQL_STATEMENTS:
+                self.statements.append((sql, duration))
+
+
+def _serializer_data(data):
+    def timed_data(serializer):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return data(serializer)
+
+        start = time.perf_counter()
+        try:
+            return data(serializer)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+
+    timed_data.instrumented = True
+    return timed_data
+
+
+def instrument_serializers():
+    """Time `serializer.data` of every serializer, once per process"""
+    for serializer_class in (BaseSerializer, ValuesListSerializer):
+        if not getattr(serializer_class.data.fget, "instrumented", False):
+            serializer_class.data = property(
+                _serializer_data(serializer_class.data.fget)
+            )
+
+
+def record_queries(metrics):
+    """Context recording the queries of every connection into `metrics`"""
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(metrics.record_query))
+    return stack
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+class InstrumentationMiddleware:
+    """
+    Record query count, SQL, serializer and view time of every request.
+
+    Metrics are logged as one JSON line and, with
+    `INSTRUMENTATION_SERVER_TIMING`, returned in the `Server-Timing` header.
+    SQL of slow requests is sampled to a separate logger.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        # keep the handler chain async under ASGI
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        instrument_serializers()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            with record_queries(metrics):
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+
+        return self.report(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            # connections are per thread, queries run in the one of sync_to_async
+            with await sync_to_async(record_queries)(metrics):
+                response = await self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+
+        return self.report(request, response, metrics)
+
+    def report(self, request, response, metrics):
+        finished = time.perf_counter()
+        total_time = finished - metrics.started
+        view_time = finished - (metrics.view_started or finished)
+
+        if settings.INSTRUMENTATION_SERVER_TIMING:
+            response["Server-Timing"] = (
+                f'db;dur={_ms(metrics.sql_time)};desc="{metrics.queries} queries", '
+                f"serializer;dur={_ms(metrics.serializer_time)}, "
+                f"view;dur={_ms(view_time)}, "
+                f"total;dur={_ms(total_time)}"
+            )
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                json.dumps(
+                    {
+                        "method": request.method,
+                        "path": request.path,
+                        "status": response.status_code,
+                        "view": getattr(request.resolver_match, "view_name", None),
+                        "queries": metrics.queries,
+                        "db_ms": _ms(metrics.sql_time),
+                        "serializer_ms": _ms(metrics.serializer_time),
+                        "view_ms": _ms(view_time),
+                        "total_ms": _ms(total_time),
+                    }
+                )
+            )
+
+        if (
+            total_time * 1000 >= settings.INSTRUMENTATION_SLOW_REQUEST_MS
+            and metrics.statements
+            and random.random() < settings.INSTRUMENTATION_SLOW_SQL_SAMPLE_RATE
+        ):
+            slow_sql_logger.warning(
+                json.dumps(
+                    {
+                        "method": request.method,
+                        "path": request.path,
+                        "total_ms": _ms(total_time),
+                        "statements": [
+                            {"sql": sql, "ms": _ms(duration)}
+                            for sql, duration in metrics.statements
+                        ],
+                    }
+                )
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.view_started = time.perf_counter()
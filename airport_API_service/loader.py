@@ -0,0 +1,416 @@
+import datetime
+import io
+import json
+import tempfile
+import time
+from collections import namedtuple
+from graphlib import CycleError, TopologicalSorter
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.utils import timezone
+
+from airport.models import Route
+from airport.search import airport_search_index
+from airport_API_service.cache import invalidate_model_cache
+from flight.models import Flight, SeatInventory, Ticket
+
+
+class LoadError(Exception):
+    pass
+
+
+def iter_objects(stream, chunk_size=1 << 16):
+    """
+    Yield the objects of a JSON array or of NDJSON read from `stream`.
+
+    Only the current chunk and the object being decoded are kept in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,[]":
+            position += 1
+
+        if position < len(buffer):
+            try:
+                obj, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as error:
+                if eof:
+                    raise LoadError(f"Invalid JSON: {error}") from error
+            else:
+                yield obj
+                continue
+        elif eof:
+            return
+
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def _copy_value(value):
+    """`value` in the text format of PostgreSQL COPY"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\\\x" + bytes(value).hex()
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat(sep=" ")
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class ModelLoader:
+    """Converts fixture records of one model to rows of its table"""
+
+    def __init__(self, model):
+        self.model = model
+        self.fields = list(model._meta.concrete_fields)
+        self.pk_attname = model._meta.pk.attname
+        # missing `auto_now` fields get the time of the load
+        self.now = timezone.now()
+        self.row_class = namedtuple(
+            f"{model.__name__}Row", [field.attname for field in self.fields]
+        )
+        self.many_to_many = [
+            field
+            for field in model._meta.many_to_many
+            if field.remote_field.through._meta.auto_created
+        ]
+
+    def dependencies(self):
+        related = [
+            field.related_model for field in self.fields if field.is_relation
+        ] + [field.related_model for field in self.many_to_many]
+        return {model for model in related if model is not self.model}
+
+    def row(self, record):
+        if record.get("pk") is None:
+            raise LoadError(f"{self.model._meta.label_lower}: records need a pk")
+
+        fields = record.get("fields", {})
+        values = []
+        for field in self.fields:
+            if field.primary_key:
+                value = record["pk"]
+            elif field.name in fields:
+                value = fields[field.name]
+            elif getattr(field, "auto_now", False):
+                values.append(self.now)
+                continue
+            else:
+                values.append(field.get_default())
+                continue
+
+            if field.is_relation:
+                if isinstance(value, list):
+                    raise LoadError(
+                        f"{self.model._meta.label_lower}: natural keys "
+                        "are not supported"
+                    )
+                value = field.target_field.to_python(value)
+            else:
+                value = field.to_python(value)
+                if (
+                    isinstance(value, datetime.datetime)
+                    and timezone.is_aware(value)
+                    and not settings.USE_TZ
+                ):
+                    # stored in the time zone of the database connection
+                    value = timezone.make_naive(value)
+            values.append(value)
+
+        return self.row_class(*values)
+
+    def through_rows(self, rows, records):
+        """Rows of the many-to-many tables for `records`, by table"""
+        for field in self.many_to_many:
+            through = field.remote_field.through
+            fields = [
+                through._meta.get_field(field.m2m_field_name()),
+                through._meta.get_field(field.m2m_reverse_field_name()),
+            ]
+            row_class = namedtuple(
+                f"{through.__name__}Row", [field.attname for field in fields]
+            )
+            through_rows = [
+                row_class(getattr(row, self.pk_attname), target_pk)
+                for row, record in zip(rows, records)
+                for target_pk in record.get("fields", {}).get(field.name, ())
+            ]
+            yield through, fields, through_rows
+
+
+class BulkLoader:
+    """
+    Load fixtures in the `dumpdata` format with as few statements as possible.
+
+    Records are spooled to temporary files per model, then every model is
+    loaded in dependency order in batches: with PostgreSQL COPY, or with
+    multi-row INSERTs elsewhere. Like `loaddata`, fields are stored as
+    given (no `save()`, no signals). Tickets are checked
+    against the dimensions of their airplanes per batch, stored route
+    display fields, seat inventories, sequences and caches are brought up
+    to date at the end.
+    """
+
+    def __init__(
+        self,
+        batch_size=5000,
+        use_copy=None,
+        skip_invalid=False,
+        using=DEFAULT_DB_ALIAS,
+    ):
+        self.batch_size = batch_size
+        self.using = using
+        self.connection = connections[using]
+        if use_copy is None:
+            use_copy = self.connection.vendor == "postgresql"
+        elif use_copy and self.connection.vendor != "postgresql":
+            raise LoadError("COPY needs PostgreSQL")
+        self.use_copy = use_copy
+        self.skip_invalid = skip_invalid
+        self.loaders = {}
+        self.flight_dimensions = {}
+        self.stats = {}
+        self.skipped = 0
+
+    def loader(self, label):
+        if label not in self.loaders:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as error:
+                raise LoadError(f"Unknown model: {label}") from error
+            self.loaders[label] = ModelLoader(model)
+        return self.loaders[label]
+
+    def spool(self, streams):
+        spools = {}
+        for stream in streams:
+            for record in iter_objects(stream):
+                label = str(record.get("model", "")).lower()
+                self.loader(label)
+                if label not in spools:
+                    spools[label] = tempfile.TemporaryFile("w+", encoding="utf-8")
+                spools[label].write(json.dumps(record) + "\n")
+        return spools
+
+    def order(self, labels):
+        models = {self.loaders[label].model: label for label in labels}
+        graph = {
+            label: {
+                models[model]
+                for model in self.loaders[label].dependencies()
+                if model in models
+            }
+            for label in labels
+        }
+        try:
+            return list(TopologicalSorter(graph).static_order())
+        except CycleError as error:
+            raise LoadError(f"Circular dependencies: {error.args[1]}") from error
+
+    def load(self, streams):
+        """Load records of `streams`, return rows and seconds per model"""
+        spools = self.spool(streams)
+        try:
+            with transaction.atomic(using=self.using):
+                for label in self.order(spools):
+                    self.load_model(self.loaders[label], spools[label])
+                self.finish()
+        finally:
+            for spool in spools.values():
+                spool.close()
+
+        for loader in self.loaders.values():
+            invalidate_model_cache(sender=loader.model)
+        airport_search_index.clear()
+        return self.stats
+
+    def load_model(self, loader, spool):
+        started = time.perf_counter()
+        count = 0
+        spool.seek(0)
+        batch = []
+        for line in spool:
+            batch.append(json.loads(line))
+            if len(batch) >= self.batch_size:
+                count += self.load_batch(loader, batch)
+                batch = []
+        if batch:
+            count += self.load_batch(loader, batch)
+
+        self.stats[loader.model._meta.label_lower] = (
+            count,
+            time.perf_counter() - started,
+        )
+
+    def load_batch(self, loader, records):
+        rows = [loader.row(record) for record in records]
+        if loader.model is Ticket:
+            rows = self.valid_tickets(rows)
+
+        self.write(loader.model, loader.fields, rows)
+        for through, fields, through_rows in loader.through_rows(rows, records):
+            self.write(through, fields, through_rows)
+
+        return len(rows)
+
+    def airplane_dimensions(self, flight_ids):
+        """Rows and seats in row of the airplanes of `flight_ids`"""
+        missing = [
+            flight_id
+            for flight_id in flight_ids
+            if flight_id not in self.flight_dimensions
+        ]
+        if missing:
+            self.flight_dimensions.update(
+                (flight_id, (rows, seats_in_row))
+                for flight_id, rows, seats_in_row in Flight.objects.using(self.using)
+                .filter(id__in=missing)
+                .values_list("id", "airplane__rows", "airplane__seats_in_row")
+            )
+        return self.flight_dimensions
+
+    def valid_tickets(self, rows):
+        dimensions = self.airplane_dimensions({row.flight_id for row in rows})
+        invalid = [
+            row
+            for row in rows
+            if row.flight_id not in dimensions
+            or not 1 <= row.row <= dimensions[row.flight_id][0]
+            or not 1 <= row.seat <= dimensions[row.flight_id][1]
+        ]
+        if not invalid:
+            return rows
+
+        if not self.skip_invalid:
+            ticket = invalid[0]
+            raise LoadError(
+                f"Ticket {ticket.id}: seat {ticket.seat} in row {ticket.row} "
+                f"does not exist on flight {ticket.flight_id}"
+            )
+        self.skipped += len(invalid)
+        invalid = set(invalid)
+        return [row for row in rows if row not in invalid]
+
+    def write(self, model, fields, rows):
+        if not rows:
+            return
+        if self.use_copy:
+            self.copy(model, fields, rows)
+            return
+
+        batch_size = max(self.connection.ops.bulk_batch_size(fields, rows), 1)
+        manager = model._base_manager.using(self.using)
+        for start in range(0, len(rows), batch_size):
+            # raw inserts store values as given, like loaddata
+            manager._insert(
+                rows[start : start + batch_size],
+                fields=fields,
+                raw=True,
+                using=self.using,
+            )
+
+    def copy_prep(self, field, value):
+        if isinstance(field, models.BinaryField):
+            # not wrapped in the database driver's Binary
+            return field.get_prep_value(value)
+        return field.get_db_prep_save(value, self.connection)
+
+    def copy(self, model, fields, rows):
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(
+                "\t".join(
+                    _copy_value(self.copy_prep(field, getattr(row, field.attname)))
+                    for field in fields
+                )
+            )
+            buffer.write("\n")
+        buffer.seek(0)
+
+        quote = self.connection.ops.quote_name
+        columns = ", ".join(quote(field.column) for field in fields)
+        with self.connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN",
+                buffer,
+            )
+
+    def finish(self):
+        labels = set(self.stats)
+        if labels & {"airport.route", "airport.airport", "airport.city"}:
+            Route.refresh_display_fields(Route.objects.using(self.using).all())
+
+        if labels & {"flight.flight", "flight.ticket", "flight.seatinventory"}:
+            self.rebuild_seat_inventories()
+
+        models = [loader.model for loader in self.loaders.values()]
+        models += [
+            field.remote_field.through
+            for loader in self.loaders.values()
+            for field in loader.many_to_many
+        ]
+        statements = self.connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with self.connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def rebuild_seat_inventories(self, chunk_size=1000):
+        """Create and recompute seat inventories from the stored tickets"""
+        now = timezone.now()
+        flights = Flight.objects.using(self.using).order_by("id")
+        last_id = None
+        while True:
+            chunk = flights if last_id is None else flights.filter(id__gt=last_id)
+            chunk = list(
+                chunk.values_list("id", "airplane__rows", "airplane__seats_in_row")[
+                    :chunk_size
+                ]
+            )
+            if not chunk:
+                return
+            last_id = chunk[-1][0]
+
+            seats = {flight_id: [] for flight_id, _, _ in chunk}
+            for flight_id, row, seat in (
+                Ticket.objects.using(self.using)
+                .filter(flight_id__in=seats)
+                .values_list("flight_id", "row", "seat")
+            ):
+                seats[flight_id].append((row, seat))
+
+            inventories = SeatInventory.objects.using(self.using).in_bulk(
+                seats, field_name="flight_id"
+            )
+            missing = []
+            for flight_id, rows, seats_in_row in chunk:
+                inventory = inventories.get(flight_id)
+                if inventory is None:
+                    inventory = SeatInventory(flight_id=flight_id)
+                    missing.append(inventory)
+                inventory.tickets_sold = len(seats[flight_id])
+                inventory.seat_map = SeatInventory.build_seat_map(
+                    seats[flight_id], rows, seats_in_row
+                )
+                inventory.updated_at = now
+
+            SeatInventory.objects.using(self.using).bulk_create(missing)
+            SeatInventory.objects.using(self.using).bulk_update(
+                list(inventories.values()), ["tickets_sold", "seat_map", "updated_at"]
+            )
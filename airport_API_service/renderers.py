@@ -0,0 +1,130 @@
+import csv
+import io
+from itertools import islice
+
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in `JSONRenderer` backed by orjson.
+
+    Datetimes, dates, UUIDs and dataclasses are encoded natively, Decimals,
+    lazy strings and querysets go through DRF's `JSONEncoder`.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        renderer_context = renderer_context or {}
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context):
+            options |= orjson.OPT_INDENT_2
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default, option=options
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict javascript subset, as JSONRenderer does
+        if LINE_SEPARATOR in ret or PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b"\\u2028").replace(
+                PARAGRAPH_SEPARATOR, b"\\u2029"
+            )
+
+        return ret
+
+
+class StreamingRenderer(BaseRenderer):
+    """
+    Renderer of large exports: `stream` (`astream` under ASGI) encodes rows
+    lazily, in chunks, for a `StreamingHttpResponse`. `render` only serves error responses.
+    """
+
+    charset = "utf-8"
+    rows_per_chunk = 500
+
+    def stream(self, header, rows):
+        """Encoded chunks of `rows`, tuples of values in the order of `header`"""
+        yield self.encode_header(header)
+        rows = iter(rows)
+        while chunk := list(islice(rows, self.rows_per_chunk)):
+            yield self.encode_rows(header, chunk)
+
+    async def astream(self, header, rows):
+        """`stream` of an async iterator of `rows`, for responses served by ASGI"""
+        yield self.encode_header(header)
+        chunk = []
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) == self.rows_per_chunk:
+                yield self.encode_rows(header, chunk)
+                chunk = []
+        if chunk:
+            yield self.encode_rows(header, chunk)
+
+    def encode_header(self, header):
+        return b""
+
+    def encode_rows(self, header, rows):
+        raise NotImplementedError
+
+
+class CSVRenderer(StreamingRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+    def encode_rows(self, header, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            [
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in row
+            ]
+            for row in rows
+        )
+        return buffer.getvalue().encode(self.charset)
+
+    def encode_header(self, header):
+        return self.encode_rows(header, [header])
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not isinstance(data, dict):
+            data = {"detail": data}
+        return self.encode_rows(data, [data, map(str, data.values())])
+
+
+class NDJSONRenderer(StreamingRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def encode_rows(self, header, rows):
+        return b"".join(self.render(dict(zip(header, row))) for row in rows)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return (
+            orjson.dumps(
+                data,
+                default=encoders.JSONEncoder().default,
+                option=orjson.OPT_NON_STR_KEYS,
+            )
+            + b"\n"
+        )
@@ -0,0 +1,209 @@
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+_current_request = ContextVar("replica_request", default=None)
+
+# zero while the replica has replayed everything it received
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+def _pin_key(user_id):
+    return f"replica-pin:{user_id}"
+
+
+def _pin_cache():
+    return caches[settings.REPLICA_PIN_CACHE_ALIAS]
+
+
+def pin_to_primary(user):
+    """Read from the primary for the next `REPLICA_PIN_SECONDS` of `user`"""
+    _pin_cache().set(_pin_key(user.pk), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    return _pin_cache().get(_pin_key(user.pk), False)
+
+
+class ReplicaRequest:
+    """Whether reads of the current request may go to a replica"""
+
+    def __init__(self, request):
+        self.request = request
+        self.pinned = None
+        self.resolving = False
+
+    def reads_from_replica(self):
+        if self.pinned is None and not self.resolving:
+            # queries made while resolving the user go to the primary
+            self.resolving = True
+            try:
+                user = getattr(self.request, "user", None)
+                # JWT users are only known once the view authenticated them
+                if user is not None and user.is_authenticated:
+                    self.pinned = is_pinned_to_primary(user)
+            finally:
+                self.resolving = False
+
+        return not self.resolving and not self.pinned
+
+
+def replica_lag(alias):
+    """Seconds the replica `alias` is behind the primary"""
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+
+    with connection.cursor() as cursor:
+        cursor.execute(REPLICA_LAG_SQL)
+        (lag,) = cursor.fetchone()
+    # NULL when the database is not replaying, i.e. a primary
+    return float(lag or 0)
+
+
+class ReplicaLagMonitor:
+    """Replica lags, measured at most every `REPLICA_LAG_CHECK_INTERVAL`"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked = {}
+
+    def lag(self, alias):
+        now = time.monotonic()
+        with self.lock:
+            checked_at, lag = self.checked.get(alias, (None, None))
+            if checked_at is not None and (
+                now - checked_at < settings.REPLICA_LAG_CHECK_INTERVAL
+            ):
+                return lag
+            # other threads keep using the last result meanwhile
+            self.checked[alias] = (now, lag if lag is not None else 0.0)
+
+        try:
+            lag = replica_lag(alias)
+        except DatabaseError:
+            lag = float("inf")
+        with self.lock:
+            self.checked[alias] = (now, lag)
+        return lag
+
+    def available(self, aliases):
+        return [
+            alias
+            for alias in aliases
+            if self.lag(alias) <= settings.REPLICA_MAX_LAG_SECONDS
+        ]
+
+    def reset(self):
+        with self.lock:
+            self.checked.clear()
+
+
+lag_monitor = ReplicaLagMonitor()
+
+
+class ReplicaRouter:
+    """
+    Send reads of safe requests to `DATABASE_REPLICAS`.
+
+    Reads go to the primary outside of requests, inside transactions, for
+    users who wrote in the last `REPLICA_PIN_SECONDS` and when every
+    replica lags more than `REPLICA_MAX_LAG_SECONDS`.
+    """
+
+    def db_for_read(self, model, **hints):
+        replica_request = _current_request.get()
+        if (
+            not settings.DATABASE_REPLICAS
+            or replica_request is None
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+            or not replica_request.reads_from_replica()
+        ):
+            return DEFAULT_DB_ALIAS
+
+        replicas = lag_monitor.available(settings.DATABASE_REPLICAS)
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let `ReplicaRouter` route reads of safe requests to replicas and pin
+    users to the primary after a successful write (read-your-writes).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # keep the handler chain async under ASGI
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = _current_request.set(self.replica_request(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_request.reset(token)
+
+        if self.may_pin(request, response):
+            self.pin_user(request)
+        return response
+
+    async def __acall__(self, request):
+        token = _current_request.set(self.replica_request(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+
+        if self.may_pin(request, response):
+            # the user may be loaded lazily and the cache is sync
+            await sync_to_async(self.pin_user)(request)
+        return response
+
+    @staticmethod
+    def replica_request(request):
+        return ReplicaRequest(request) if request.method in SAFE_METHODS else None
+
+    @staticmethod
+    def may_pin(request, response):
+        return (
+            request.method not in SAFE_METHODS
+            and settings.DATABASE_REPLICAS
+            and response.status_code < 400
+        )
+
+    @staticmethod
+    def pin_user(request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user)
@@ -0,0 +1,197 @@
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import FileField
+from django.db.models.constants import LOOKUP_SEP
+
+
+class Computed:
+    """Output field computed from several columns of the row"""
+
+    def __init__(self, lookups, function):
+        self.lookups = tuple(lookups)
+        self.function = function
+
+    def prefixed(self, prefix):
+        return Computed((prefix + lookup for lookup in self.lookups), self.function)
+
+
+class Many:
+    """
+    List of related objects, fetched with one query for all rows.
+
+    Items are either `function(*values)` of `lookups` of the related model
+    or dicts of a nested `serializer`.
+    """
+
+    def __init__(self, source, lookups=(), function=None, serializer=None):
+        self.source = source
+        self.lookups = tuple(lookups)
+        self.function = function
+        self.serializer = serializer
+
+
+class ValuesListSerializer:
+    """
+    Read-only serializer working on `.values()` rows instead of instances.
+
+    Produces the same output as `serializer_class` without building model
+    instances or going through DRF fields for every row. Fields mapped to
+    model columns are read from the row and converted by the original DRF
+    field, `fields` overrides the others (properties, `__str__` of related
+    objects, many-related fields).
+    """
+
+    serializer_class = None
+    fields = {}
+    annotations = ()
+
+    def __init__(self, instance=None, context=None):
+        self.instance = instance
+        self.context = context or {}
+        serializer = self.serializer_class(context=self.context)
+        self.model = serializer.Meta.model
+        self.pk = self.model._meta.pk.name
+        self.columns = [self.pk]
+        self.getters = []
+        self.many = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            spec = self.fields.get(name) or self._column(name, field)
+            if isinstance(spec, Many):
+                self.many.append((len(self.getters), name, spec))
+                self.getters.append((name, None))
+            elif isinstance(spec, Computed):
+                self._add_columns(spec.lookups)
+                self.getters.append((name, self._computed_getter(spec)))
+            else:
+                lookup, to_representation = spec
+                self._add_columns((lookup,))
+                self.getters.append(
+                    (name, self._column_getter(lookup, to_representation))
+                )
+
+    def _add_columns(self, lookups):
+        for lookup in lookups:
+            if lookup not in self.columns:
+                self.columns.append(lookup)
+
+    def _column(self, name, field):
+        lookup = LOOKUP_SEP.join(field.source_attrs)
+        if lookup in self.annotations:
+            return lookup, field.to_representation
+
+        model, model_field = self.model, None
+        try:
+            for part in field.source_attrs:
+                model_field = model._meta.get_field(part)
+                model = model_field.related_model
+        except FieldDoesNotExist:
+            model_field = None
+        if model_field is None or model_field.is_relation:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__} needs an override for field '{name}'"
+            )
+
+        if isinstance(model_field, FileField):
+            return lookup, self._file_representation(model_field, field)
+        return lookup, field.to_representation
+
+    @staticmethod
+    def _file_representation(model_field, field):
+        def to_representation(name):
+            if not name:
+                return None
+            return field.to_representation(
+                model_field.attr_class(None, model_field, name)
+            )
+
+        return to_representation
+
+    @staticmethod
+    def _computed_getter(spec):
+        lookups, function = spec.lookups, spec.function
+        return lambda row: function(*[row[lookup] for lookup in lookups])
+
+    @staticmethod
+    def _column_getter(lookup, to_representation):
+        def get(row):
+            value = row[lookup]
+            return None if value is None else to_representation(value)
+
+        return get
+
+    def rows(self, queryset):
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    @property
+    def data(self):
+        return self.to_representation(self.instance)
+
+    async def adata(self):
+        """`data` fetched with the async ORM"""
+        return await self.ato_representation(self.instance)
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        pks = [row[self.pk] for row in rows]
+        related = [self._fetch_many(spec, pks) for _, _, spec in self.many]
+        return self._represent(rows, related)
+
+    async def ato_representation(self, rows):
+        if hasattr(rows, "__aiter__"):
+            rows = [row async for row in rows]
+        else:
+            rows = list(rows)
+        pks = [row[self.pk] for row in rows]
+        related = [await self._afetch_many(spec, pks) for _, _, spec in self.many]
+        return self._represent(rows, related)
+
+    def _represent(self, rows, related):
+        getters = list(self.getters)
+        for (index, name, _), items in zip(self.many, related):
+            getters[index] = (
+                name,
+                lambda row, items=items: items.get(row[self.pk], []),
+            )
+
+        return [{name: get(row) for name, get in getters} for row in rows]
+
+    def _many_query(self, spec, pks):
+        field = self.model._meta.get_field(spec.source)
+        if field.many_to_many and not field.auto_created:
+            lookup = field.related_query_name()
+        else:
+            lookup = field.field.name
+        queryset = field.related_model._default_manager.filter(**{f"{lookup}__in": pks})
+
+        if spec.serializer is not None:
+            serializer = spec.serializer(context=self.context)
+            return lookup, serializer, queryset.values(lookup, *serializer.columns)
+        return lookup, None, queryset.values_list(lookup, *spec.lookups)
+
+    def _fetch_many(self, spec, pks):
+        lookup, serializer, queryset = self._many_query(spec, pks)
+        rows = list(queryset)
+        items = serializer.to_representation(rows) if serializer else None
+        return self._group_many(spec, lookup, rows, items)
+
+    async def _afetch_many(self, spec, pks):
+        lookup, serializer, queryset = self._many_query(spec, pks)
+        rows = [row async for row in queryset]
+        items = await serializer.ato_representation(rows) if serializer else None
+        return self._group_many(spec, lookup, rows, items)
+
+    @staticmethod
+    def _group_many(spec, lookup, rows, items):
+        related = defaultdict(list)
+        if items is not None:
+            for row, item in zip(rows, items):
+                related[row[lookup]].append(item)
+        else:
+            for parent, *values in rows:
+                related[parent].append(spec.function(*values))
+
+        return related
@@ -13,6 +13,7 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -28,6 +29,10 @@ SECRET_KEY = os.environ["DJANGO_SECRET_KEY"]
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.environ.get("DJANGO_DEBUG", "") != "False"
 
+DEBUG_TOOLBAR = DEBUG and os.environ.get("DJANGO_DEBUG_TOOLBAR", "") != "False"
+
+INSTRUMENTATION = os.environ.get("INSTRUMENTATION", "") != "False"
+
 ALLOWED_HOSTS = ["127.0.0.1"]
 
 INTERNAL_IPS = [
@@ -44,7 +49,6 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
-    "debug_toolbar",
     "drf_spectacular",
     "airport",
     "airplane",
@@ -54,15 +58,24 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "airport_API_service.replicas.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(1, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
+if INSTRUMENTATION:
+    MIDDLEWARE.insert(
+        0, "airport_API_service.instrumentation.InstrumentationMiddleware"
+    )
+
 ROOT_URLCONF = "airport_API_service.urls"
 
 TEMPLATES = [
@@ -99,9 +112,110 @@ DATABASES = {
         "NAME": os.environ["POSTGRES_DB"],
         "USER": os.environ["POSTGRES_USER"],
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
+        "PORT": os.environ.get("POSTGRES_PORT", ""),
+        # seconds a connection is reused by later requests, 0 closes it after
+        # every request. Django advises against persistent connections under
+        # ASGI, set POSTGRES_CONN_MAX_AGE=0 there (and pool with pgbouncer)
+        "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CONN_MAX_AGE", 60)),
+        # check a reused connection before its first query in a request
+        "CONN_HEALTH_CHECKS": os.environ.get("POSTGRES_CONN_HEALTH_CHECKS") != "False",
+        # pgbouncer in transaction pooling mode cannot keep cursors open
+        # between transactions
+        "DISABLE_SERVER_SIDE_CURSORS": os.environ.get("POSTGRES_PGBOUNCER") == "True",
+        "OPTIONS": {
+            "connect_timeout": int(os.environ.get("POSTGRES_CONNECT_TIMEOUT", 10)),
+        },
     }
 }
 
+# Read replicas share the credentials of the primary, comma separated hosts
+# in POSTGRES_REPLICA_HOSTS become the replica1, replica2, ... databases
+
+DATABASE_REPLICAS = []
+for host in filter(None, os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",")):
+    alias = f"replica{len(DATABASE_REPLICAS) + 1}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["airport_API_service.replicas.ReplicaRouter"]
+
+# seconds users read from the primary after a write
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 5))
+# replicas further behind are skipped, checked every REPLICA_LAG_CHECK_INTERVAL
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get("REPLICA_MAX_LAG_SECONDS", 5))
+REPLICA_LAG_CHECK_INTERVAL = float(os.environ.get("REPLICA_LAG_CHECK_INTERVAL", 5))
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+if os.environ.get("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["REDIS_URL"],
+    }
+
+API_CACHE_ALIAS = "default"
+API_CACHE_TIMEOUT = int(os.environ.get("API_CACHE_TIMEOUT", 60 * 60))
+API_COUNT_CACHE_TIMEOUT = int(os.environ.get("API_COUNT_CACHE_TIMEOUT", 60))
+
+# users pinned to the primary after a write, every process has to see the pins
+REPLICA_PIN_CACHE_ALIAS = "default"
+if DATABASE_REPLICAS and not os.environ.get("REDIS_URL"):
+    raise ImproperlyConfigured(
+        "POSTGRES_REPLICA_HOSTS needs a shared cache, set REDIS_URL"
+    )
+
+# timings are visible to every client, only expose them where trusted
+INSTRUMENTATION_SERVER_TIMING = (
+    os.environ.get("INSTRUMENTATION_SERVER_TIMING", "") == "True"
+)
+INSTRUMENTATION_SLOW_REQUEST_MS = int(
+    os.environ.get("INSTRUMENTATION_SLOW_REQUEST_MS", 500)
+)
+INSTRUMENTATION_SLOW_SQL_SAMPLE_RATE = float(
+    os.environ.get("INSTRUMENTATION_SLOW_SQL_SAMPLE_RATE", 0.1)
+)
+INSTRUMENTATION_MAX_SQL_STATEMENTS = 50
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "message": {"format": "%(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "message"},
+    },
+    "loggers": {
+        "airport_API_service.requests": {
+            "handlers": ["console"],
+            "level": os.environ.get("INSTRUMENTATION_LOG_LEVEL", "WARNING"),
+            "propagate": False,
+        },
+        "airport_API_service.slow_sql": {
+            "handlers": ["console"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+        # results of `BENCHMARK=1 python manage.py test benchmarks`
+        "benchmarks": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -151,18 +265,61 @@ MEDIA_URL = "/media/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# authenticate with the user claims of access tokens instead of loading users,
+# revocations are published to the cache so it has to be shared (Redis)
+JWT_STATELESS_AUTH = (
+    os.environ.get("JWT_STATELESS_AUTH", "True" if os.environ.get("REDIS_URL") else "")
+    == "True"
+)
+if JWT_STATELESS_AUTH and not os.environ.get("REDIS_URL"):
+    raise ImproperlyConfigured("JWT_STATELESS_AUTH needs a shared cache, set REDIS_URL")
+JWT_VALIDATED_TOKEN_CACHE_SIZE = int(
+    os.environ.get("JWT_VALIDATED_TOKEN_CACHE_SIZE", 1024)
+)
+
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "airport_API_service.throttling.AnonSlidingWindowThrottle",
+        "airport_API_service.throttling.UserSlidingWindowThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "10/day", "user": "30/day"},
+    # an empty rate disables the throttle, e.g. for load tests
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": os.environ.get("THROTTLE_ANON_RATE", "10/day") or None,
+        "user": os.environ.get("THROTTLE_USER_RATE", "30/day") or None,
+        # order creation, on top of the user rate
+        "orders": os.environ.get("THROTTLE_ORDERS_RATE", "10/hour") or None,
+        # airport and itinerary search, instead of the anon and user rates
+        "search": os.environ.get("THROTTLE_SEARCH_RATE", "60/minute") or None,
+    },
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.StatelessJWTAuthentication"
+        if JWT_STATELESS_AUTH
+        else "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
 }
 
+# Serve hot list endpoints straight from .values() rows
+FAST_LIST_SERIALIZERS = os.environ.get("FAST_LIST_SERIALIZERS", "") != "False"
+
+# ETag and Last-Modified on catalog and flight reads, 304 for unchanged ones
+CONDITIONAL_REQUESTS = os.environ.get("CONDITIONAL_REQUESTS", "") != "False"
+
+# Async views for flight and route reads, for ASGI deployments
+ASYNC_READ_VIEWS = os.environ.get("ASYNC_READ_VIEWS", "") == "True"
+
+# orjson renderer and parser, set FAST_JSON=False for the stdlib json ones
+if os.environ.get("FAST_JSON", "") != "False":
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "airport_API_service.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = (
+        "airport_API_service.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    )
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Airport Service API",
     "DESCRIPTION": "Order flight tickets",
@@ -176,8 +333,41 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+SEAT_HOLD_BACKEND = os.environ.get(
+    "SEAT_HOLD_BACKEND",
+    "flight.holds.RedisSeatHoldBackend"
+    if os.environ.get("REDIS_URL")
+    else "flight.holds.InMemorySeatHoldBackend",
+)
+# holds in process memory do not apply across workers
+if SEAT_HOLD_BACKEND == "flight.holds.InMemorySeatHoldBackend" and not DEBUG:
+    raise ImproperlyConfigured("Seat holds need a shared store, set REDIS_URL")
+SEAT_HOLD_REDIS_URL = os.environ.get("REDIS_URL")
+SEAT_HOLD_TTL = int(os.environ.get("SEAT_HOLD_TTL", 5 * 60))
+SEAT_HOLD_MAX_SEATS = int(os.environ.get("SEAT_HOLD_MAX_SEATS", 10))
+SEAT_HOLD_SWEEP_INTERVAL = int(os.environ.get("SEAT_HOLD_SWEEP_INTERVAL", 30))
+
+# airplane thumbnails fit in a square of this many pixels
+AIRPLANE_THUMBNAIL_SIZE = int(os.environ.get("AIRPLANE_THUMBNAIL_SIZE", 320))
+AIRPLANE_IMAGE_QUALITY = int(os.environ.get("AIRPLANE_IMAGE_QUALITY", 80))
+AIRPLANE_IMAGE_MAX_SIZE = int(
+    os.environ.get("AIRPLANE_IMAGE_MAX_SIZE", 10 * 1024 * 1024)
+)
+# 0 processes images in the request
+AIRPLANE_IMAGE_WORKERS = int(os.environ.get("AIRPLANE_IMAGE_WORKERS", 2))
+
+# rows fetched per round trip by CSV and NDJSON exports
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 2000))
+
+ITINERARY_INDEX_MAX_AGE = int(os.environ.get("ITINERARY_INDEX_MAX_AGE", 5 * 60))
+ITINERARY_MIN_CONNECTION = timedelta(minutes=60)
+ITINERARY_MAX_CONNECTION = timedelta(hours=24)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=300),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.TokenRefreshSerializer",
+    "TOKEN_USER_CLASS": "user.authentication.ClaimsUser",
 }
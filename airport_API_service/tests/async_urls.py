@@ -0,0 +1,11 @@
+from django.urls import include, path
+
+from airport import urls as airport_urls
+from airport_API_service.urls import urlpatterns as api_urlpatterns
+from flight import urls as flight_urls
+
+# the project URLs with ASYNC_READ_VIEWS enabled
+urlpatterns = [
+    path("api/airport/", include(airport_urls.async_urlpatterns)),
+    path("api/flight/", include(flight_urls.async_urlpatterns)),
+] + api_urlpatterns
@@ -0,0 +1,186 @@
+import asyncio
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.test import TestCase, override_settings
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airplane.tests.test_airplane_api import sample_airplane
+from airport.tests.test_airport_api import sample_route
+from flight.models import Flight
+from flight.tests.test_flight_api import sample_crew_member, sample_flight
+
+ASYNC_URLCONF = "airport_API_service.tests.async_urls"
+FLIGHT_URL = reverse("flight:flight-list")
+ROUTE_URL = reverse("airport:route-list")
+
+
+def flight_detail_url(flight_id):
+    return reverse("flight:flight-detail", args=[flight_id])
+
+
+def seat_map_url(flight_id):
+    return reverse("flight:flight-seat-map", args=[flight_id])
+
+
+class AsyncReadViewParityTests(TestCase):
+    """Async views answer exactly like the synchronous ones"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.flights = [sample_flight() for _ in range(3)]
+        for flight in self.flights:
+            flight.crew_members.add(sample_crew_member())
+
+    def get(self, url, params=None, client=None):
+        client = client or self.client
+        cache.clear()
+        plain = client.get(url, params)
+        cache.clear()
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            self.assertTrue(
+                asyncio.iscoroutinefunction(resolve(urlsplit(url).path).func)
+            )
+            served = client.get(url, params)
+
+        self.assertEqual(served.status_code, plain.status_code)
+        self.assertEqual(served.content, plain.content)
+        for header in ("X-Total-Count", "Content-Type"):
+            self.assertEqual(served.get(header), plain.get(header))
+        return served
+
+    def test_flight_list(self):
+        response = self.get(FLIGHT_URL)
+
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_flight_list_pages(self):
+        response = self.get(FLIGHT_URL, {"page_size": 2, "count": "true"})
+        self.assertEqual(response["X-Total-Count"], "3")
+
+        next_page = self.get(response.data["next"])
+        self.assertEqual(len(next_page.data["results"]), 1)
+
+        self.get(next_page.data["previous"])
+
+    def test_filtered_flight_list(self):
+        route = self.flights[0].route
+
+        response = self.get(
+            FLIGHT_URL,
+            {"source": route.source.airport_code, "min_tickets_available": 1},
+        )
+
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_invalid_filter(self):
+        response = self.get(FLIGHT_URL, {"min_tickets_available": -1})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_flight_detail(self):
+        self.get(flight_detail_url(self.flights[0].id))
+
+    def test_flight_not_found(self):
+        response = self.get(flight_detail_url(0))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_seat_map(self):
+        self.get(seat_map_url(self.flights[0].id))
+
+    def test_route_list(self):
+        response = self.get(ROUTE_URL, {"airport": self.flights[0].route.source_name})
+
+        self.assertEqual(len(response.data), 1)
+
+    def test_unauthenticated(self):
+        response = self.get(FLIGHT_URL, client=APIClient())
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_regular_serializers(self):
+        with override_settings(FAST_LIST_SERIALIZERS=False):
+            self.get(FLIGHT_URL)
+            self.get(ROUTE_URL)
+
+
+@override_settings(ROOT_URLCONF=ASYNC_URLCONF)
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.admin = get_user_model().objects.create_superuser(
+            "admin@test.com", "testpass"
+        )
+
+    def test_asgi_middleware_chain_async(self):
+        # one sync-only middleware runs every view through async_to_sync
+        self.assertIn(
+            "airport_API_service.instrumentation.InstrumentationMiddleware",
+            settings.MIDDLEWARE,
+        )
+        self.assertTrue(iscoroutinefunction(ASGIHandler()._middleware_chain))
+
+    async def test_served_by_event_loop(self):
+        flight_id = (await sync_to_async(sample_flight)()).id
+        flight = await Flight.objects.select_related("route").aget(id=flight_id)
+        token = str(AccessToken.for_user(self.user))
+
+        response = await self.async_client.get(
+            FLIGHT_URL, headers={"authorization": f"Bearer {token}"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"][0]["route"], flight.route.code)
+
+    def test_route_list_cached(self):
+        sample_route()
+        client = APIClient()
+        client.force_authenticate(self.user)
+        client.get(ROUTE_URL)
+
+        with self.assertNumQueries(0):
+            response = client.get(ROUTE_URL)
+
+        self.assertEqual(len(response.data), 1)
+
+    def test_writes_served_by_sync_view(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        flight = sample_flight()
+        payload = {
+            "route": sample_route().id,
+            "airplane": sample_airplane().id,
+            "crew_members": [sample_crew_member().id],
+            "departure_time": "2023-03-01T10:00:00",
+            "arrival_time": "2023-03-01T12:00:00",
+        }
+
+        created = client.post(FLIGHT_URL, payload)
+        updated = client.patch(
+            flight_detail_url(flight.id), {"arrival_time": "2023-03-01T13:00:00"}
+        )
+        deleted = client.delete(flight_detail_url(created.data["id"]))
+
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(updated.status_code, status.HTTP_200_OK)
+        self.assertEqual(deleted.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_create_forbidden_for_user(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post(FLIGHT_URL, {})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,206 @@
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airplane.tests.test_airplane_api import sample_airplane
+from airport.tests.test_airport_api import sample_route
+from flight.models import Flight, Meal, Order, Ticket
+from flight.serializers import FlightDetailSerializer, FlightListValuesSerializer
+from flight.tests.test_flight_api import sample_crew_member, sample_flight
+
+AIRPORT_URL = reverse("airport:airport-list")
+AIRPLANE_URL = reverse("airplane:airplane-list")
+FLIGHT_URL = reverse("flight:flight-list")
+ROUTE_URL = reverse("airport:route-list")
+
+
+def flight_detail_url(flight_id):
+    return reverse("flight:flight-detail", args=[flight_id])
+
+
+def route_detail_url(route_id):
+    return reverse("airport:route-detail", args=[route_id])
+
+
+class ConditionalRequestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, headers={"if-none-match": etag})
+
+    def test_unchanged_flight_not_serialized(self):
+        flight = sample_flight()
+        etag = self.client.get(flight_detail_url(flight.id))["ETag"]
+
+        with mock.patch.object(
+            FlightDetailSerializer, "to_representation"
+        ) as to_representation, self.assertNumQueries(1):
+            response = self.revalidate(flight_detail_url(flight.id), etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+        to_representation.assert_not_called()
+
+    def test_unchanged_flight_list_not_serialized(self):
+        sample_flight()
+        etag = self.client.get(FLIGHT_URL)["ETag"]
+
+        with mock.patch.object(FlightListValuesSerializer, "rows") as rows:
+            response = self.revalidate(FLIGHT_URL, etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        rows.assert_not_called()
+
+    def test_sold_ticket_changes_flight_etag(self):
+        flight = sample_flight()
+        etag = self.client.get(flight_detail_url(flight.id))["ETag"]
+
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            flight=flight,
+            meal=Meal.objects.create(),
+            order=Order.objects.create(user=self.user),
+        )
+        response = self.revalidate(flight_detail_url(flight.id), etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_deleted_flight_changes_list_etag(self):
+        flights = [sample_flight() for _ in range(2)]
+        etag = self.client.get(FLIGHT_URL)["ETag"]
+
+        flights[0].delete()
+        response = self.revalidate(FLIGHT_URL, etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_flight_list_validated_by_page(self):
+        for _ in range(3):
+            sample_flight()
+        etag = self.client.get(FLIGHT_URL, {"page_size": 1})["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            unchanged = self.client.get(
+                FLIGHT_URL, {"page_size": 1}, headers={"if-none-match": etag}
+            )
+
+        self.assertEqual(unchanged.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 1)
+        self.assertIn("LIMIT 2", queries[0]["sql"])
+        self.assertNotIn("COUNT(", queries[0]["sql"])
+
+        Flight.objects.order_by("departure_time", "id").first().delete()
+        changed = self.client.get(
+            FLIGHT_URL, {"page_size": 1}, headers={"if-none-match": etag}
+        )
+
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+
+    def test_crew_change_changes_flight_etags(self):
+        flight = sample_flight()
+        urls = (FLIGHT_URL, flight_detail_url(flight.id))
+        etags = {url: self.client.get(url)["ETag"] for url in urls}
+
+        flight.crew_members.add(sample_crew_member())
+
+        for url, etag in etags.items():
+            self.assertEqual(self.revalidate(url, etag).status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_query(self):
+        sample_flight()
+
+        etag = self.client.get(FLIGHT_URL)["ETag"]
+
+        self.assertNotEqual(self.client.get(FLIGHT_URL, {"page_size": 1})["ETag"], etag)
+
+    def test_renamed_airport_changes_catalog_etags(self):
+        route = sample_route()
+        etags = {url: self.client.get(url)["ETag"] for url in (AIRPORT_URL, ROUTE_URL)}
+
+        route.source.name = "renamed"
+        route.source.save()
+
+        for url, etag in etags.items():
+            response = self.revalidate(url, etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response["ETag"], etag)
+
+    def test_cached_catalog_revalidated_without_queries(self):
+        sample_route()
+        etag = self.client.get(ROUTE_URL)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.revalidate(ROUTE_URL, etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_route_last_modified(self):
+        route = sample_route()
+        response = self.client.get(route_detail_url(route.id))
+
+        not_modified = self.client.get(
+            route_detail_url(route.id),
+            headers={"if-modified-since": response["Last-Modified"]},
+        )
+
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_without_last_modified(self):
+        sample_route()
+        response = self.client.get(ROUTE_URL)
+
+        self.assertNotIn("Last-Modified", response)
+
+    def test_missing_object_not_found(self):
+        response = self.revalidate(flight_detail_url(1000), "*")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_renamed_airline_changes_airplane_etag(self):
+        airplane = sample_airplane()
+        etag = self.client.get(AIRPLANE_URL)["ETag"]
+
+        airplane.airline.name = "renamed"
+        airplane.airline.save()
+
+        self.assertEqual(
+            self.revalidate(AIRPLANE_URL, etag).status_code, status.HTTP_200_OK
+        )
+
+    @override_settings(CONDITIONAL_REQUESTS=False)
+    def test_disabled(self):
+        flight = sample_flight()
+
+        response = self.client.get(flight_detail_url(flight.id))
+
+        self.assertNotIn("ETag", response)
+
+    @override_settings(ROOT_URLCONF="airport_API_service.tests.async_urls")
+    async def test_async_view_not_modified(self):
+        flight = await sync_to_async(sample_flight)()
+        headers = {"authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        url = flight_detail_url(flight.id)
+        etag = (await self.async_client.get(url, headers=headers))["ETag"]
+
+        response = await self.async_client.get(
+            url, headers={**headers, "if-none-match": etag}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,112 @@
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport_API_service.instrumentation import InstrumentationMiddleware
+
+from flight.models import Crew
+from flight.tests.test_flight_api import sample_flight
+
+CREW_URL = reverse("flight:crew-members-list")
+
+
+class InstrumentationMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        Crew.objects.create(first_name="Kali", last_name="White", position="Captain")
+
+    def test_middleware_enabled(self):
+        self.assertEqual(
+            settings.MIDDLEWARE[0],
+            "airport_API_service.instrumentation.InstrumentationMiddleware",
+        )
+
+    @override_settings(INSTRUMENTATION_SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        response = self.client.get(CREW_URL)
+
+        metrics = {
+            part.split(";")[0]: part for part in response["Server-Timing"].split(", ")
+        }
+        self.assertEqual(set(metrics), {"db", "serializer", "view", "total"})
+        self.assertIn('desc="1 queries"', metrics["db"])
+
+    def test_server_timing_header_disabled_by_default(self):
+        response = self.client.get(CREW_URL)
+
+        self.assertNotIn("Server-Timing", response)
+
+    def test_structured_log_line(self):
+        with self.assertLogs("airport_API_service.requests", "INFO") as logs:
+            self.client.get(CREW_URL)
+
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line["method"], "GET")
+        self.assertEqual(line["path"], CREW_URL)
+        self.assertEqual(line["status"], 200)
+        self.assertEqual(line["view"], "flight:crew-members-list")
+        self.assertEqual(line["queries"], 1)
+        self.assertGreater(line["serializer_ms"], 0)
+        self.assertGreaterEqual(line["total_ms"], line["view_ms"])
+
+    @override_settings(
+        INSTRUMENTATION_SLOW_REQUEST_MS=0, INSTRUMENTATION_SLOW_SQL_SAMPLE_RATE=1
+    )
+    def test_slow_request_sql_sampled(self):
+        with self.assertLogs("airport_API_service.slow_sql", "WARNING") as logs:
+            self.client.get(CREW_URL)
+
+        sample = json.loads(logs.records[0].getMessage())
+        self.assertEqual(sample["path"], CREW_URL)
+        self.assertEqual(len(sample["statements"]), 1)
+        self.assertIn("flight_crew", sample["statements"][0]["sql"])
+
+    @override_settings(
+        INSTRUMENTATION_SLOW_REQUEST_MS=0, INSTRUMENTATION_SLOW_SQL_SAMPLE_RATE=0
+    )
+    def test_slow_request_sql_not_sampled(self):
+        with self.assertNoLogs("airport_API_service.slow_sql", "WARNING"):
+            self.client.get(CREW_URL)
+
+    @override_settings(INSTRUMENTATION=False)
+    def test_disabled_instrumentation_not_installed(self):
+        with mock.patch(
+            "airport_API_service.instrumentation.instrument_serializers"
+        ) as instrument_serializers, self.assertRaises(MiddlewareNotUsed):
+            InstrumentationMiddleware(lambda request: None)
+
+        instrument_serializers.assert_not_called()
+
+    @override_settings(
+        ROOT_URLCONF="airport_API_service.tests.async_urls",
+        INSTRUMENTATION_SERVER_TIMING=True,
+    )
+    async def test_async_view_measured(self):
+        flight = await sync_to_async(sample_flight)()
+        headers = {"authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+
+        with self.assertLogs("airport_API_service.requests", "INFO") as logs:
+            response = await self.async_client.get(
+                reverse("flight:flight-detail", args=[flight.id]), headers=headers
+            )
+
+        self.assertIn("Server-Timing", response)
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line["status"], 200)
+        self.assertGreater(line["queries"], 0)
@@ -0,0 +1,94 @@
+import datetime
+import decimal
+import io
+import json
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from airport_API_service.parsers import ORJSONParser
+from airport_API_service.renderers import ORJSONRenderer
+
+SAMPLE_DATA = {
+    "id": 1,
+    "departure_time": datetime.datetime(2023, 9, 30, 11, 1, 48, 120000),
+    "date": datetime.date(2023, 9, 30),
+    "price": decimal.Decimal("12.50"),
+    "name": gettext_lazy("Heathrow"),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "duration": datetime.timedelta(hours=2),
+    "tickets": [{"row": 1, "seat": 2}, {"row": 3, "seat": None}],
+    1: "non-string key",
+}
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_same_output_as_json_renderer(self):
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(SAMPLE_DATA)),
+            json.loads(JSONRenderer().render(SAMPLE_DATA)),
+        )
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_indent(self):
+        rendered = ORJSONRenderer().render({"id": 1}, "application/json; indent=4", {})
+
+        self.assertEqual(rendered, b'{\n  "id": 1\n}')
+
+    def test_line_separators_escaped(self):
+        rendered = ORJSONRenderer().render({"name": "a b c"})
+
+        self.assertEqual(rendered, b'{"name":"a\\u2028b\\u2029c"}')
+
+    def test_big_integers_fall_back_to_json_renderer(self):
+        self.assertEqual(
+            ORJSONRenderer().render({"id": 2**70}), b'{"id":%d}' % 2**70
+        )
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def test_parse(self):
+        data = ORJSONParser().parse(io.BytesIO('{"name": "Київ"}'.encode()))
+
+        self.assertEqual(data, {"name": "Київ"})
+
+    def test_parse_other_encoding(self):
+        data = ORJSONParser().parse(
+            io.BytesIO('{"name": "Київ"}'.encode("utf-16")),
+            parser_context={"encoding": "utf-16"},
+        )
+
+        self.assertEqual(data, {"name": "Київ"})
+
+    def test_parse_error(self):
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"name": '))
+
+
+class ORJSONApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_json_requests_and_responses(self):
+        url = reverse("airport:country-list")
+
+        response = self.client.post(url, {"name": "Україна"}, format="json")
+
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["name"], "Україна")
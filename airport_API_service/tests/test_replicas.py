@@ -0,0 +1,219 @@
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+from asgiref.sync import iscoroutinefunction
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import DatabaseError, connections
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_API_service.replicas import (
+    ReplicaRouter,
+    ReplicaRoutingMiddleware,
+    lag_monitor,
+)
+from flight.models import Flight, Meal
+from flight.tests.test_flight_api import sample_flight
+
+
+def user(pk):
+    return SimpleNamespace(pk=pk, is_authenticated=True)
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica1", "replica2"],
+    REPLICA_PIN_SECONDS=5,
+    REPLICA_MAX_LAG_SECONDS=5,
+    REPLICA_LAG_CHECK_INTERVAL=60,
+)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        lag_monitor.reset()
+        self.lags = {"replica1": 0.0, "replica2": 0.0}
+        replica_lag = mock.patch(
+            "airport_API_service.replicas.replica_lag",
+            side_effect=lambda alias: self.lags[alias],
+        )
+        replica_lag.start()
+        self.addCleanup(replica_lag.stop)
+        self.router = ReplicaRouter()
+
+    def read_database(self, method="get", request_user=None, status_code=200):
+        """Database `ReplicaRouter` picks for reads of a request"""
+        request = getattr(RequestFactory(), method)("/")
+        if request_user is not None:
+            request.user = request_user
+        used = []
+
+        def view(request):
+            used.append(self.router.db_for_read(Flight))
+            return SimpleNamespace(status_code=status_code)
+
+        ReplicaRoutingMiddleware(view)(request)
+        return used[0]
+
+    def test_safe_request_reads_from_replica(self):
+        self.assertIn(self.read_database(), ("replica1", "replica2"))
+
+    def test_unsafe_request_reads_from_primary(self):
+        self.assertEqual(self.read_database("post"), "default")
+
+    def test_outside_of_requests_reads_from_primary(self):
+        self.assertEqual(self.router.db_for_read(Flight), "default")
+
+    def test_writes_go_to_primary(self):
+        self.read_database()
+
+        self.assertEqual(self.router.db_for_write(Flight), "default")
+
+    def test_user_pinned_to_primary_after_write(self):
+        self.read_database("post", request_user=user(1))
+
+        self.assertEqual(self.read_database(request_user=user(1)), "default")
+        self.assertIn(
+            self.read_database(request_user=user(2)), ("replica1", "replica2")
+        )
+
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "pins": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "pins",
+            },
+        },
+        REPLICA_PIN_CACHE_ALIAS="pins",
+    )
+    def test_pin_stored_in_pin_cache(self):
+        self.read_database("post", request_user=user(1))
+
+        self.assertTrue(caches["pins"].get("replica-pin:1"))
+        self.assertIsNone(cache.get("replica-pin:1"))
+
+    async def test_async_chain_kept_async(self):
+        used = []
+
+        async def view(request):
+            used.append(self.router.db_for_read(Flight))
+            return SimpleNamespace(status_code=201)
+
+        middleware = ReplicaRoutingMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+
+        await middleware(RequestFactory().get("/"))
+        request = RequestFactory().post("/")
+        request.user = user(1)
+        await middleware(request)
+
+        self.assertIn(used[0], ("replica1", "replica2"))
+        self.assertEqual(self.read_database(request_user=user(1)), "default")
+
+    def test_failed_write_does_not_pin(self):
+        self.read_database("post", request_user=user(1), status_code=400)
+
+        self.assertNotEqual(self.read_database(request_user=user(1)), "default")
+
+    def test_lagging_replica_skipped(self):
+        self.lags["replica1"] = 30.0
+
+        for _ in range(10):
+            self.assertEqual(self.read_database(), "replica2")
+
+    def test_all_replicas_lagging_falls_back_to_primary(self):
+        self.lags.update(replica1=30.0, replica2=float("inf"))
+
+        self.assertEqual(self.read_database(), "default")
+
+    def test_unreachable_replica_skipped(self):
+        def lag(alias):
+            if alias == "replica1":
+                raise DatabaseError
+            return 0.0
+
+        with mock.patch("airport_API_service.replicas.replica_lag", side_effect=lag):
+            self.assertEqual(self.read_database(), "replica2")
+
+    def test_lag_checked_once_per_interval(self):
+        with mock.patch(
+            "airport_API_service.replicas.replica_lag", return_value=0.0
+        ) as replica_lag:
+            for _ in range(5):
+                self.read_database()
+
+        self.assertEqual(replica_lag.call_count, 2)
+
+    def test_no_replicas(self):
+        with self.settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(self.read_database(), "default")
+
+    def test_migrations_skip_replicas(self):
+        self.assertTrue(self.router.allow_migrate("default", "flight"))
+        self.assertFalse(self.router.allow_migrate("replica1", "flight"))
+
+
+@skipUnless(settings.DATABASE_REPLICAS, "set POSTGRES_REPLICA_HOSTS")
+class ReplicaRoutingApiTests(TransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        lag_monitor.reset()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+
+    def get(self, url):
+        """Response and query counts of the primary and the replicas"""
+        with ExitStack() as stack:
+            primary = stack.enter_context(CaptureQueriesContext(connections["default"]))
+            replicas = [
+                stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in settings.DATABASE_REPLICAS
+            ]
+            response = self.client.get(url)
+
+        return response, len(primary), sum(len(replica) for replica in replicas)
+
+    def test_reads_served_by_replica_until_write(self):
+        url = reverse("flight:flight-detail", args=[self.flight.id])
+
+        response, primary, replica = self.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+        response = self.client.post(
+            reverse("flight:order-list"),
+            {
+                "tickets": [
+                    {
+                        "row": 1,
+                        "seat": 1,
+                        "flight": self.flight.id,
+                        "meal": Meal.objects.create().id,
+                    }
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response, primary, replica = self.get(reverse("flight:order-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
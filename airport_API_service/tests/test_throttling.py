@@ -0,0 +1,175 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient, APIRequestFactory
+
+from airport_API_service.throttling import (
+    AnonSlidingWindowThrottle,
+    ScopedSlidingWindowThrottle,
+    UserSlidingWindowThrottle,
+)
+from flight.models import Meal
+from flight.tests.test_flight_api import sample_flight
+
+
+def throttle_rates(**rates):
+    return mock.patch.dict(api_settings.DEFAULT_THROTTLE_RATES, rates)
+
+
+class SlidingWindowThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        rates = throttle_rates(anon="4/minute")
+        rates.start()
+        self.addCleanup(rates.stop)
+        self.now = 6000.0  # the start of a window
+        self.request = APIRequestFactory().get("/")
+        self.request.user = AnonymousUser()
+
+    def allow(self):
+        throttle = AnonSlidingWindowThrottle()
+        throttle.timer = lambda: self.now
+        return throttle.allow_request(self.request, None), throttle
+
+    def test_limit_within_window(self):
+        results = [self.allow()[0] for _ in range(5)]
+
+        self.assertEqual(results, [True, True, True, True, False])
+
+    def test_previous_window_weighted_by_overlap(self):
+        for _ in range(4):
+            self.allow()
+
+        # a quarter into the next window, 3 of 4 previous requests count
+        self.now += 75
+        self.assertTrue(self.allow()[0])
+        self.assertFalse(self.allow()[0])
+
+        # halfway, 2 of 4 previous requests count
+        self.now += 15
+        self.assertTrue(self.allow()[0])
+        self.assertFalse(self.allow()[0])
+
+    def test_old_windows_forgotten(self):
+        for _ in range(4):
+            self.allow()
+
+        self.now += 120
+
+        self.assertEqual([self.allow()[0] for _ in range(4)], [True] * 4)
+
+    def test_throttled_requests_not_counted(self):
+        for _ in range(10):
+            self.allow()
+
+        self.assertEqual(cache.get(self.allow()[1].window_key), 4)
+
+    def test_one_counter_per_window(self):
+        for _ in range(10):
+            self.allow()
+
+        self.assertEqual(len(cache._cache), 1)
+
+    def test_wait_within_window(self):
+        for _ in range(4):
+            self.allow()
+        self.now += 30
+
+        allowed, throttle = self.allow()
+
+        self.assertFalse(allowed)
+        # the next window still counts 3 of the 4 requests until 1/4 of it passed
+        self.assertAlmostEqual(throttle.wait(), 30 + 15)
+
+    def test_wait_for_previous_window_to_slide_out(self):
+        for _ in range(4):
+            self.allow()
+        self.now += 90
+        for _ in range(2):
+            self.allow()
+
+        allowed, throttle = self.allow()
+
+        self.assertFalse(allowed)
+        # 2 + 4 * (1 - progress) <= 3 from 3/4 of the window on
+        self.assertAlmostEqual(throttle.wait(), 15)
+
+        self.now += throttle.wait()
+        self.assertTrue(self.allow()[0])
+
+    def test_no_rate(self):
+        with throttle_rates(anon=None):
+            self.assertTrue(all(self.allow()[0] for _ in range(10)))
+
+
+class ThrottleScopeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_default_throttles(self):
+        self.assertEqual(
+            api_settings.DEFAULT_THROTTLE_CLASSES,
+            [AnonSlidingWindowThrottle, UserSlidingWindowThrottle],
+        )
+
+    def test_search_uses_search_rate(self):
+        url = reverse("airport:search-list")
+
+        with throttle_rates(user="1/minute", search="3/minute"):
+            statuses = [self.client.get(url, {"q": "ab"}).status_code for _ in range(4)]
+
+        self.assertEqual(statuses, [200, 200, 200, 429])
+
+    def test_search_throttled_per_client(self):
+        url = reverse("flight:itineraries-list")
+        other = APIClient()
+        other.force_authenticate(
+            get_user_model().objects.create_user("other@test.com", "testpass")
+        )
+
+        with throttle_rates(search="1/minute"):
+            self.client.get(url)
+            throttled = self.client.get(url)
+            response = other.get(url)
+
+        self.assertEqual(throttled.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertNotEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_order_creation_uses_orders_rate(self):
+        flight = sample_flight()
+        meal = Meal.objects.create()
+        url = reverse("flight:order-list")
+
+        def order(seat):
+            return self.client.post(
+                url,
+                {
+                    "tickets": [
+                        {"row": 1, "seat": seat, "flight": flight.id, "meal": meal.id}
+                    ]
+                },
+                format="json",
+            )
+
+        with throttle_rates(orders="2/hour"):
+            statuses = [order(seat).status_code for seat in range(1, 4)]
+            throttled = self.client.post(url, {}, format="json")
+            listed = self.client.get(url)
+
+        self.assertEqual(statuses, [201, 201, 429])
+        self.assertIn("Retry-After", throttled)
+        self.assertEqual(listed.status_code, status.HTTP_200_OK)
+
+    def test_scoped_throttle_needs_scope(self):
+        throttle = ScopedSlidingWindowThrottle()
+
+        self.assertTrue(throttle.allow_request(APIRequestFactory().get("/"), None))
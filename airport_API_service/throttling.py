@@ -0,0 +1,80 @@
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Limit requests with a sliding window counter.
+
+    Requests are counted per fixed window of the rate's duration. The
+    number of requests in the last `duration` seconds is estimated as the
+    count of the current window plus the count of the previous one,
+    weighted by how much of it the sliding window still covers. A key costs
+    two integers in the cache whatever the rate, and counters are updated
+    with atomic increments, so the limits hold across processes sharing
+    the cache.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, progress = divmod(self.now, self.duration)
+        self.progress = progress / self.duration
+        self.window_key = f"{self.key}:{int(window)}"
+        previous_key = f"{self.key}:{int(window) - 1}"
+
+        counts = self.cache.get_many([self.window_key, previous_key])
+        self.previous = counts.get(previous_key, 0)
+        if self.window_key not in counts:
+            # the key is needed for one more window as the previous count
+            self.cache.add(self.window_key, 0, self.duration * 2)
+        try:
+            self.current = self.cache.incr(self.window_key)
+        except ValueError:
+            self.current = 1
+            self.cache.set(self.window_key, self.current, self.duration * 2)
+
+        if self.previous * (1 - self.progress) + self.current > self.num_requests:
+            # throttled requests do not count
+            self.cache.decr(self.window_key)
+            self.current -= 1
+            return self.throttle_failure()
+
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """Seconds until the estimate leaves room for one more request"""
+        room = self.num_requests - 1
+        if self.current <= room:
+            # the previous window has to slide out far enough
+            needed = 1 - (room - self.current) / self.previous
+        else:
+            # the current window becomes the previous one first
+            needed = 2 - room / self.current
+
+        return max(needed - self.progress, 0) * self.duration
+
+
+class AnonSlidingWindowThrottle(AnonRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class UserSlidingWindowThrottle(UserRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class ScopedSlidingWindowThrottle(ScopedRateThrottle, SlidingWindowRateThrottle):
+    """Limit views by their `throttle_scope`, per user or client address"""
@@ -0,0 +1,127 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import Http404
+from rest_framework.response import Response
+
+
+class ValuesListModelMixin:
+    """Serve `list` with `values_serializer_class` straight from `.values()`"""
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None or not settings.FAST_LIST_SERIALIZERS:
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.values_serializer_class(context=self.get_serializer_context())
+        rows = serializer.rows(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            serializer.instance = page
+            return self.get_paginated_response(serializer.data)
+
+        serializer.instance = rows
+        return Response(serializer.data)
+
+    async def alist(self, request, *args, **kwargs):
+        if self.values_serializer_class is None or not settings.FAST_LIST_SERIALIZERS:
+            return await sync_to_async(super().list)(request, *args, **kwargs)
+
+        serializer = self.values_serializer_class(context=self.get_serializer_context())
+        rows = serializer.rows(self.filter_queryset(self.get_queryset()))
+
+        page = await self.apaginate_queryset(rows)
+        if page is not None:
+            serializer.instance = page
+            return self.get_paginated_response(await serializer.adata())
+
+        serializer.instance = rows
+        return Response(await serializer.adata())
+
+
+class AsyncReadMixin:
+    """
+    Serve safe methods of a viewset with the async ORM.
+
+    `as_async_view` returns an async view for the same actions as
+    `as_view`. GET and HEAD requests of actions with an async variant
+    (`alist` for `list`) run authentication, permissions and throttling in
+    a worker thread and everything else on the event loop. Other requests
+    go to the synchronous view.
+    """
+
+    @classmethod
+    def as_async_view(cls, actions, **initkwargs):
+        sync_view = sync_to_async(cls.as_view(actions, **initkwargs))
+
+        async def view(request, *args, **kwargs):
+            action = actions.get(request.method.lower())
+            if request.method == "HEAD":
+                action = actions.get("get")
+            if request.method not in ("GET", "HEAD") or not hasattr(cls, f"a{action}"):
+                return await sync_view(request, *args, **kwargs)
+
+            self = cls(**initkwargs)
+            self.action_map = actions
+            for method, method_action in actions.items():
+                setattr(self, method, getattr(self, method_action))
+            if "get" in actions and "head" not in actions:
+                self.head = self.get
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+
+            return await self.adispatch(request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.actions = actions
+        # csrf_exempt() wraps async views into sync ones before Django 5.0,
+        # DRF authentication enforces CSRF itself
+        view.csrf_exempt = True
+        return view
+
+    async def adispatch(self, request, *args, **kwargs):
+        """`dispatch` awaiting the async variant of the action"""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = getattr(self, f"a{self.action}")
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+
+        return await self.paginator.apaginate_queryset(
+            queryset, self.request, view=self
+        )
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+
+        await sync_to_async(self.check_object_permissions)(self.request, obj)
+        return obj
+
+    async def aretrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(await self.aget_object())
+        return Response(serializer.data)
@@ -0,0 +1,175 @@
+import datetime
+import random
+from collections import defaultdict
+from itertools import permutations
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import serializers
+from django.db import transaction
+from django.utils import timezone
+
+from airplane.models import Airplane
+from airport.models import Airport, Route
+from airport_API_service.cache import invalidate_model_cache
+from flight.models import Crew, Flight, Meal, Order, SeatInventory, Ticket
+
+REFERENCE_MODELS = (
+    "airport.country",
+    "airport.city",
+    "airport.airport",
+    "airplane.airline",
+    "airplane.airplanetype",
+    "airplane.airplane",
+    "flight.crew",
+    "flight.meal",
+)
+
+
+class DatasetFactory:
+    """
+    Seed a realistic dataset for benchmarks.
+
+    Reference data (countries, cities, airports, airplanes, crew and meals)
+    comes from `airport_data.json`. Routes connect every pair of airports,
+    flights are spread over the upcoming days and orders fill random seats.
+    """
+
+    def __init__(
+        self,
+        flights=3000,
+        tickets=30000,
+        users=50,
+        crew_per_flight=3,
+        fixture=None,
+        seed=42,
+    ):
+        self.flights = flights
+        self.tickets = tickets
+        self.users = users
+        self.crew_per_flight = crew_per_flight
+        self.fixture = fixture or Path(settings.BASE_DIR) / "airport_data.json"
+        self.random = random.Random(seed)
+
+    @transaction.atomic
+    def create(self):
+        self.load_reference_data()
+        routes = self.create_routes()
+        flights = self.create_flights(routes)
+        users = self.create_users()
+        self.create_orders(flights, users)
+
+        # bulk_create does not send signals
+        for model in (Route, Flight):
+            invalidate_model_cache(sender=model)
+
+        return {
+            "routes": routes,
+            "flights": flights,
+            "users": users,
+        }
+
+    def load_reference_data(self):
+        with open(self.fixture) as fixture:
+            for obj in serializers.deserialize("json", fixture):
+                if obj.object._meta.label_lower in REFERENCE_MODELS:
+                    obj.save()
+
+    def create_routes(self):
+        routes = [
+            Route(
+                source=source,
+                destination=destination,
+                distance=self.random.randint(300, 9000),
+            )
+            for source, destination in permutations(
+                Airport.objects.select_related("city__country"), 2
+            )
+        ]
+        # bulk_create does not call Route.save()
+        for route in routes:
+            route.set_display_fields()
+
+        return Route.objects.bulk_create(routes)
+
+    def create_flights(self, routes):
+        airplanes = list(Airplane.objects.all())
+        start = timezone.now().replace(minute=0, second=0, microsecond=0)
+        flights = []
+        for index in range(self.flights):
+            departure_time = start + datetime.timedelta(
+                hours=1 + index * 24 * 60 // self.flights,
+                minutes=self.random.choice((0, 15, 30, 45)),
+            )
+            flights.append(
+                Flight(
+                    route=self.random.choice(routes),
+                    airplane=self.random.choice(airplanes),
+                    departure_time=departure_time,
+                    arrival_time=departure_time
+                    + datetime.timedelta(minutes=self.random.randint(60, 720)),
+                )
+            )
+        flights = Flight.objects.bulk_create(flights)
+
+        crew = list(Crew.objects.values_list("id", flat=True))
+        Flight.crew_members.through.objects.bulk_create(
+            Flight.crew_members.through(flight_id=flight.id, crew_id=crew_id)
+            for flight in flights
+            for crew_id in self.random.sample(
+                crew, min(self.crew_per_flight, len(crew))
+            )
+        )
+
+        return flights
+
+    def create_users(self):
+        user_model = get_user_model()
+        return user_model.objects.bulk_create(
+            user_model(email=f"passenger{index}@airport.com")
+            for index in range(self.users)
+        )
+
+    def create_orders(self, flights, users):
+        meals = list(Meal.objects.all())
+        orders = Order.objects.bulk_create(
+            Order(user=self.random.choice(users))
+            for _ in range(max(1, self.tickets // 3))
+        )
+
+        taken = defaultdict(set)
+        tickets = []
+        while len(tickets) < self.tickets:
+            flight = self.random.choice(flights)
+            airplane = flight.airplane
+            seat = (
+                self.random.randint(1, airplane.rows),
+                self.random.randint(1, airplane.seats_in_row),
+            )
+            if seat in taken[flight.id]:
+                continue
+            taken[flight.id].add(seat)
+            tickets.append(
+                Ticket(
+                    row=seat[0],
+                    seat=seat[1],
+                    flight=flight,
+                    order=orders[len(tickets) % len(orders)],
+                    meal=self.random.choice(meals),
+                )
+            )
+        Ticket.objects.bulk_create(tickets, batch_size=2000)
+
+        SeatInventory.objects.bulk_create(
+            SeatInventory(
+                flight=flight,
+                tickets_sold=len(taken[flight.id]),
+                seat_map=SeatInventory.build_seat_map(
+                    taken[flight.id],
+                    flight.airplane.rows,
+                    flight.airplane.seats_in_row,
+                ),
+            )
+            for flight in flights
+        )
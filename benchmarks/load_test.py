@@ -0,0 +1,197 @@
+"""
+Compare throughput of the read endpoints under WSGI and ASGI.
+
+Starts gunicorn with the same number of workers twice: with sync workers
+serving `airport_API_service.wsgi`, and with uvicorn workers serving
+`airport_API_service.asgi` with `ASYNC_READ_VIEWS` enabled. Each server
+is hit by `--concurrency` client threads for `--duration` seconds.
+
+    python -m benchmarks.load_test --workers 4 --concurrency 64 --seed
+
+Uses the database configured in .env, `--seed` fills it with the
+benchmark dataset first.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import django
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SERVERS = {
+    "wsgi": (["airport_API_service.wsgi:application"], {}),
+    "asgi": (
+        [
+            "airport_API_service.asgi:application",
+            "--worker-class",
+            "uvicorn.workers.UvicornWorker",
+        ],
+        {"ASYNC_READ_VIEWS": "True"},
+    ),
+}
+
+# the same for both servers: no throttling, the middleware of production
+SERVER_ENV = {
+    "THROTTLE_ANON_RATE": "",
+    "THROTTLE_USER_RATE": "",
+}
+
+
+def prepare(seed):
+    """Return the read paths and an access token for the load test"""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_API_service.settings")
+    django.setup()
+
+    from django.contrib.auth import get_user_model
+    from django.urls import reverse
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from benchmarks.factory import DatasetFactory
+    from flight.models import Flight
+
+    if seed:
+        DatasetFactory().create()
+
+    flight = Flight.objects.select_related("route__source").order_by("id").first()
+    if flight is None:
+        sys.exit("No flights in the database, run with --seed")
+
+    user, _ = get_user_model().objects.get_or_create(email="loadtest@airport.com")
+    paths = [
+        reverse("flight:flight-list") + "?page_size=50",
+        reverse("flight:flight-list") + f"?source={flight.route.source.airport_code}",
+        reverse("flight:flight-detail", args=[flight.id]),
+        reverse("flight:flight-seat-map", args=[flight.id]),
+        reverse("airport:route-list"),
+    ]
+    return paths, str(AccessToken.for_user(user))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, workers, port):
+    args, env = SERVERS[mode]
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            *args,
+            "--workers",
+            str(workers),
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--log-level",
+            "warning",
+        ],
+        cwd=BASE_DIR,
+        env={**os.environ, **SERVER_ENV, **env},
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.2)
+    process.kill()
+    sys.exit(f"{mode} server did not start")
+
+
+def hammer(base_url, paths, token, concurrency, duration):
+    """Request `paths` round robin from parallel threads, return the stats"""
+    latencies = []
+    errors = []
+    deadline = time.monotonic() + duration
+
+    def client(offset):
+        count = offset
+        while time.monotonic() < deadline:
+            request = urllib.request.Request(
+                base_url + paths[count % len(paths)],
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            count += 1
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+            except (urllib.error.URLError, OSError) as error:
+                errors.append(error)
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    threads = [
+        threading.Thread(target=client, args=(index,)) for index in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else []
+    return {
+        "requests_per_second": len(latencies) / duration,
+        "p50_ms": quantiles[49] if quantiles else 0.0,
+        "p95_ms": quantiles[94] if quantiles else 0.0,
+        "errors": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--seed", action="store_true")
+    options = parser.parse_args()
+
+    paths, token = prepare(options.seed)
+    results = {}
+    for mode in SERVERS:
+        port = free_port()
+        server = start_server(mode, options.workers, port)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            hammer(base_url, paths, token, options.concurrency, options.warmup)
+            results[mode] = hammer(
+                base_url, paths, token, options.concurrency, options.duration
+            )
+        finally:
+            server.terminate()
+            server.wait()
+
+        stats = results[mode]
+        print(
+            f"{mode}: {stats['requests_per_second']:.1f} req/s, "
+            f"p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+            f"{stats['errors']} errors"
+        )
+
+    if results["wsgi"]["requests_per_second"]:
+        ratio = (
+            results["asgi"]["requests_per_second"]
+            / results["wsgi"]["requests_per_second"]
+        )
+        print(f"asgi/wsgi throughput with {options.workers} workers: {ratio:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import json
+import logging
+import statistics
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.serializers import BaseSerializer
+from rest_framework.views import APIView
+
+from airport_API_service.serializers import ValuesListSerializer
+from user.serializers import TokenObtainPairSerializer
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+logger = logging.getLogger("benchmarks")
+
+
+def endpoints(dataset):
+    """Named GET requests covering every read endpoint of the API"""
+    flight = dataset["flights"][0]
+    route = flight.route
+
+    return {
+        "countries": (reverse("airport:country-list"), {}),
+        "cities": (reverse("airport:city-list"), {}),
+        "airports": (reverse("airport:airport-list"), {}),
+        "airport-search": (reverse("airport:search-list"), {"q": "int"}),
+        "routes": (reverse("airport:route-list"), {}),
+        "route-detail": (reverse("airport:route-detail", args=[route.id]), {}),
+        "airlines": (reverse("airplane:airline-list"), {}),
+        "airplane-types": (reverse("airplane:airplanetype-list"), {}),
+        "airplanes": (reverse("airplane:airplane-list"), {}),
+        "crew": (reverse("flight:crew-members-list"), {}),
+        "flights": (reverse("flight:flight-list"), {"page_size": 100}),
+        "flights-filtered": (
+            reverse("flight:flight-list"),
+            {
+                "source": route.source.airport_code,
+                "min_tickets_available": 1,
+                "count": "true",
+            },
+        ),
+        "flight-detail": (reverse("flight:flight-detail", args=[flight.id]), {}),
+        "flight-seat-map": (reverse("flight:flight-seat-map", args=[flight.id]), {}),
+        "itineraries": (
+            reverse("flight:itineraries-list"),
+            {
+                "source": route.source.airport_code,
+                "destination": route.destination.airport_code,
+            },
+        ),
+        "orders": (reverse("flight:order-list"), {}),
+    }
+
+
+class SerializerTimer:
+    """Accumulate time spent producing `serializer.data`"""
+
+    serializer_classes = (BaseSerializer, ValuesListSerializer)
+
+    def __init__(self):
+        self.elapsed = 0.0
+
+    def timed(self, data):
+        def timed_data(serializer):
+            start = time.perf_counter()
+            try:
+                return data(serializer)
+            finally:
+                self.elapsed += time.perf_counter() - start
+
+        return property(timed_data)
+
+    @contextmanager
+    def patch(self):
+        with ExitStack() as stack:
+            for serializer_class in self.serializer_classes:
+                stack.enter_context(
+                    mock.patch.object(
+                        serializer_class, "data", self.timed(serializer_class.data.fget)
+                    )
+                )
+            yield self
+
+
+def authenticate(client, user):
+    """Send an access token like real clients, so that auth is measured"""
+    token = TokenObtainPairSerializer.get_token(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def without_throttling():
+    """Let benchmarks repeat requests beyond the API rate limits"""
+    return mock.patch.object(APIView, "get_throttles", return_value=[])
+
+
+def percentile(samples, percent):
+    if len(samples) == 1:
+        return samples[0]
+
+    return statistics.quantiles(samples, n=100, method="inclusive")[percent - 1]
+
+
+def measure(client, url, params, repeat=50, prepare=None):
+    """
+    Return query count of a cold request, p50/p95 latency and serializer
+    time of `repeat` warm requests, in milliseconds. `prepare` runs after
+    the cache is cleared, before the cold request.
+    """
+    cache.clear()
+    if prepare is not None:
+        prepare()
+    # the query log is a bounded deque, full after seeding
+    reset_queries()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, params)
+    query_count = len(queries)
+    if response.status_code != 200:
+        raise AssertionError(f"GET {url} returned {response.status_code}")
+
+    latencies = []
+    timer = SerializerTimer()
+    with timer.patch():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get(url, params)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                raise AssertionError(f"GET {url} returned {response.status_code}")
+
+    return {
+        "queries": query_count,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "serializer_ms": round(timer.elapsed * 1000 / repeat, 2),
+    }
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path) as baseline:
+            return json.load(baseline)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """Store the query counts of `results`, latencies depend on the machine"""
+    with open(path, "w") as baseline:
+        json.dump(
+            {name: {"queries": result["queries"]} for name, result in results.items()},
+            baseline,
+            indent=2,
+            sort_keys=True,
+        )
+        baseline.write("\n")
+
+
+def compare(result, baseline):
+    """List regressions of `result` against its `baseline` entry"""
+    if result["queries"] > baseline["queries"]:
+        return [f"queries {result['queries']} > baseline {baseline['queries']}"]
+    return []
+
+
+def format_report(results):
+    lines = [
+        f"{'endpoint':<20} {'queries':>7} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'serializer ms':>13}"
+    ]
+    for name, result in results.items():
+        lines.append(
+            f"{name:<20} {result['queries']:>7} {result['p50_ms']:>8} "
+            f"{result['p95_ms']:>8} {result['serializer_ms']:>13}"
+        )
+
+    return "\n".join(lines)
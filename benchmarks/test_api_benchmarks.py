@@ -0,0 +1,97 @@
+import os
+from unittest import mock, skipUnless
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from user.authentication import StatelessJWTAuthentication, publish_user_claims
+from .factory import DatasetFactory
+from .suite import (
+    logger,
+    authenticate,
+    compare,
+    endpoints,
+    format_report,
+    load_baseline,
+    measure,
+    save_baseline,
+    without_throttling,
+)
+
+
+@skipUnless(os.environ.get("BENCHMARK"), "set BENCHMARK=1 to run benchmarks")
+class ApiBenchmarkTests(TestCase):
+    """
+    Per-endpoint query counts and latency on a seeded dataset.
+
+    BENCHMARK_UPDATE=1 stores the query counts as the new baseline,
+    latencies are only reported.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = DatasetFactory(
+            flights=int(os.environ.get("BENCHMARK_FLIGHTS", 3000)),
+            tickets=int(os.environ.get("BENCHMARK_TICKETS", 30000)),
+        ).create()
+
+    def setUp(self):
+        throttling = without_throttling()
+        throttling.start()
+        self.addCleanup(throttling.stop)
+        self.client = authenticate(APIClient(), self.dataset["users"][0])
+
+    def test_endpoints(self):
+        repeat = int(os.environ.get("BENCHMARK_REPEAT", 50))
+
+        results = {
+            name: measure(self.client, url, params, repeat=repeat)
+            for name, (url, params) in endpoints(self.dataset).items()
+        }
+        logger.info(format_report(results))
+
+        if os.environ.get("BENCHMARK_UPDATE"):
+            save_baseline(results)
+            return
+
+        baseline = load_baseline()
+        for name, result in results.items():
+            with self.subTest(name):
+                self.assertIn(name, baseline, "no baseline, run BENCHMARK_UPDATE=1")
+                self.assertEqual(compare(result, baseline[name]), [])
+
+    def test_stateless_authentication(self):
+        """Stateless JWT authentication saves the user query of every request"""
+        repeat = int(os.environ.get("BENCHMARK_REPEAT", 50))
+        all_endpoints = endpoints(self.dataset)
+        user = self.dataset["users"][0]
+
+        for name in ("crew", "flight-detail", "orders"):
+            url, params = all_endpoints[name]
+            results = {}
+            for authentication in (JWTAuthentication, StatelessJWTAuthentication):
+                with mock.patch.object(
+                    APIView, "authentication_classes", [authentication]
+                ):
+                    results[authentication.__name__] = measure(
+                        self.client,
+                        url,
+                        params,
+                        repeat=repeat,
+                        # claims are published on every user change
+                        prepare=lambda: publish_user_claims(user),
+                    )
+
+            stateful = results["JWTAuthentication"]
+            stateless = results["StatelessJWTAuthentication"]
+            logger.info(
+                f"{name:<20} user lookup: {stateful['queries']} queries, "
+                f"p50 {stateful['p50_ms']} ms; "
+                f"stateless: {stateless['queries']} queries, "
+                f"p50 {stateless['p50_ms']} ms"
+            )
+
+            with self.subTest(name):
+                self.assertEqual(stateless["queries"], stateful["queries"] - 1)
@@ -0,0 +1,76 @@
+import os
+import statistics
+import time
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+from django.test import TransactionTestCase
+from rest_framework.test import APIClient
+
+from .factory import DatasetFactory
+from .suite import endpoints, logger, without_throttling
+
+CONNECTION_SETTINGS = {
+    "fresh": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    "persistent": {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": False},
+    "health-checked": {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True},
+}
+
+
+@skipUnless(os.environ.get("BENCHMARK"), "set BENCHMARK=1 to run benchmarks")
+@skipUnless(connection.vendor == "postgresql", "connection setup of PostgreSQL")
+class ConnectionBenchmarkTests(TransactionTestCase):
+    """
+    Latency of requests opening a connection each vs reusing connections.
+
+    The test client keeps its connection between requests, so the request
+    end of a server (`close_old_connections`) is replayed after every
+    request. BENCHMARK_CONNECTION_REPEAT sets the requests per endpoint.
+    """
+
+    endpoint_names = ("flight-detail", "flight-seat-map", "crew")
+
+    def setUp(self):
+        throttling = without_throttling()
+        throttling.start()
+        self.addCleanup(throttling.stop)
+        self.dataset = DatasetFactory(flights=100, tickets=500).create()
+        self.client = APIClient()
+        self.client.force_authenticate(self.dataset["users"][0])
+        self.addCleanup(connection.settings_dict.update, dict(connection.settings_dict))
+
+    def request_latencies(self, url, params, repeat):
+        latencies = []
+        for _ in range(repeat):
+            cache.clear()
+            start = time.perf_counter()
+            self.client.get(url, params)
+            close_old_connections()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        return latencies
+
+    def test_connection_reuse(self):
+        repeat = int(os.environ.get("BENCHMARK_CONNECTION_REPEAT", 200))
+        all_endpoints = endpoints(self.dataset)
+
+        for name in self.endpoint_names:
+            url, params = all_endpoints[name]
+            medians = {}
+            for mode, conn_settings in CONNECTION_SETTINGS.items():
+                # settings are read when a connection is opened
+                connection.close()
+                connection.settings_dict.update(conn_settings)
+                medians[mode] = statistics.median(
+                    self.request_latencies(url, params, repeat)
+                )
+
+            logger.info(
+                f"{name:<20} "
+                + ", ".join(f"{mode} {ms:.2f} ms" for mode, ms in medians.items())
+            )
+
+            with self.subTest(name):
+                self.assertLess(medians["persistent"], medians["fresh"])
+                self.assertLess(medians["health-checked"], medians["fresh"])
@@ -0,0 +1,76 @@
+import os
+import time
+import tracemalloc
+from unittest import skipUnless
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from flight.models import Ticket
+from .factory import DatasetFactory
+from .suite import authenticate, logger, without_throttling
+
+
+@skipUnless(os.environ.get("BENCHMARK"), "set BENCHMARK=1 to run benchmarks")
+class ExportBenchmarkTests(TestCase):
+    """
+    Peak memory and throughput of streaming exports: memory stays flat
+    while the output grows with the number of rows.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = DatasetFactory(
+            flights=1000,
+            tickets=int(os.environ.get("BENCHMARK_EXPORT_TICKETS", 100000)),
+            users=1,
+        ).create()
+
+    def setUp(self):
+        throttling = without_throttling()
+        throttling.start()
+        self.addCleanup(throttling.stop)
+        self.client = authenticate(APIClient(), self.dataset["users"][0])
+        self.peaks = {}
+
+    def export(self, export_format):
+        """Streamed bytes, peak traced memory in bytes and seconds"""
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            response = self.client.get(
+                reverse("flight:order-export"), {"format": export_format}
+            )
+            size = sum(len(chunk) for chunk in response.streaming_content)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return size, peak, elapsed
+
+    def test_export_memory(self):
+        tickets = Ticket.objects.count()
+        for export_format in ("csv", "ndjson"):
+            size, peak, elapsed = self.export(export_format)
+            logger.info(
+                f"{export_format:<6} {tickets} rows, {size // 1024} KiB in "
+                f"{elapsed:.2f} s ({tickets / elapsed:,.0f} rows/s), "
+                f"peak memory {peak // 1024} KiB"
+            )
+            self.peaks[export_format] = peak
+
+        # a tenth of the rows, about the same peak
+        Ticket.objects.filter(
+            id__gt=Ticket.objects.order_by("id")[tickets // 10].id
+        ).delete()
+        for export_format, peak in self.peaks.items():
+            size, small_peak, _ = self.export(export_format)
+            logger.info(
+                f"{export_format:<6} {tickets // 10} rows, {size // 1024} KiB, "
+                f"peak memory {small_peak // 1024} KiB"
+            )
+
+            with self.subTest(export_format):
+                self.assertLess(peak, small_peak * 2)
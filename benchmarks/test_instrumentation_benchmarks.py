@@ -0,0 +1,80 @@
+import os
+import statistics
+import time
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .factory import DatasetFactory
+from .suite import endpoints, logger, without_throttling
+
+INSTRUMENTATION_MIDDLEWARE = (
+    "airport_API_service.instrumentation.InstrumentationMiddleware"
+)
+
+
+@skipUnless(os.environ.get("BENCHMARK"), "set BENCHMARK=1 to run benchmarks")
+class InstrumentationOverheadBenchmarkTests(TestCase):
+    """
+    Latency of requests with and without `InstrumentationMiddleware`.
+
+    Requests alternate between both middleware chains so that drift of the
+    machine affects them equally. BENCHMARK_INSTRUMENTATION_OVERHEAD sets
+    the allowed growth of the median latency (default 0.1, i.e. 10%).
+    """
+
+    endpoint_names = ("crew", "flights", "orders")
+    repeat = 100
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = DatasetFactory(flights=1000, tickets=10000).create()
+
+    def setUp(self):
+        throttling = without_throttling()
+        throttling.start()
+        self.addCleanup(throttling.stop)
+
+    def client_with(self, middleware):
+        # the middleware chain is loaded on the first request of a client
+        with override_settings(MIDDLEWARE=middleware):
+            client = APIClient()
+            client.force_authenticate(self.dataset["users"][0])
+            client.get("/")
+        return client
+
+    def test_instrumentation_overhead(self):
+        tolerance = float(os.environ.get("BENCHMARK_INSTRUMENTATION_OVERHEAD", 0.1))
+        instrumented = [INSTRUMENTATION_MIDDLEWARE] + [
+            middleware
+            for middleware in settings.MIDDLEWARE
+            if middleware != INSTRUMENTATION_MIDDLEWARE
+        ]
+        clients = {
+            "plain": self.client_with(instrumented[1:]),
+            "instrumented": self.client_with(instrumented),
+        }
+
+        all_endpoints = endpoints(self.dataset)
+        for name in self.endpoint_names:
+            url, params = all_endpoints[name]
+            cache.clear()
+            latencies = {key: [] for key in clients}
+            for _ in range(self.repeat):
+                for key, client in clients.items():
+                    start = time.perf_counter()
+                    client.get(url, params)
+                    latencies[key].append((time.perf_counter() - start) * 1000)
+
+            plain = statistics.median(latencies["plain"])
+            with_instrumentation = statistics.median(latencies["instrumented"])
+            logger.info(
+                f"{name:<20} plain {plain:.2f} ms, "
+                f"instrumented {with_instrumentation:.2f} ms"
+            )
+
+            with self.subTest(name):
+                self.assertLessEqual(with_instrumentation, plain * (1 + tolerance))
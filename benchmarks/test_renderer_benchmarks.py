@@ -0,0 +1,64 @@
+import json
+import os
+import time
+from unittest import skipUnless
+
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from airport_API_service.renderers import ORJSONRenderer
+from flight.models import Order
+from flight.serializers import FlightListSerializer, OrderDetailSerializer
+from flight.views import FlightViewSet
+from .factory import DatasetFactory
+from .suite import logger
+
+
+def render_time(renderer, data, repeat=5):
+    """Best of `repeat` render times in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        renderer.render(data)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return min(timings)
+
+
+@skipUnless(os.environ.get("BENCHMARK"), "set BENCHMARK=1 to run benchmarks")
+class RendererBenchmarkTests(TestCase):
+    """Render time of large flight and order payloads, stdlib json vs orjson"""
+
+    @classmethod
+    def setUpTestData(cls):
+        DatasetFactory(flights=2000, tickets=20000).create()
+
+    def payloads(self):
+        flights = FlightListSerializer(FlightViewSet.queryset.all(), many=True).data
+        orders = OrderDetailSerializer(
+            Order.objects.prefetch_related(
+                "tickets__meal",
+                "tickets__flight__airplane",
+                "tickets__flight__crew_members",
+                "tickets__flight__route",
+            )[:1000],
+            many=True,
+        ).data
+
+        return {"FlightListSerializer": flights, "OrderDetailSerializer": orders}
+
+    def test_render_time(self):
+        for name, data in self.payloads().items():
+            rendered = ORJSONRenderer().render(data)
+            stdlib = render_time(JSONRenderer(), data)
+            fast = render_time(ORJSONRenderer(), data)
+            logger.info(
+                f"{name:<22} {len(rendered) // 1024} KiB, "
+                f"json {stdlib:.2f} ms, orjson {fast:.2f} ms ({stdlib / fast:.1f}x)"
+            )
+
+            with self.subTest(name):
+                self.assertEqual(
+                    json.loads(rendered), json.loads(JSONRenderer().render(data))
+                )
+                self.assertLess(fast, stdlib)
@@ -0,0 +1,64 @@
+import os
+import statistics
+import time
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import UserRateThrottle
+
+from airport_API_service.throttling import UserSlidingWindowThrottle
+from .suite import logger
+
+
+@skipUnless(os.environ.get("BENCHMARK"), "set BENCHMARK=1 to run benchmarks")
+class ThrottleBenchmarkTests(SimpleTestCase):
+    """
+    Time `allow_request` takes per request, DRF's timestamp list throttle
+    vs the sliding window counter, for clients with a long request history.
+    """
+
+    rate = "100000/hour"
+    history_sizes = (10, 1000, 10000)
+    repeat = 200
+
+    def setUp(self):
+        cache.clear()
+        rates = mock.patch.dict(
+            api_settings.DEFAULT_THROTTLE_RATES, {"user": self.rate}
+        )
+        rates.start()
+        self.addCleanup(rates.stop)
+        self.request = APIRequestFactory().get("/")
+        self.request.user = SimpleNamespace(pk=1, is_authenticated=True)
+
+    def request_times(self, throttle_class, history):
+        for _ in range(history):
+            throttle_class().allow_request(self.request, None)
+
+        timings = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            allowed = throttle_class().allow_request(self.request, None)
+            timings.append((time.perf_counter() - start) * 1000)
+            self.assertTrue(allowed)
+
+        return statistics.median(timings)
+
+    def test_throttle_overhead(self):
+        for history in self.history_sizes:
+            cache.clear()
+            timestamps = self.request_times(UserRateThrottle, history)
+            cache.clear()
+            sliding = self.request_times(UserSlidingWindowThrottle, history)
+            logger.info(
+                f"{history:>6} requests before: timestamp list {timestamps:.3f} ms, "
+                f"sliding window {sliding:.3f} ms per request"
+            )
+
+            if history >= 1000:
+                with self.subTest(history=history):
+                    self.assertLess(sliding, timestamps)
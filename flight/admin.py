@@ -1,9 +1,10 @@
 from django.contrib import admin
 
-from flight.models import Crew, Meal, Flight, Order, Ticket
+from flight.models import Crew, Meal, Flight, Order, Ticket, SeatInventory
 
 admin.site.register(Crew)
 admin.site.register(Meal)
 admin.site.register(Flight)
 admin.site.register(Order)
 admin.site.register(Ticket)
+admin.site.register(SeatInventory)
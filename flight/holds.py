@@ -0,0 +1,325 @@
+import json
+import logging
+import secrets
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+SeatHold = namedtuple(
+    "SeatHold", ("token", "user_id", "flight_id", "seats", "expires_at")
+)
+
+
+class SeatsUnavailable(Exception):
+    """Some of the requested seats are held by another customer"""
+
+    def __init__(self, seats):
+        super().__init__(f"seats held by another customer: {sorted(seats)}")
+        self.seats = sorted(seats)
+
+
+def new_hold(user_id, flight_id, seats, ttl=None):
+    ttl = settings.SEAT_HOLD_TTL if ttl is None else ttl
+    return SeatHold(
+        token=secrets.token_urlsafe(16),
+        user_id=user_id,
+        flight_id=flight_id,
+        seats=tuple(sorted({(row, seat) for row, seat in seats})),
+        expires_at=time.time() + ttl,
+    )
+
+
+class BaseSeatHoldBackend:
+    """
+    Store of temporary seat reservations.
+
+    `hold` reserves all seats of a hold or none of them. Expired holds are
+    ignored by every method and removed by `sweep`.
+    """
+
+    @staticmethod
+    def _now(now):
+        return time.time() if now is None else now
+
+    def hold(self, hold):
+        """Store `hold`, raise `SeatsUnavailable` if a seat is held by others"""
+        raise NotImplementedError
+
+    def get(self, token, now=None):
+        raise NotImplementedError
+
+    def release(self, token):
+        raise NotImplementedError
+
+    def held_seats(self, flight_id, now=None):
+        """Return `{(row, seat): token}` of active holds of a flight"""
+        raise NotImplementedError
+
+    def sweep(self, now=None):
+        """Remove expired holds, return how many were removed"""
+        raise NotImplementedError
+
+
+class InMemorySeatHoldBackend(BaseSeatHoldBackend):
+    """Holds of a single process, for development and tests"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._holds = {}
+        self._seats = defaultdict(dict)
+
+    def hold(self, hold):
+        now = time.time()
+        with self._lock:
+            flight_seats = self._seats[hold.flight_id]
+            taken = [
+                seat
+                for seat in hold.seats
+                if seat in flight_seats
+                and flight_seats[seat].token != hold.token
+                and flight_seats[seat].expires_at > now
+            ]
+            if taken:
+                raise SeatsUnavailable(taken)
+
+            self._holds[hold.token] = hold
+            for seat in hold.seats:
+                flight_seats[seat] = hold
+
+    def get(self, token, now=None):
+        hold = self._holds.get(token)
+        if hold is None or hold.expires_at <= self._now(now):
+            return None
+
+        return hold
+
+    def release(self, token):
+        with self._lock:
+            self._remove(self._holds.get(token))
+
+    def _remove(self, hold):
+        if hold is None:
+            return
+
+        self._holds.pop(hold.token, None)
+        flight_seats = self._seats[hold.flight_id]
+        for seat in hold.seats:
+            if seat in flight_seats and flight_seats[seat].token == hold.token:
+                del flight_seats[seat]
+        if not flight_seats:
+            del self._seats[hold.flight_id]
+
+    def held_seats(self, flight_id, now=None):
+        now = self._now(now)
+        return {
+            seat: hold.token
+            for seat, hold in list(self._seats.get(flight_id, {}).items())
+            if hold.expires_at > now
+        }
+
+    def sweep(self, now=None):
+        now = self._now(now)
+        with self._lock:
+            expired = [hold for hold in self._holds.values() if hold.expires_at <= now]
+            for hold in expired:
+                self._remove(hold)
+
+        return len(expired)
+
+
+class RedisSeatHoldBackend(BaseSeatHoldBackend):
+    """
+    Holds shared by every process through a Redis-protocol server.
+
+    Each flight has a hash of `row:seat` -> `token:expires_at`, updated in
+    WATCH/MULTI transactions. Hold details live under the token key with a
+    matching TTL and a sorted set orders holds by expiry for `sweep`.
+    """
+
+    prefix = "seat-hold"
+    max_retries = 10
+
+    def __init__(self, client=None, url=None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url or settings.SEAT_HOLD_REDIS_URL)
+        self.client = client
+
+    def _flight_key(self, flight_id):
+        return f"{self.prefix}:flight:{flight_id}"
+
+    def _token_key(self, token):
+        return f"{self.prefix}:token:{token}"
+
+    @property
+    def _expiry_key(self):
+        return f"{self.prefix}:expiry"
+
+    @staticmethod
+    def _field(seat):
+        return f"{seat[0]}:{seat[1]}"
+
+    @staticmethod
+    def _parse_field(field):
+        row, seat = field.decode().split(":")
+        return int(row), int(seat)
+
+    @staticmethod
+    def _parse_value(value):
+        token, expires_at = value.decode().rsplit(":", 1)
+        return token, float(expires_at)
+
+    def _transaction(self, keys, function):
+        from redis.exceptions import WatchError
+
+        for _ in range(self.max_retries):
+            with self.client.pipeline() as pipe:
+                try:
+                    pipe.watch(*keys)
+                    result = function(pipe)
+                    pipe.execute()
+                    return result
+                except WatchError:
+                    continue
+
+        raise RuntimeError(f"seat hold transaction on {keys} kept conflicting")
+
+    def hold(self, hold):
+        flight_key = self._flight_key(hold.flight_id)
+        fields = [self._field(seat) for seat in hold.seats]
+
+        def reserve(pipe):
+            now = time.time()
+            taken = []
+            for seat, value in zip(hold.seats, pipe.hmget(flight_key, fields)):
+                if value is not None:
+                    token, expires_at = self._parse_value(value)
+                    if token != hold.token and expires_at > now:
+                        taken.append(seat)
+            if taken:
+                raise SeatsUnavailable(taken)
+
+            value = f"{hold.token}:{hold.expires_at}"
+            pipe.multi()
+            pipe.hset(flight_key, mapping={field: value for field in fields})
+            pipe.set(
+                self._token_key(hold.token),
+                json.dumps(hold._asdict()),
+                px=max(int((hold.expires_at - now) * 1000), 1),
+            )
+            pipe.zadd(
+                self._expiry_key,
+                {f"{hold.flight_id}:{hold.token}": hold.expires_at},
+            )
+
+        self._transaction([flight_key], reserve)
+
+    def get(self, token, now=None):
+        data = self.client.get(self._token_key(token))
+        if data is None:
+            return None
+
+        data = json.loads(data)
+        hold = SeatHold(**{**data, "seats": tuple(map(tuple, data["seats"]))})
+        if hold.expires_at <= self._now(now):
+            return None
+
+        return hold
+
+    def _remove(self, flight_id, token):
+        flight_key = self._flight_key(flight_id)
+
+        def remove(pipe):
+            fields = [
+                field
+                for field, value in pipe.hgetall(flight_key).items()
+                if self._parse_value(value)[0] == token
+            ]
+            pipe.multi()
+            if fields:
+                pipe.hdel(flight_key, *fields)
+            pipe.delete(self._token_key(token))
+            pipe.zrem(self._expiry_key, f"{flight_id}:{token}")
+
+        self._transaction([flight_key], remove)
+
+    def release(self, token):
+        hold = self.get(token, now=0)
+        if hold is not None:
+            self._remove(hold.flight_id, token)
+
+    def held_seats(self, flight_id, now=None):
+        now = self._now(now)
+        held = {}
+        for field, value in self.client.hgetall(self._flight_key(flight_id)).items():
+            token, expires_at = self._parse_value(value)
+            if expires_at > now:
+                held[self._parse_field(field)] = token
+
+        return held
+
+    def sweep(self, now=None):
+        expired = self.client.zrangebyscore(self._expiry_key, "-inf", self._now(now))
+        for member in expired:
+            flight_id, token = member.decode().split(":", 1)
+            self._remove(int(flight_id), token)
+
+        return len(expired)
+
+
+class SeatHoldSweeper(threading.Thread):
+    """Background thread removing expired holds every `interval` seconds"""
+
+    def __init__(self, backend, interval):
+        super().__init__(name="seat-hold-sweeper", daemon=True)
+        self.backend = backend
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.backend.sweep()
+            except Exception:
+                logger.exception("Sweeping expired seat holds failed")
+
+    def stop(self):
+        self._stopped.set()
+
+
+_backend = None
+_sweeper = None
+_backend_lock = threading.Lock()
+
+
+def get_seat_hold_backend():
+    """Return the configured backend, starting its sweeper on first use"""
+    global _backend, _sweeper
+
+    with _backend_lock:
+        if _backend is None:
+            _backend = import_string(settings.SEAT_HOLD_BACKEND)()
+            if settings.SEAT_HOLD_SWEEP_INTERVAL:
+                _sweeper = SeatHoldSweeper(_backend, settings.SEAT_HOLD_SWEEP_INTERVAL)
+                _sweeper.start()
+
+        return _backend
+
+
+@receiver(setting_changed)
+def reset_seat_hold_backend(setting, **kwargs):
+    global _backend, _sweeper
+
+    if setting.startswith("SEAT_HOLD_"):
+        with _backend_lock:
+            if _sweeper is not None:
+                _sweeper.stop()
+            _backend = _sweeper = None
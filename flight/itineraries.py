@@ -0,0 +1,254 @@
+import functools
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from airport.models import Airport, Route
+from airport_API_service.cache import bumped_version, get_model_versions
+from .models import Flight
+
+Leg = namedtuple(
+    "Leg",
+    (
+        "departure_time",
+        "arrival_time",
+        "flight_id",
+        "route_id",
+        "source_id",
+        "destination_id",
+    ),
+)
+
+
+class ItineraryIndex:
+    """In-memory departures board of upcoming flights, keyed by source airport"""
+
+    models = (Flight, Route, Airport)
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built_at = None
+        self._versions = None
+        self.airports = {}
+        self.routes = {}
+        self.legs = {}
+        self.departures = defaultdict(list)
+
+    def clear(self):
+        with self._lock:
+            self._built_at = None
+
+    def build(self):
+        with self._lock:
+            self._versions = get_model_versions(self.models)
+            self.airports = dict(Airport.objects.values_list("airport_code", "id"))
+            self.routes = {
+                route_id: (source_id, destination_id)
+                for route_id, source_id, destination_id in Route.objects.values_list(
+                    "id", "source_id", "destination_id"
+                )
+            }
+            self.legs = {}
+            self.departures = defaultdict(list)
+            for flight in Flight.objects.filter(
+                departure_time__gte=timezone.now()
+            ).values("id", "route_id", "departure_time", "arrival_time"):
+                self._add_flight(**flight)
+            for departures in self.departures.values():
+                departures.sort()
+            self._built_at = time.monotonic()
+
+    def ensure_fresh(self):
+        with self._lock:
+            if (
+                self._built_at is None
+                or time.monotonic() - self._built_at > settings.ITINERARY_INDEX_MAX_AGE
+                or get_model_versions(self.models) != self._versions
+            ):
+                self.build()
+
+    def _add_flight(self, id, route_id, departure_time, arrival_time, ordered=False):
+        if route_id not in self.routes:
+            return
+        source_id, destination_id = self.routes[route_id]
+        leg = Leg(departure_time, arrival_time, id, route_id, source_id, destination_id)
+        self.legs[id] = leg
+        if ordered:
+            insort(self.departures[source_id], leg)
+        else:
+            self.departures[source_id].append(leg)
+
+    def _remove_flight(self, flight_id):
+        leg = self.legs.pop(flight_id, None)
+        if leg is not None:
+            departures = self.departures[leg.source_id]
+            departures.pop(bisect_left(departures, leg))
+
+    def _advance_version(self, model, version):
+        """
+        Move the index to `version` of model if it directly follows the one
+        the index was built at; any other bump came from elsewhere, so the
+        mismatch is left for `ensure_fresh` to rebuild on.
+        """
+        index = self.models.index(model)
+        if version is not None and self._versions[index] + 1 == version:
+            self._versions[index] = version
+
+    def update_flight(self, flight, deleted=False):
+        transaction.on_commit(
+            functools.partial(
+                self._update_flight,
+                flight.id,
+                flight.route_id,
+                flight.departure_time,
+                flight.arrival_time,
+                deleted,
+                bumped_version(Flight),
+            )
+        )
+
+    def _update_flight(
+        self, flight_id, route_id, departure_time, arrival_time, deleted, version
+    ):
+        with self._lock:
+            if self._built_at is None:
+                return
+            self._remove_flight(flight_id)
+            if not deleted and departure_time >= timezone.now():
+                self._add_flight(
+                    flight_id, route_id, departure_time, arrival_time, ordered=True
+                )
+            self._advance_version(Flight, version)
+
+    def update_route(self, route, deleted=False):
+        transaction.on_commit(
+            functools.partial(
+                self._update_route,
+                route.id,
+                route.source_id,
+                route.destination_id,
+                deleted,
+                bumped_version(Route),
+            )
+        )
+
+    def _update_route(self, route_id, source_id, destination_id, deleted, version):
+        with self._lock:
+            if self._built_at is None:
+                return
+            affected = [leg for leg in self.legs.values() if leg.route_id == route_id]
+            for leg in affected:
+                self._remove_flight(leg.flight_id)
+            if deleted:
+                self.routes.pop(route_id, None)
+            else:
+                self.routes[route_id] = (source_id, destination_id)
+                for leg in affected:
+                    self._add_flight(
+                        leg.flight_id,
+                        route_id,
+                        leg.departure_time,
+                        leg.arrival_time,
+                        ordered=True,
+                    )
+            self._advance_version(Route, version)
+
+    def update_airport(self, airport, deleted=False):
+        transaction.on_commit(
+            functools.partial(
+                self._update_airport,
+                airport.id,
+                airport.airport_code,
+                deleted,
+                bumped_version(Airport),
+            )
+        )
+
+    def _update_airport(self, airport_id, airport_code, deleted, version):
+        with self._lock:
+            if self._built_at is None:
+                return
+            self.airports = {
+                code: other_id
+                for code, other_id in self.airports.items()
+                if other_id != airport_id
+            }
+            if not deleted:
+                self.airports[airport_code] = airport_id
+            self._advance_version(Airport, version)
+
+    def search(
+        self,
+        source,
+        destination,
+        departure_after,
+        departure_before,
+        min_connection,
+        max_connection,
+        max_connections,
+        limit,
+    ):
+        """
+        Find up to `limit` itineraries ordered by arrival time.
+
+        Dijkstra-style search over the departures board: the queue is
+        ordered by arrival time, and each connection has to depart between
+        `min_connection` and `max_connection` after the previous arrival.
+        """
+        self.ensure_fresh()
+
+        with self._lock:
+            source_id = self.airports.get(source)
+            destination_id = self.airports.get(destination)
+            if source_id is None or destination_id is None:
+                return []
+
+            queue = []
+            departures = self.departures[source_id]
+            for index in range(
+                bisect_left(departures, (departure_after,)), len(departures)
+            ):
+                leg = departures[index]
+                if leg.departure_time > departure_before:
+                    break
+                queue.append((leg.arrival_time, len(queue), (leg,)))
+            heapq.heapify(queue)
+            counter = len(queue)
+
+            itineraries = []
+            settled = defaultdict(int)
+            while queue and len(itineraries) < limit:
+                arrival_time, _, path = heapq.heappop(queue)
+                airport_id = path[-1].destination_id
+                if airport_id == destination_id:
+                    itineraries.append(path)
+                    continue
+                if settled[airport_id] >= limit or len(path) > max_connections:
+                    continue
+                settled[airport_id] += 1
+
+                visited = {source_id, *(leg.destination_id for leg in path)}
+                departures = self.departures[airport_id]
+                for index in range(
+                    bisect_left(departures, (arrival_time + min_connection,)),
+                    len(departures),
+                ):
+                    leg = departures[index]
+                    if leg.departure_time > arrival_time + max_connection:
+                        break
+                    if leg.destination_id not in visited:
+                        counter += 1
+                        heapq.heappush(
+                            queue, (leg.arrival_time, counter, path + (leg,))
+                        )
+
+            return itineraries
+
+
+itinerary_index = ItineraryIndex()
@@ -0,0 +1,75 @@
+from collections import defaultdict
+
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from flight.models import Flight, SeatInventory, Ticket
+
+
+class Command(BaseCommand):
+    """Django command to rebuild flight seat inventories from sold tickets"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted inventories without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            inventories = {
+                inventory.flight_id: inventory
+                for inventory in SeatInventory.objects.select_for_update()
+            }
+            seats = defaultdict(list)
+            for flight_id, row, seat in Ticket.objects.values_list(
+                "flight_id", "row", "seat"
+            ).iterator():
+                seats[flight_id].append((row, seat))
+
+            missing = []
+            drifted = []
+            for flight_id, rows, seats_in_row in Flight.objects.values_list(
+                "id", "airplane__rows", "airplane__seats_in_row"
+            ):
+                flight_seats = seats[flight_id]
+                seat_map = SeatInventory.build_seat_map(
+                    flight_seats, rows, seats_in_row
+                )
+                inventory = inventories.get(flight_id)
+                if inventory is None:
+                    missing.append(
+                        SeatInventory(
+                            flight_id=flight_id,
+                            tickets_sold=len(flight_seats),
+                            seat_map=seat_map,
+                        )
+                    )
+                elif (
+                    inventory.tickets_sold != len(flight_seats)
+                    or bytes(inventory.seat_map) != seat_map
+                ):
+                    self.stdout.write(
+                        f"Flight {flight_id}: {inventory.tickets_sold} "
+                        f"recorded, {len(flight_seats)} sold"
+                    )
+                    inventory.tickets_sold = len(flight_seats)
+                    inventory.seat_map = seat_map
+                    inventory.updated_at = timezone.now()
+                    drifted.append(inventory)
+
+            if not options["dry_run"]:
+                SeatInventory.objects.bulk_create(missing)
+                SeatInventory.objects.bulk_update(
+                    drifted, ["tickets_sold", "seat_map", "updated_at"]
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seat inventory: {len(missing)} missing, "
+                f"{len(drifted)} drifted"
+                + (" (dry run)" if options["dry_run"] else " fixed")
+            )
+        )
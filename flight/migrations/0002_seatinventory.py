@@ -0,0 +1,53 @@
+# Generated by Django 4.2.5 on 2026-10-18 19:01
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def populate_seat_inventory(apps, schema_editor):
+    Flight = apps.get_model("flight", "Flight")
+    SeatInventory = apps.get_model("flight", "SeatInventory")
+
+    SeatInventory.objects.bulk_create(
+        SeatInventory(flight_id=flight_id, tickets_sold=tickets_sold)
+        for flight_id, tickets_sold in Flight.objects.annotate(
+            tickets_sold=Count("ticket")
+        ).values_list("id", "tickets_sold")
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("flight", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeatInventory",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("tickets_sold", models.PositiveIntegerField(default=0)),
+                (
+                    "flight",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="inventory",
+                        to="flight.flight",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "seat inventories",
+            },
+        ),
+        migrations.RunPython(populate_seat_inventory, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.5 on 2026-10-18 19:05
+
+from django.db import migrations, models
+
+
+def populate_seat_maps(apps, schema_editor):
+    SeatInventory = apps.get_model("flight", "SeatInventory")
+    Ticket = apps.get_model("flight", "Ticket")
+
+    inventories = list(SeatInventory.objects.select_related("flight__airplane"))
+    for inventory in inventories:
+        airplane = inventory.flight.airplane
+        seat_map = bytearray((airplane.rows * airplane.seats_in_row + 7) // 8)
+        for row, seat in Ticket.objects.filter(
+            flight_id=inventory.flight_id
+        ).values_list("row", "seat"):
+            index = (row - 1) * airplane.seats_in_row + seat - 1
+            seat_map[index // 8] |= 1 << index % 8
+        inventory.seat_map = bytes(seat_map)
+
+    SeatInventory.objects.bulk_update(inventories, ["seat_map"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("flight", "0002_seatinventory"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="seatinventory",
+            name="seat_map",
+            field=models.BinaryField(default=bytes),
+        ),
+        migrations.RunPython(populate_seat_maps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.5 on 2026-10-18 20:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("flight", "0005_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="seatinventory",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
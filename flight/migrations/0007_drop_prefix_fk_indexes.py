@@ -0,0 +1,33 @@
+# Generated by Django 4.2.5 on 2026-10-18 21:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0005_route_trigram_indexes"),
+        ("airplane", "0004_updated_at"),
+        ("flight", "0006_updated_at"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="flight",
+            name="airplane",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="airplane.airplane",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="flight",
+            name="route",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="airport.route",
+            ),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 from airplane.models import Airplane
 from airport.models import Route
@@ -41,30 +42,168 @@ class Meal(models.Model):
 
 
 class Flight(models.Model):
-    route = models.ForeignKey(Route, on_delete=models.CASCADE)
+    # looked up through the (route|airplane, departure_time) indexes below
+    route = models.ForeignKey(Route, on_delete=models.CASCADE, db_index=False)
     crew_members = models.ManyToManyField(Crew, blank=False, related_name="flights")
-    airplane = models.ForeignKey(Airplane, on_delete=models.CASCADE)
+    airplane = models.ForeignKey(Airplane, on_delete=models.CASCADE, db_index=False)
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["departure_time"]
+        indexes = [
+            models.Index(fields=["departure_time", "id"], name="flight_departure_idx"),
+            models.Index(
+                fields=["route", "departure_time"], name="flight_route_departure_idx"
+            ),
+            models.Index(
+                fields=["airplane", "departure_time"],
+                name="flight_airplane_departure_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.route.code
 
 
+class SeatInventory(models.Model):
+    flight = models.OneToOneField(
+        Flight, on_delete=models.CASCADE, related_name="inventory"
+    )
+    tickets_sold = models.PositiveIntegerField(default=0)
+    seat_map = models.BinaryField(default=bytes)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "seat inventories"
+
+    def __str__(self):
+        return f"{self.flight}: {self.tickets_sold} sold"
+
+    @staticmethod
+    def seat_index(row, seat, seats_in_row):
+        return (row - 1) * seats_in_row + seat - 1
+
+    @staticmethod
+    def build_seat_map(seats, rows, seats_in_row):
+        seat_map = bytearray((rows * seats_in_row + 7) // 8)
+        for row, seat in seats:
+            if 1 <= row <= rows and 1 <= seat <= seats_in_row:
+                index = SeatInventory.seat_index(row, seat, seats_in_row)
+                seat_map[index // 8] |= 1 << index % 8
+        return bytes(seat_map)
+
+    def is_taken(self, row, seat, seats_in_row):
+        index = SeatInventory.seat_index(row, seat, seats_in_row)
+        seat_map = self.seat_map
+        return index // 8 < len(seat_map) and bool(
+            seat_map[index // 8] >> index % 8 & 1
+        )
+
+    def mark_seats(self, seats, seats_in_row, taken=True):
+        seat_map = bytearray(self.seat_map)
+        for row, seat in seats:
+            index = SeatInventory.seat_index(row, seat, seats_in_row)
+            if index // 8 >= len(seat_map):
+                seat_map.extend(bytes(index // 8 - len(seat_map) + 1))
+            if taken:
+                seat_map[index // 8] |= 1 << index % 8
+            else:
+                seat_map[index // 8] &= ~(1 << index % 8)
+        self.seat_map = bytes(seat_map)
+        self.tickets_sold = max(
+            self.tickets_sold + (len(seats) if taken else -len(seats)), 0
+        )
+
+    @staticmethod
+    def mark_tickets(tickets, taken=True):
+        seats = {}
+        for ticket in tickets:
+            seats.setdefault(ticket.flight_id, []).append((ticket.row, ticket.seat))
+
+        with transaction.atomic():
+            inventories = list(
+                SeatInventory.objects.select_for_update(of=("self",))
+                .select_related("flight__airplane")
+                .filter(flight_id__in=seats)
+                .order_by("flight_id")
+            )
+            now = timezone.now()
+            for inventory in inventories:
+                inventory.mark_seats(
+                    seats[inventory.flight_id],
+                    inventory.flight.airplane.seats_in_row,
+                    taken,
+                )
+                inventory.updated_at = now
+            SeatInventory.objects.bulk_update(
+                inventories, ["tickets_sold", "seat_map", "updated_at"]
+            )
+
+    @staticmethod
+    def rebuild_flights(flight_ids):
+        """Recount the inventories of `flight_ids` from their tickets"""
+        with transaction.atomic():
+            inventories = list(
+                SeatInventory.objects.select_for_update(of=("self",))
+                .select_related("flight__airplane")
+                .filter(flight_id__in=flight_ids)
+                .order_by("flight_id")
+            )
+            now = timezone.now()
+            for inventory in inventories:
+                inventory.rebuild()
+                inventory.updated_at = now
+            SeatInventory.objects.bulk_update(
+                inventories, ["tickets_sold", "seat_map", "updated_at"]
+            )
+
+    def rebuild(self):
+        airplane = self.flight.airplane
+        seats = list(
+            Ticket.objects.filter(flight=self.flight).values_list("row", "seat")
+        )
+        self.seat_map = SeatInventory.build_seat_map(
+            seats, airplane.rows, airplane.seats_in_row
+        )
+        self.tickets_sold = len(seats)
+
+
 class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-id"], name="order_user_created_idx"
+            ),
+        ]
 
     def __str__(self):
         return str(self.created_at)
 
 
+class TicketQuerySet(models.QuerySet):
+    SEAT_FIELDS = {"row", "seat", "flight", "flight_id"}
+
+    def update(self, **kwargs):
+        """update() sends no signals, seat changes rebuild the inventories"""
+        if not self.SEAT_FIELDS.intersection(kwargs):
+            return super().update(**kwargs)
+
+        with transaction.atomic(using=self.db):
+            flight_ids = set(self.values_list("flight_id", flat=True))
+            if "flight_id" in kwargs or "flight" in kwargs:
+                flight = kwargs.get("flight_id", kwargs.get("flight"))
+                flight_ids.add(getattr(flight, "pk", flight))
+            updated = super().update(**kwargs)
+            SeatInventory.rebuild_flights(flight_ids)
+        return updated
+
+
 class Ticket(models.Model):
     ECONOMY = "ECONOMY"
     BUSINESS = "BUSINESS"
@@ -79,12 +218,14 @@ class Ticket(models.Model):
         max_length=8, choices=CLASS_CHOICES, default=ECONOMY
     )
 
+    objects = TicketQuerySet.as_manager()
+
     class Meta:
         unique_together = ("flight", "row", "seat")
         ordering = ["row", "seat"]
 
     @staticmethod
-    def validate_ticket(row, seat, airplane, error_to_raise):
+    def validate_ticket(row, seat, airplane, error_to_raise, flight=None):
         for ticket_attr_value, ticket_attr_name, airplane_attr_name in [
             (row, "row", "rows"),
             (seat, "seat", "seats_in_row"),
@@ -100,9 +241,17 @@ class Ticket(models.Model):
                     }
                 )
 
+        inventory = getattr(flight, "inventory", None)
+        if inventory and inventory.is_taken(row, seat, airplane.seats_in_row):
+            raise error_to_raise({"seat": f"seat {seat} in row {row} is already taken"})
+
     def clean(self):
         Ticket.validate_ticket(
-            self.row, self.seat, self.flight.airplane, ValidationError
+            self.row,
+            self.seat,
+            self.flight.airplane,
+            ValidationError,
+            flight=self.flight if self._state.adding else None,
         )
 
     def save(
@@ -0,0 +1,176 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+from airport_API_service.cache import get_api_cache
+
+
+def estimate_count(queryset):
+    """Row count estimated by the PostgreSQL planner, without scanning"""
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def cached_count(queryset):
+    sql, params = queryset.order_by().query.sql_with_params()
+    key = "api-count:" + hashlib.md5(f"{sql}|{params}".encode()).hexdigest()
+    cache = get_api_cache()
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout=settings.API_COUNT_CACHE_TIMEOUT)
+
+    return count
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination with an opt-in total count header.
+
+    The count is only computed for `?count=true`. Large PostgreSQL result
+    sets get the planner estimate, smaller ones are counted exactly and
+    cached for a short time.
+    """
+
+    count_query_param = "count"
+    approximate_count_threshold = 10000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.total_count = None
+        self.total_count_approximate = False
+        if self.count_requested(request):
+            self.total_count = self.get_total_count(queryset)
+
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+
+        return self.paginate_results(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """`paginate_queryset` fetching the page with the async ORM"""
+        self.total_count = None
+        self.total_count_approximate = False
+        if self.count_requested(request):
+            self.total_count = await sync_to_async(self.get_total_count)(queryset)
+
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+
+        return self.paginate_results([item async for item in page_queryset])
+
+    def count_requested(self, request):
+        return request.query_params.get(self.count_query_param) in ("1", "true")
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        First half of `CursorPagination.paginate_queryset`, up to the query.
+
+        Returns the page with one extra item, unevaluated.
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            self.offset, self.reverse, self.current_position = 0, False, None
+        else:
+            self.offset, self.reverse, self.current_position = self.cursor
+
+        if self.reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.current_position is not None:
+            order = self.ordering[0]
+            is_reversed = order.startswith("-")
+            order_attr = order.lstrip("-")
+
+            if self.cursor.reverse != is_reversed:
+                kwargs = {order_attr + "__lt": self.current_position}
+            else:
+                kwargs = {order_attr + "__gt": self.current_position}
+
+            queryset = queryset.filter(**kwargs)
+
+        return queryset[self.offset : self.offset + self.page_size + 1]
+
+    def paginate_results(self, results):
+        """Second half of `CursorPagination.paginate_queryset`"""
+        self.page = list(results[: self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if self.reverse:
+            self.page = list(reversed(self.page))
+
+            self.has_next = (self.current_position is not None) or (self.offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = self.current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (self.current_position is not None) or (self.offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = self.current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_total_count(self, queryset):
+        if connections[queryset.db].vendor == "postgresql":
+            estimate = estimate_count(queryset)
+            if estimate >= self.approximate_count_threshold:
+                self.total_count_approximate = True
+                return estimate
+
+        return cached_count(queryset)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.total_count is not None:
+            response["X-Total-Count"] = self.total_count
+            if self.total_count_approximate:
+                response["X-Total-Count-Approximate"] = "true"
+
+        return response
+
+
+class FlightPagination(KeysetPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("departure_time", "id")
+
+
+class OrderPagination(KeysetPagination):
+    page_size = 10
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
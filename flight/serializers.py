@@ -1,10 +1,24 @@
-from django.db import transaction
-from rest_framework import serializers
-from rest_framework.exceptions import ValidationError
+import base64
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from functools import reduce
+from operator import or_
 
-from airplane.serializers import AirplaneSerializer
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException, ValidationError
+
+from airplane.serializers import AIRPLANE_STR, AirplaneSerializer
 from airport.serializers import RouteListSerializer
-from .models import Crew, Flight, Ticket, Order
+from airport_API_service.serializers import Computed, Many, ValuesListSerializer
+from .holds import get_seat_hold_backend, new_hold
+from .models import Crew, Flight, Meal, Ticket, Order, SeatInventory
 
 
 class CrewSerializer(serializers.ModelSerializer):
@@ -26,7 +40,7 @@ class FlightSerializer(serializers.ModelSerializer):
 
 
 class FlightListSerializer(FlightSerializer):
-    route = serializers.SlugRelatedField(many=False, read_only=True, slug_field="code")
+    route = serializers.CharField(source="route.code", read_only=True)
     airplane = serializers.StringRelatedField(many=False, read_only=True)
     crew_members = serializers.StringRelatedField(
         many=True,
@@ -48,13 +62,133 @@ class FlightListSerializer(FlightSerializer):
         ordering = ["departure_time"]
 
 
+class FlightListValuesSerializer(ValuesListSerializer):
+    serializer_class = FlightListSerializer
+    annotations = ("tickets_available",)
+    fields = {
+        "airplane": AIRPLANE_STR.prefixed("airplane__"),
+        "crew_members": Many(
+            "crew_members",
+            ("first_name", "last_name"),
+            lambda first_name, last_name: first_name + " " + last_name,
+        ),
+    }
+
+
+class FlightSeatMapSerializer(serializers.ModelSerializer):
+    rows = serializers.IntegerField(source="airplane.rows", read_only=True)
+    seats_in_row = serializers.IntegerField(
+        source="airplane.seats_in_row", read_only=True
+    )
+    tickets_available = serializers.IntegerField(read_only=True)
+    seat_map = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Flight
+        fields = ("id", "rows", "seats_in_row", "tickets_available", "seat_map")
+
+    @extend_schema_field(OpenApiTypes.BYTE)
+    def get_seat_map(self, flight):
+        """Base64 bitmap of taken seats, bit (row - 1) * seats_in_row + seat - 1"""
+        size = (flight.airplane.capacity + 7) // 8
+        inventory = getattr(flight, "inventory", None)
+        seat_map = bytes(inventory.seat_map)[:size] if inventory else b""
+        return base64.b64encode(seat_map.ljust(size, b"\0")).decode()
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Resolve objects prefetched by the root serializer before querying"""
+
+    def to_internal_value(self, data):
+        queryset = self.get_queryset()
+        prefetched = self.context.get("prefetched", {}).get(queryset.model)
+        if prefetched is not None:
+            try:
+                pk = queryset.model._meta.pk.to_python(data)
+            except DjangoValidationError:
+                pk = None
+            if pk in prefetched:
+                return prefetched[pk]
+
+        return super().to_internal_value(data)
+
+
+class FlightFilterSerializer(serializers.Serializer):
+    source = serializers.CharField(
+        max_length=3, required=False, help_text="Source airport code"
+    )
+    destination = serializers.CharField(
+        max_length=3, required=False, help_text="Destination airport code"
+    )
+    date_from = serializers.DateField(
+        required=False, help_text="Earliest departure date"
+    )
+    date_to = serializers.DateField(required=False, help_text="Latest departure date")
+    airline = serializers.IntegerField(required=False, help_text="Airline id")
+    min_tickets_available = serializers.IntegerField(min_value=0, required=False)
+
+
+class ItinerarySearchSerializer(serializers.Serializer):
+    source = serializers.CharField(max_length=3)
+    destination = serializers.CharField(max_length=3)
+    departure_after = serializers.DateTimeField(required=False)
+    departure_before = serializers.DateTimeField(required=False)
+    min_connection = serializers.IntegerField(
+        min_value=0,
+        required=False,
+        help_text="Minimum connection time in minutes",
+    )
+    max_connections = serializers.IntegerField(min_value=0, max_value=3, default=2)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+    def validate(self, attrs):
+        departure_after = attrs.setdefault("departure_after", timezone.now())
+        attrs.setdefault("departure_before", departure_after + timedelta(days=1))
+        if attrs["departure_before"] < departure_after:
+            raise ValidationError(
+                {"departure_before": "must not be earlier than departure_after"}
+            )
+
+        min_connection = attrs.pop("min_connection", None)
+        attrs["min_connection"] = (
+            settings.ITINERARY_MIN_CONNECTION
+            if min_connection is None
+            else timedelta(minutes=min_connection)
+        )
+        attrs["max_connection"] = settings.ITINERARY_MAX_CONNECTION
+
+        return attrs
+
+
+class ItineraryLegSerializer(FlightSerializer):
+    route = serializers.CharField(source="route.code", read_only=True)
+
+    class Meta:
+        model = Flight
+        fields = ("id", "route", "departure_time", "arrival_time")
+
+
+class ItinerarySerializer(serializers.Serializer):
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+    connections = serializers.IntegerField()
+    legs = ItineraryLegSerializer(many=True)
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    flight = PrefetchedPrimaryKeyRelatedField(
+        queryset=Flight.objects.select_related("airplane", "inventory")
+    )
+    meal = PrefetchedPrimaryKeyRelatedField(queryset=Meal.objects.all())
+
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "flight", "ticket_class", "meal")
+        validators = []
 
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
+        # taken seats are checked by the order, see `OrderSerializer`
         Ticket.validate_ticket(
             attrs["row"], attrs["seat"], attrs["flight"].airplane, ValidationError
         )
@@ -70,6 +204,11 @@ class TicketListSerializer(TicketSerializer):
         fields = ("id", "row", "seat", "flight", "ticket_class", "meal")
 
 
+class TicketListValuesSerializer(ValuesListSerializer):
+    serializer_class = TicketListSerializer
+    fields = {"flight": Computed(("flight__route__code",), str)}
+
+
 class TicketDetailSerializer(TicketSerializer):
     flight = FlightListSerializer(many=False, read_only=True)
     meal = serializers.CharField(source="meal.meal", read_only=True)
@@ -102,25 +241,230 @@ class FlightDetailSerializer(FlightSerializer):
         )
 
 
+class HeldSeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField(min_value=1)
+    seat = serializers.IntegerField(min_value=1)
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    token = serializers.CharField(read_only=True)
+    flight = serializers.PrimaryKeyRelatedField(
+        queryset=Flight.objects.select_related("airplane", "inventory")
+    )
+    seats = HeldSeatSerializer(many=True, allow_empty=False)
+    expires_at = serializers.DateTimeField(read_only=True)
+
+    def validate_seats(self, seats):
+        if len(seats) > settings.SEAT_HOLD_MAX_SEATS:
+            raise ValidationError(
+                f"at most {settings.SEAT_HOLD_MAX_SEATS} seats can be held at once"
+            )
+
+        seen = set()
+        for seat in seats:
+            if (seat["row"], seat["seat"]) in seen:
+                raise ValidationError(
+                    f"seat {seat['seat']} in row {seat['row']} is held more than once"
+                )
+            seen.add((seat["row"], seat["seat"]))
+
+        return seats
+
+    def validate(self, attrs):
+        flight = attrs["flight"]
+        for seat in attrs["seats"]:
+            Ticket.validate_ticket(
+                seat["row"], seat["seat"], flight.airplane, ValidationError, flight
+            )
+
+        return attrs
+
+    def create(self, validated_data):
+        hold = new_hold(
+            self.context["request"].user.id,
+            validated_data["flight"].id,
+            [(seat["row"], seat["seat"]) for seat in validated_data["seats"]],
+        )
+        get_seat_hold_backend().hold(hold)
+        return hold
+
+    def to_representation(self, hold):
+        return {
+            "token": hold.token,
+            "flight": hold.flight_id,
+            "seats": [{"row": row, "seat": seat} for row, seat in hold.seats],
+            "expires_at": self.fields["expires_at"].to_representation(
+                datetime.fromtimestamp(hold.expires_at)
+            ),
+        }
+
+
+class SeatsTaken(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "seats are already taken"
+    default_code = "seats_taken"
+
+    def __init__(self, seats):
+        super().__init__()
+        self.detail = {
+            "detail": self.default_detail,
+            "seats": [
+                {"flight": flight_id, "row": row, "seat": seat}
+                for flight_id, row, seat in sorted(seats)
+            ],
+        }
+
+
 class OrderSerializer(serializers.ModelSerializer):
     tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+    hold = serializers.CharField(
+        write_only=True, required=False, help_text="Token of a seat hold"
+    )
 
     class Meta:
         model = Order
-        fields = ("id", "created_at", "tickets")
+        fields = ("id", "created_at", "tickets", "hold")
 
-    def create(self, validated_data):
+    def to_internal_value(self, data):
+        tickets = data.get("tickets") if isinstance(data, Mapping) else None
+        if isinstance(tickets, list):
+            self.context["prefetched"] = {
+                Flight: Flight.objects.select_related("airplane", "inventory").in_bulk(
+                    self._ticket_pks(tickets, "flight", Flight)
+                ),
+                Meal: Meal.objects.in_bulk(self._ticket_pks(tickets, "meal", Meal)),
+            }
+
+        return super().to_internal_value(data)
+
+    @staticmethod
+    def _ticket_pks(tickets, field_name, model):
+        pks = set()
+        for ticket in tickets:
+            if isinstance(ticket, Mapping):
+                try:
+                    pks.add(model._meta.pk.to_python(ticket.get(field_name)))
+                except DjangoValidationError:
+                    pass
+        pks.discard(None)
+        return pks
+
+    def validate_tickets(self, tickets):
+        seats = set()
+        for ticket in tickets:
+            seat = (ticket["flight"].id, ticket["row"], ticket["seat"])
+            if seat in seats:
+                raise ValidationError(
+                    f"seat {ticket['seat']} in row {ticket['row']} "
+                    f"is ordered more than once"
+                )
+            seats.add(seat)
+
+        # answered like seats sold while the order waits for its lock in `_book`
+        taken = [
+            (ticket["flight"].id, ticket["row"], ticket["seat"])
+            for ticket in tickets
+            if getattr(ticket["flight"], "inventory", None) is not None
+            and ticket["flight"].inventory.is_taken(
+                ticket["row"], ticket["seat"], ticket["flight"].airplane.seats_in_row
+            )
+        ]
+        if taken:
+            raise SeatsTaken(taken)
+
+        return tickets
+
+    def validate(self, attrs):
+        backend = get_seat_hold_backend()
+        token = attrs.pop("hold", None)
+        if token is not None:
+            hold = backend.get(token)
+            if hold is None or hold.user_id != self.context["request"].user.id:
+                raise ValidationError({"hold": "hold has expired or does not exist"})
+            self.context["hold"] = hold
+
+        held = {}
+        for ticket in attrs["tickets"]:
+            flight = ticket["flight"]
+            if flight.id not in held:
+                held[flight.id] = backend.held_seats(flight.id)
+            holder = held[flight.id].get((ticket["row"], ticket["seat"]))
+            if holder is not None and holder != token:
+                raise ValidationError(
+                    {
+                        "tickets": f"seat {ticket['seat']} in row {ticket['row']} "
+                        f"is held by another customer"
+                    }
+                )
+
+        return attrs
+
+    @staticmethod
+    def _taken_seats(tickets_data):
+        return list(
+            Ticket.objects.filter(
+                reduce(
+                    or_,
+                    (
+                        Q(
+                            flight=ticket_data["flight"],
+                            row=ticket_data["row"],
+                            seat=ticket_data["seat"],
+                        )
+                        for ticket_data in tickets_data
+                    ),
+                )
+            ).values_list("flight_id", "row", "seat")
+        )
+
+    def _book(self, validated_data, tickets_data):
         with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
+            # bookings of a flight wait for each other, flights are locked
+            # in the same order by every booking to avoid deadlocks
+            list(
+                SeatInventory.objects.select_for_update()
+                .filter(flight__in={ticket["flight"] for ticket in tickets_data})
+                .order_by("flight_id")
+                .values_list("id", flat=True)
+            )
+            taken = self._taken_seats(tickets_data)
+            if taken:
+                raise SeatsTaken(taken)
+
             order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
+            tickets = Ticket.objects.bulk_create(
+                Ticket(order=order, **ticket_data) for ticket_data in tickets_data
+            )
+            SeatInventory.mark_tickets(tickets, taken=True)
+
+            hold = self.context.get("hold")
+            if hold is not None:
+                transaction.on_commit(
+                    lambda: get_seat_hold_backend().release(hold.token)
+                )
             return order
 
+    def create(self, validated_data):
+        tickets_data = validated_data.pop("tickets")
+        try:
+            return self._book(validated_data, tickets_data)
+        except IntegrityError:
+            # a seat was sold without waiting for the flight lock,
+            # e.g. by a flight missing its seat inventory
+            taken = self._taken_seats(tickets_data)
+            if not taken:
+                raise
+            raise SeatsTaken(taken)
+
 
 class OrderListSerializer(OrderSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
 
 
+class OrderListValuesSerializer(ValuesListSerializer):
+    serializer_class = OrderListSerializer
+    fields = {"tickets": Many("tickets", serializer=TicketListValuesSerializer)}
+
+
 class OrderDetailSerializer(OrderSerializer):
     tickets = TicketDetailSerializer(many=True, read_only=True)
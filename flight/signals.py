@@ -0,0 +1,148 @@
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_save
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from airplane.models import Airplane
+from airport.models import Airport, Route
+from airport_API_service.cache import invalidate_cache_on_change, invalidate_model_cache
+from .itineraries import itinerary_index
+from .models import Crew, Flight, SeatInventory, Ticket
+
+invalidate_cache_on_change(Flight, Crew)
+
+
+@receiver(post_save, sender=Flight)
+def sync_seat_inventory(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+
+    if created:
+        SeatInventory.objects.create(
+            flight=instance,
+            seat_map=SeatInventory.build_seat_map(
+                [], instance.airplane.rows, instance.airplane.seats_in_row
+            ),
+        )
+    else:
+        SeatInventory.objects.get_or_create(flight=instance)
+        # locked like ticket sales, the airplane may have changed
+        SeatInventory.rebuild_flights([instance.id])
+
+
+@receiver(pre_save, sender=Airplane)
+def remember_dimensions(sender, instance, raw, update_fields, **kwargs):
+    """Dimensions of the airplane before an update, compared by `resize_seat_maps`"""
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not {"rows", "seats_in_row"} & set(update_fields):
+        return
+
+    instance._dimensions = (
+        Airplane.objects.filter(pk=instance.pk)
+        .values_list("rows", "seats_in_row")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Airplane)
+def resize_seat_maps(sender, instance, raw, **kwargs):
+    """Seat map bits depend on `seats_in_row`, rebuild them on a resize"""
+    dimensions = instance.__dict__.pop("_dimensions", None)
+    if raw or dimensions in (None, (instance.rows, instance.seats_in_row)):
+        return
+
+    SeatInventory.rebuild_flights(
+        Flight.objects.filter(airplane=instance).values_list("id", flat=True)
+    )
+
+
+@receiver(m2m_changed, sender=Flight.crew_members.through)
+def touch_crewed_flights(sender, instance, action, reverse, pk_set, **kwargs):
+    """Crew changes do not save flights, bump `updated_at` for their ETags"""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        flights = Flight.objects.filter(pk=instance.pk)
+    elif action == "pre_clear":
+        flights = Flight.objects.filter(crew_members=instance)
+    else:
+        flights = Flight.objects.filter(pk__in=pk_set)
+
+    # update() does not send signals
+    if flights.update(updated_at=timezone.now()):
+        invalidate_model_cache(sender=Flight)
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_seat(sender, instance, raw, update_fields, **kwargs):
+    """Seat the ticket held before an update, released by `book_seat`"""
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not {"row", "seat", "flight"} & set(update_fields):
+        return
+
+    instance._booked_seat = (
+        Ticket.objects.filter(pk=instance.pk)
+        .values_list("flight_id", "row", "seat")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Ticket)
+def book_seat(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+
+    if created:
+        SeatInventory.mark_tickets([instance], taken=True)
+        return
+
+    booked_seat = instance.__dict__.pop("_booked_seat", None)
+    if booked_seat is not None and booked_seat != (
+        instance.flight_id,
+        instance.row,
+        instance.seat,
+    ):
+        flight_id, row, seat = booked_seat
+        with transaction.atomic():
+            SeatInventory.mark_tickets(
+                [Ticket(flight_id=flight_id, row=row, seat=seat)], taken=False
+            )
+            SeatInventory.mark_tickets([instance], taken=True)
+
+
+@receiver(post_delete, sender=Ticket)
+def release_seat(sender, instance, **kwargs):
+    SeatInventory.mark_tickets([instance], taken=False)
+
+
+@receiver(post_save, sender=Flight)
+def index_flight(sender, instance, **kwargs):
+    itinerary_index.update_flight(instance)
+
+
+@receiver(post_delete, sender=Flight)
+def unindex_flight(sender, instance, **kwargs):
+    itinerary_index.update_flight(instance, deleted=True)
+
+
+@receiver(post_save, sender=Route)
+def index_route(sender, instance, **kwargs):
+    itinerary_index.update_route(instance)
+
+
+@receiver(post_delete, sender=Route)
+def unindex_route(sender, instance, **kwargs):
+    itinerary_index.update_route(instance, deleted=True)
+
+
+@receiver(post_save, sender=Airport)
+def index_airport(sender, instance, **kwargs):
+    itinerary_index.update_airport(instance)
+
+
+@receiver(post_delete, sender=Airport)
+def unindex_airport(sender, instance, **kwargs):
+    itinerary_index.update_airport(instance, deleted=True)
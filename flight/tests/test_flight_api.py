@@ -1,10 +1,14 @@
+import base64
 import datetime
 import random
 from random import choices
 from string import ascii_lowercase
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -27,6 +31,10 @@ def get_detail_flight_url(flight_id):
     return reverse("flight:flight-detail", args=[flight_id])
 
 
+def get_seat_map_url(flight_id):
+    return reverse("flight:flight-seat-map", args=[flight_id])
+
+
 def sample_crew_member():
     suffix = "".join(choices(ascii_lowercase, k=5))
     return Crew.objects.create(
@@ -76,6 +84,7 @@ class UnauthenticatedFlightApiTests(TestCase):
 
 class AuthenticatedFlightApiTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             "test@test.com",
@@ -112,16 +121,244 @@ class AuthenticatedFlightApiTests(TestCase):
         sample_flight()
 
         response = self.client.get(FLIGHT_URL)
-        data = response.data
+        data = response.data["results"]
         for flight in data:
             del flight["tickets_available"]
 
-        flights = Flight.objects.order_by("id")
+        flights = Flight.objects.order_by("departure_time", "id")
         serializer = FlightListSerializer(flights, many=True)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(data, serializer.data)
 
+    def test_flight_list_cursor_pagination(self):
+        flights = [sample_flight() for _ in range(5)]
+
+        ids = []
+        url = FLIGHT_URL + "?page_size=2"
+        while url:
+            response = self.client.get(url)
+            ids += [flight["id"] for flight in response.data["results"]]
+            url = response.data["next"]
+
+        expected = sorted(
+            flights, key=lambda flight: (flight.departure_time, flight.id)
+        )
+        self.assertEqual(ids, [flight.id for flight in expected])
+        self.assertNotIn("X-Total-Count", response)
+
+    def test_flight_list_total_count_header(self):
+        for _ in range(3):
+            sample_flight()
+
+        response = self.client.get(FLIGHT_URL, {"page_size": 1, "count": "true"})
+
+        self.assertEqual(response["X-Total-Count"], "3")
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_filter_flights_by_airports(self):
+        flight = sample_flight()
+        sample_flight()
+
+        response = self.client.get(
+            FLIGHT_URL,
+            {
+                "source": flight.route.source.airport_code.lower(),
+                "destination": flight.route.destination.airport_code,
+            },
+        )
+
+        self.assertEqual([item["id"] for item in response.data["results"]], [flight.id])
+
+    def test_filter_flights_by_departure_dates(self):
+        flights = [sample_flight() for _ in range(3)]
+        for flight, day in zip(flights, (1, 2, 3)):
+            flight.departure_time = datetime.datetime(2023, 3, day, 23, 30)
+            flight.arrival_time = flight.departure_time + datetime.timedelta(hours=2)
+            flight.save()
+
+        response = self.client.get(
+            FLIGHT_URL, {"date_from": "2023-03-02", "date_to": "2023-03-03"}
+        )
+
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [flights[1].id, flights[2].id],
+        )
+
+    def test_filter_flights_by_airline_and_tickets_available(self):
+        flight = sample_flight()
+        other = sample_flight()
+        meal = Meal.objects.create()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(row=1, seat=1, flight=flight, order=order, meal=meal)
+
+        by_airline = self.client.get(FLIGHT_URL, {"airline": other.airplane.airline_id})
+        by_tickets = self.client.get(
+            FLIGHT_URL, {"min_tickets_available": flight.airplane.capacity}
+        )
+
+        self.assertEqual(
+            [item["id"] for item in by_airline.data["results"]], [other.id]
+        )
+        self.assertEqual(
+            [item["id"] for item in by_tickets.data["results"]], [other.id]
+        )
+
+    def test_filter_flights_invalid_params(self):
+        response = self.client.get(
+            FLIGHT_URL, {"date_from": "yesterday", "min_tickets_available": -1}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("date_from", response.data)
+        self.assertIn("min_tickets_available", response.data)
+
+    def test_order_list_cursor_pagination(self):
+        orders = [Order.objects.create(user=self.user) for _ in range(12)]
+
+        first_page = self.client.get(ORDER_URL, {"count": "1"})
+        second_page = self.client.get(first_page.data["next"])
+
+        expected = sorted(
+            orders, key=lambda order: (order.created_at, order.id), reverse=True
+        )
+        self.assertEqual(
+            [order["id"] for order in first_page.data["results"]],
+            [order.id for order in expected[:10]],
+        )
+        self.assertEqual(
+            [order["id"] for order in second_page.data["results"]],
+            [order.id for order in expected[10:]],
+        )
+        self.assertEqual(first_page["X-Total-Count"], "12")
+
+    def test_flight_tickets_available(self):
+        flight = sample_flight()
+        meal = Meal.objects.create()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(row=1, seat=1, flight=flight, order=order, meal=meal)
+
+        response = self.client.get(get_detail_flight_url(flight.id))
+        list_response = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(
+            list_response.data["results"][0]["tickets_available"],
+            flight.airplane.capacity - 1,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_flight_seat_map(self):
+        flight = sample_flight()
+        meal = Meal.objects.create()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(row=1, seat=1, flight=flight, order=order, meal=meal)
+        Ticket.objects.create(row=2, seat=3, flight=flight, order=order, meal=meal)
+
+        response = self.client.get(get_seat_map_url(flight.id))
+        seat_map = base64.b64decode(response.data["seat_map"])
+        taken = [
+            index
+            for index in range(flight.airplane.capacity)
+            if seat_map[index // 8] >> index % 8 & 1
+        ]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(seat_map), (flight.airplane.capacity + 7) // 8)
+        self.assertEqual(taken, [0, flight.airplane.seats_in_row + 2])
+        self.assertEqual(
+            response.data["tickets_available"], flight.airplane.capacity - 2
+        )
+
+    def test_create_order_with_taken_seat(self):
+        flight = sample_flight()
+        meal = Meal.objects.create()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(row=1, seat=1, flight=flight, order=order, meal=meal)
+        data = {
+            "tickets": [
+                {
+                    "row": 1,
+                    "seat": 1,
+                    "flight": flight.id,
+                    "ticket_class": "ECONOMY",
+                    "meal": meal.id,
+                }
+            ]
+        }
+
+        response = self.client.post(ORDER_URL, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_create_order(self):
+        flight = sample_flight()
+        meal = Meal.objects.create()
+        data = {
+            "tickets": [
+                {"row": 1, "seat": seat, "flight": flight.id, "meal": meal.id}
+                for seat in range(1, 4)
+            ]
+        }
+
+        response = self.client.post(ORDER_URL, data, format="json")
+        flight.inventory.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["tickets"]), 3)
+        self.assertEqual(flight.inventory.tickets_sold, 3)
+        self.assertTrue(flight.inventory.is_taken(1, 3, flight.airplane.seats_in_row))
+
+    def test_create_order_with_duplicated_seat(self):
+        flight = sample_flight()
+        meal = Meal.objects.create()
+        ticket = {"row": 1, "seat": 1, "flight": flight.id, "meal": meal.id}
+
+        response = self.client.post(
+            ORDER_URL, {"tickets": [ticket, ticket]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_flight_list_does_not_join_airports(self):
+        sample_flight()
+
+        for fast in (True, False):
+            with self.subTest(fast=fast), self.settings(FAST_LIST_SERIALIZERS=fast):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(FLIGHT_URL)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                sql = " ".join(query["sql"] for query in queries.captured_queries)
+                self.assertNotIn("airport_airport", sql)
+                self.assertNotIn("airport_city", sql)
+
+    def test_create_order_query_count_does_not_grow_with_tickets(self):
+        flight = sample_flight()
+        meal = Meal.objects.create()
+
+        def order_seats(seats):
+            data = {
+                "tickets": [
+                    {"row": row, "seat": seat, "flight": flight.id, "meal": meal.id}
+                    for row, seat in seats
+                ]
+            }
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(ORDER_URL, data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+
+        single_ticket_queries = order_seats([(1, 1)])
+        group_queries = order_seats(
+            [(row, seat) for row in range(2, 5) for seat in range(1, 9)]
+        )
+
+        self.assertEqual(group_queries, single_ticket_queries)
+        self.assertEqual(Ticket.objects.filter(flight=flight).count(), 25)
+
     def test_create_flight_forbidden(self):
         route = sample_route()
         airplane = sample_airplane()
@@ -201,6 +438,7 @@ class AuthenticatedFlightApiTests(TestCase):
 
 class AdminFlightApiTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             "admin@admin.com", "testpass", is_staff=True
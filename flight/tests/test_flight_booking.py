@@ -0,0 +1,209 @@
+import threading
+from collections import Counter
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from flight.models import Meal, Order, SeatInventory, Ticket
+from flight.serializers import OrderSerializer
+from flight.tests.test_flight_api import sample_flight
+
+ORDER_URL = reverse("flight:order-list")
+
+
+def order_data(flight, meal, seats):
+    return {
+        "tickets": [
+            {"row": row, "seat": seat, "flight": flight.id, "meal": meal.id}
+            for row, seat in seats
+        ]
+    }
+
+
+def sell_unrecorded_seat(flight, meal, user, row, seat):
+    """Sell a seat without updating the seat inventory, like a racing request"""
+    Ticket.objects.bulk_create(
+        [
+            Ticket(
+                row=row,
+                seat=seat,
+                flight=flight,
+                meal=meal,
+                order=Order.objects.create(user=user),
+            )
+        ]
+    )
+
+
+class BookingConflictTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+        self.meal = Meal.objects.create()
+
+    def test_seat_sold_during_validation_returns_conflict(self):
+        sell_unrecorded_seat(self.flight, self.meal, self.user, 1, 2)
+
+        response = self.client.post(
+            ORDER_URL,
+            order_data(self.flight, self.meal, [(1, 1), (1, 2)]),
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["seats"], [{"flight": self.flight.id, "row": 1, "seat": 2}]
+        )
+        self.assertEqual(Ticket.objects.filter(row=1, seat=1).count(), 0)
+
+    def test_taken_seat_returns_conflict(self):
+        Ticket.objects.create(
+            row=1,
+            seat=2,
+            flight=self.flight,
+            meal=self.meal,
+            order=Order.objects.create(user=self.user),
+        )
+
+        response = self.client.post(
+            ORDER_URL,
+            order_data(self.flight, self.meal, [(1, 1), (1, 2)]),
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["seats"], [{"flight": self.flight.id, "row": 1, "seat": 2}]
+        )
+
+    def test_integrity_error_returns_conflict(self):
+        sell_unrecorded_seat(self.flight, self.meal, self.user, 1, 1)
+        taken_seats = OrderSerializer._taken_seats
+
+        with mock.patch.object(
+            OrderSerializer,
+            "_taken_seats",
+            side_effect=[
+                [],
+                taken_seats([{"flight": self.flight, "row": 1, "seat": 1}]),
+            ],
+        ) as check:
+            response = self.client.post(
+                ORDER_URL, order_data(self.flight, self.meal, [(1, 1)]), format="json"
+            )
+
+        self.assertEqual(check.call_count, 2)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["seats"], [{"flight": self.flight.id, "row": 1, "seat": 1}]
+        )
+        self.assertEqual(Ticket.objects.count(), 1)
+
+
+@skipUnless(connection.vendor == "postgresql", "row locks need PostgreSQL")
+class ConcurrentBookingTests(TransactionTestCase):
+    """Customers racing for the same seats from parallel threads"""
+
+    threads = 8
+    orders_per_thread = 5
+
+    def setUp(self):
+        cache.clear()
+        self.flight = sample_flight()
+        self.meal = Meal.objects.create()
+        self.users = [
+            get_user_model().objects.create_user(f"user{index}@test.com", "testpass")
+            for index in range(self.threads)
+        ]
+
+    def race(self, seats_of_thread):
+        barrier = threading.Barrier(self.threads)
+        responses = []
+        errors = []
+
+        def book(user, seats):
+            client = APIClient()
+            client.force_authenticate(user)
+            try:
+                barrier.wait()
+                for order_seats in seats:
+                    response = client.post(
+                        ORDER_URL,
+                        order_data(self.flight, self.meal, order_seats),
+                        format="json",
+                    )
+                    responses.append((order_seats, response))
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        workers = [
+            threading.Thread(target=book, args=(user, seats_of_thread(index)))
+            for index, user in enumerate(self.users)
+        ]
+        with mock.patch("rest_framework.views.APIView.get_throttles", return_value=[]):
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        self.assertEqual(errors, [])
+        return responses
+
+    def assert_consistent(self, responses):
+        statuses = Counter(response.status_code for _, response in responses)
+        self.assertLessEqual(
+            set(statuses),
+            {
+                status.HTTP_201_CREATED,
+                status.HTTP_400_BAD_REQUEST,
+                status.HTTP_409_CONFLICT,
+            },
+        )
+
+        sold = Counter()
+        for order_seats, response in responses:
+            if response.status_code == status.HTTP_201_CREATED:
+                sold.update(order_seats)
+        self.assertTrue(all(count == 1 for count in sold.values()))
+        self.assertEqual(
+            set(Ticket.objects.values_list("row", "seat")), set(sold.elements())
+        )
+
+        inventory = SeatInventory.objects.get(flight=self.flight)
+        self.assertEqual(inventory.tickets_sold, len(sold))
+
+    def test_same_seat(self):
+        responses = self.race(lambda index: [[(1, 1)]])
+
+        self.assert_consistent(responses)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_overlapping_orders(self):
+        seats_in_row = self.flight.airplane.seats_in_row
+
+        def seats_of_thread(index):
+            # every order shares a seat with orders of the neighbour thread
+            return [
+                [(row, index % seats_in_row + 1), (row, (index + 1) % seats_in_row + 1)]
+                for row in range(1, self.orders_per_thread + 1)
+            ]
+
+        responses = self.race(seats_of_thread)
+
+        self.assert_consistent(responses)
+        for order_seats, response in responses:
+            if response.status_code == status.HTTP_409_CONFLICT:
+                taken = {(seat["row"], seat["seat"]) for seat in response.data["seats"]}
+                self.assertTrue(taken <= set(order_seats))
+                self.assertTrue(taken)
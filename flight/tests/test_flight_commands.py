@@ -0,0 +1,41 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from flight.models import Meal, Order, Ticket, SeatInventory
+from flight.tests.test_flight_api import sample_flight
+
+
+class RebuildSeatInventoryTests(TestCase):
+    def setUp(self):
+        self.flight = sample_flight()
+        user = get_user_model().objects.create_user("test@test.com", "testpass")
+        order = Order.objects.create(user=user)
+        meal = Meal.objects.create()
+        for seat in range(1, 4):
+            Ticket.objects.create(
+                row=1, seat=seat, flight=self.flight, order=order, meal=meal
+            )
+
+    def test_drifted_inventory_reconciled(self):
+        SeatInventory.objects.filter(flight=self.flight).update(tickets_sold=10)
+
+        call_command("rebuild_seat_inventory", stdout=StringIO())
+
+        self.assertEqual(SeatInventory.objects.get(flight=self.flight).tickets_sold, 3)
+
+    def test_missing_inventory_created(self):
+        SeatInventory.objects.filter(flight=self.flight).delete()
+
+        call_command("rebuild_seat_inventory", stdout=StringIO())
+
+        self.assertEqual(SeatInventory.objects.get(flight=self.flight).tickets_sold, 3)
+
+    def test_dry_run_does_not_fix(self):
+        SeatInventory.objects.filter(flight=self.flight).update(tickets_sold=10)
+
+        call_command("rebuild_seat_inventory", "--dry-run", stdout=StringIO())
+
+        self.assertEqual(SeatInventory.objects.get(flight=self.flight).tickets_sold, 10)
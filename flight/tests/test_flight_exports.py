@@ -0,0 +1,162 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from flight.models import Meal, Order, Ticket
+from flight.tests.test_flight_api import sample_flight
+
+ORDER_EXPORT_URL = reverse("flight:order-export")
+
+
+def get_manifest_url(flight_id):
+    return reverse("flight:flight-manifest", args=[flight_id])
+
+
+def streamed(response):
+    return b"".join(response.streaming_content).decode()
+
+
+async def astreamed(response):
+    return b"".join([chunk async for chunk in response.streaming_content]).decode()
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass", first_name="Sam", last_name="Doe"
+        )
+        self.admin = get_user_model().objects.create_superuser(
+            "admin@test.com", "testpass"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+        self.meal = Meal.objects.create(meal=Meal.VEGETARIAN)
+        self.order = Order.objects.create(user=self.user)
+        self.tickets = [
+            Ticket.objects.create(
+                row=row, seat=seat, flight=self.flight, meal=self.meal, order=self.order
+            )
+            for row, seat in ((2, 1), (1, 2), (1, 1))
+        ]
+
+    def test_order_export_csv(self):
+        other = Order.objects.create(user=self.admin)
+        Ticket.objects.create(
+            row=3, seat=1, flight=self.flight, meal=self.meal, order=other
+        )
+
+        response = self.client.get(ORDER_EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="orders.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(streamed(response))))
+        self.assertEqual(
+            [(row["row"], row["seat"]) for row in rows],
+            [("1", "1"), ("1", "2"), ("2", "1")],
+        )
+        self.assertEqual(rows[0]["order"], str(self.order.id))
+        self.assertEqual(rows[0]["route"], self.flight.route.code)
+        self.assertEqual(rows[0]["meal"], Meal.VEGETARIAN)
+        self.assertEqual(
+            rows[0]["departure_time"], self.flight.departure_time.isoformat()
+        )
+
+    def test_order_export_ndjson(self):
+        response = self.client.get(ORDER_EXPORT_URL, {"format": "ndjson"})
+
+        self.assertEqual(
+            response["Content-Type"], "application/x-ndjson; charset=utf-8"
+        )
+        lines = [json.loads(line) for line in streamed(response).splitlines()]
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(
+            lines[0],
+            {
+                "order": self.order.id,
+                "created_at": self.order.created_at.isoformat(),
+                "ticket": self.tickets[2].id,
+                "flight": self.flight.id,
+                "route": self.flight.route.code,
+                "departure_time": self.flight.departure_time.isoformat(),
+                "arrival_time": self.flight.arrival_time.isoformat(),
+                "row": 1,
+                "seat": 1,
+                "ticket_class": Ticket.ECONOMY,
+                "meal": Meal.VEGETARIAN,
+            },
+        )
+
+    def test_format_from_accept_header(self):
+        response = self.client.get(ORDER_EXPORT_URL, HTTP_ACCEPT="application/x-ndjson")
+
+        self.assertIn('filename="orders.ndjson"', response["Content-Disposition"])
+
+    def test_unknown_format(self):
+        response = self.client.get(ORDER_EXPORT_URL, {"format": "xml"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_auth_required(self):
+        response = APIClient().get(ORDER_EXPORT_URL, {"format": "ndjson"})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("detail", json.loads(response.content))
+
+    def test_manifest_admin_only(self):
+        response = self.client.get(get_manifest_url(self.flight.id))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_manifest(self):
+        self.client.force_authenticate(self.admin)
+
+        response = self.client.get(get_manifest_url(self.flight.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            f'filename="flight-{self.flight.id}-manifest.csv"',
+            response["Content-Disposition"],
+        )
+        rows = list(csv.DictReader(io.StringIO(streamed(response))))
+        self.assertEqual(rows[0]["ticket"], str(self.tickets[2].id))
+        self.assertEqual(
+            {(row["passenger_email"], row["passenger_first_name"]) for row in rows},
+            {("test@test.com", "Sam")},
+        )
+
+    def test_manifest_of_missing_flight(self):
+        self.client.force_authenticate(self.admin)
+
+        response = self.client.get(get_manifest_url(self.flight.id + 1))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(EXPORT_CHUNK_SIZE=1)
+    def test_rows_fetched_lazily(self):
+        response = self.client.get(ORDER_EXPORT_URL)
+        Ticket.objects.filter(id=self.tickets[0].id).delete()
+
+        self.assertEqual(len(streamed(response).splitlines()), 3)
+
+    @override_settings(EXPORT_CHUNK_SIZE=1)
+    async def test_asgi_rows_streamed_asynchronously(self):
+        headers = {"authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+
+        response = await self.async_client.get(ORDER_EXPORT_URL, headers=headers)
+        await Ticket.objects.filter(id=self.tickets[0].id).adelete()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        self.assertEqual(len((await astreamed(response)).splitlines()), 3)
@@ -0,0 +1,283 @@
+import time
+
+import fakeredis
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from flight.holds import (
+    InMemorySeatHoldBackend,
+    RedisSeatHoldBackend,
+    SeatHoldSweeper,
+    SeatsUnavailable,
+    get_seat_hold_backend,
+    new_hold,
+)
+from flight.models import Meal, Ticket
+from flight.tests.test_flight_api import sample_flight
+
+SEAT_HOLD_URL = reverse("flight:seat-holds-list")
+ORDER_URL = reverse("flight:order-list")
+
+
+def get_seat_hold_url(token):
+    return reverse("flight:seat-holds-detail", args=[token])
+
+
+class InMemorySeatHoldBackendTests(SimpleTestCase):
+    def make_backend(self):
+        return InMemorySeatHoldBackend()
+
+    def setUp(self):
+        self.backend = self.make_backend()
+
+    def test_hold_and_get(self):
+        hold = new_hold(1, 10, [(2, 1), (1, 1)], ttl=60)
+
+        self.backend.hold(hold)
+
+        self.assertEqual(self.backend.get(hold.token), hold)
+        self.assertEqual(hold.seats, ((1, 1), (2, 1)))
+        self.assertEqual(
+            self.backend.held_seats(10), {(1, 1): hold.token, (2, 1): hold.token}
+        )
+
+    def test_hold_conflict_holds_no_seats(self):
+        first = new_hold(1, 10, [(1, 1)], ttl=60)
+        second = new_hold(2, 10, [(1, 1), (1, 2)], ttl=60)
+        self.backend.hold(first)
+
+        with self.assertRaises(SeatsUnavailable) as error:
+            self.backend.hold(second)
+
+        self.assertEqual(error.exception.seats, [(1, 1)])
+        self.assertIsNone(self.backend.get(second.token))
+        self.assertEqual(self.backend.held_seats(10), {(1, 1): first.token})
+
+    def test_same_seat_on_other_flight_available(self):
+        self.backend.hold(new_hold(1, 10, [(1, 1)], ttl=60))
+
+        self.backend.hold(new_hold(2, 11, [(1, 1)], ttl=60))
+
+        self.assertEqual(len(self.backend.held_seats(11)), 1)
+
+    def test_expired_hold_ignored(self):
+        expired = new_hold(1, 10, [(1, 1)], ttl=60)
+        self.backend.hold(expired)
+        later = expired.expires_at + 1
+
+        self.assertIsNone(self.backend.get(expired.token, now=later))
+        self.assertEqual(self.backend.held_seats(10, now=later), {})
+
+    def test_expired_seat_can_be_held_again(self):
+        self.backend.hold(new_hold(1, 10, [(1, 1)], ttl=0))
+        hold = new_hold(2, 10, [(1, 1)], ttl=60)
+
+        self.backend.hold(hold)
+
+        self.assertEqual(self.backend.held_seats(10), {(1, 1): hold.token})
+
+    def test_release(self):
+        hold = new_hold(1, 10, [(1, 1), (1, 2)], ttl=60)
+        self.backend.hold(hold)
+
+        self.backend.release(hold.token)
+
+        self.assertIsNone(self.backend.get(hold.token))
+        self.assertEqual(self.backend.held_seats(10), {})
+
+    def test_sweep_removes_expired_holds(self):
+        expired = new_hold(1, 10, [(1, 1)], ttl=60)
+        active = new_hold(2, 10, [(1, 2)], ttl=120)
+        self.backend.hold(expired)
+        self.backend.hold(active)
+
+        swept = self.backend.sweep(now=expired.expires_at + 1)
+
+        self.assertEqual(swept, 1)
+        self.assertIsNone(self.backend.get(expired.token, now=0))
+        self.assertEqual(self.backend.held_seats(10), {(1, 2): active.token})
+
+
+class RedisSeatHoldBackendTests(InMemorySeatHoldBackendTests):
+    def make_backend(self):
+        return RedisSeatHoldBackend(client=fakeredis.FakeRedis())
+
+    def test_holds_shared_between_clients(self):
+        server = fakeredis.FakeServer()
+        hold = new_hold(1, 10, [(1, 1)], ttl=60)
+        RedisSeatHoldBackend(client=fakeredis.FakeRedis(server=server)).hold(hold)
+
+        with self.assertRaises(SeatsUnavailable):
+            RedisSeatHoldBackend(client=fakeredis.FakeRedis(server=server)).hold(
+                new_hold(2, 10, [(1, 1)], ttl=60)
+            )
+
+
+class SeatHoldSweeperTests(SimpleTestCase):
+    def test_sweeper_removes_expired_holds(self):
+        backend = InMemorySeatHoldBackend()
+        hold = new_hold(1, 10, [(1, 1)], ttl=0)
+        backend.hold(hold)
+        sweeper = SeatHoldSweeper(backend, interval=0.01)
+
+        sweeper.start()
+        try:
+            deadline = time.monotonic() + 5
+            while backend._holds and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            sweeper.stop()
+            sweeper.join()
+
+        self.assertEqual(backend._holds, {})
+
+
+class SeatHoldApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # a fresh backend for every test
+        holds_settings = override_settings(
+            SEAT_HOLD_BACKEND="flight.holds.InMemorySeatHoldBackend",
+            SEAT_HOLD_SWEEP_INTERVAL=0,
+            SEAT_HOLD_MAX_SEATS=4,
+        )
+        holds_settings.enable()
+        self.addCleanup(holds_settings.disable)
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.other = get_user_model().objects.create_user("other@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+        self.meal = Meal.objects.create()
+
+    def hold_seats(self, seats, client=None):
+        return (client or self.client).post(
+            SEAT_HOLD_URL,
+            {
+                "flight": self.flight.id,
+                "seats": [{"row": row, "seat": seat} for row, seat in seats],
+            },
+            format="json",
+        )
+
+    def order_seats(self, seats, hold=None, client=None):
+        data = {
+            "tickets": [
+                {
+                    "row": row,
+                    "seat": seat,
+                    "flight": self.flight.id,
+                    "meal": self.meal.id,
+                }
+                for row, seat in seats
+            ]
+        }
+        if hold is not None:
+            data["hold"] = hold
+        return (client or self.client).post(ORDER_URL, data, format="json")
+
+    def other_client(self):
+        client = APIClient()
+        client.force_authenticate(self.other)
+        return client
+
+    def test_create_hold(self):
+        response = self.hold_seats([(1, 1), (1, 2)])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["flight"], self.flight.id)
+        self.assertEqual(
+            response.data["seats"], [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}]
+        )
+        self.assertIn("expires_at", response.data)
+        self.assertEqual(
+            set(get_seat_hold_backend().held_seats(self.flight.id)), {(1, 1), (1, 2)}
+        )
+
+    def test_hold_conflict_returns_held_seats(self):
+        self.hold_seats([(1, 1)])
+
+        response = self.hold_seats([(1, 1), (1, 2)], client=self.other_client())
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["seats"], [{"row": 1, "seat": 1}])
+
+    def test_hold_sold_seat_rejected(self):
+        self.order_seats([(1, 1)])
+
+        response = self.hold_seats([(1, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_hold_seat_out_of_range_rejected(self):
+        response = self.hold_seats([(self.flight.airplane.rows + 1, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_hold_too_many_seats_rejected(self):
+        response = self.hold_seats([(1, seat) for seat in range(1, 6)])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_hold_duplicate_seat_rejected(self):
+        response = self.hold_seats([(1, 1), (1, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_retrieve_own_hold_only(self):
+        token = self.hold_seats([(1, 1)]).data["token"]
+
+        own = self.client.get(get_seat_hold_url(token))
+        foreign = self.other_client().get(get_seat_hold_url(token))
+
+        self.assertEqual(own.status_code, status.HTTP_200_OK)
+        self.assertEqual(own.data["token"], token)
+        self.assertEqual(foreign.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_release_hold(self):
+        token = self.hold_seats([(1, 1)]).data["token"]
+
+        response = self.client.delete(get_seat_hold_url(token))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(get_seat_hold_backend().held_seats(self.flight.id), {})
+
+    def test_order_with_hold_releases_it(self):
+        token = self.hold_seats([(1, 1), (1, 2)]).data["token"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.order_seats([(1, 1), (1, 2)], hold=token)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("hold", response.data)
+        self.assertEqual(Ticket.objects.filter(flight=self.flight).count(), 2)
+        self.assertIsNone(get_seat_hold_backend().get(token))
+
+    def test_order_of_held_seat_without_hold_rejected(self):
+        self.hold_seats([(1, 1)])
+
+        response = self.order_seats([(1, 1)], client=self.other_client())
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_order_with_hold_of_other_user_rejected(self):
+        token = self.hold_seats([(1, 1)]).data["token"]
+
+        response = self.order_seats([(1, 1)], hold=token, client=self.other_client())
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("hold", response.data)
+
+    def test_order_with_expired_hold_rejected(self):
+        hold = new_hold(self.user.id, self.flight.id, [(1, 1)], ttl=0)
+        get_seat_hold_backend().hold(hold)
+
+        response = self.order_seats([(1, 1)], hold=hold.token)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("hold", response.data)
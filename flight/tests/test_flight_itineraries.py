@@ -0,0 +1,148 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airplane.tests.test_airplane_api import sample_airplane
+from airport.models import Route
+from airport.tests.test_airport_api import sample_airport
+from airport_API_service.cache import invalidate_model_cache
+from flight.itineraries import itinerary_index
+from flight.models import Flight
+
+ITINERARY_URL = reverse("flight:itineraries-list")
+
+
+class ItineraryApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.day = (timezone.now() + datetime.timedelta(days=1)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self.airplane = sample_airplane()
+        kbp, lhr, jfk = (
+            sample_airport(airport_code=code) for code in ("KBP", "LHR", "JFK")
+        )
+        self.kbp_lhr = Route.objects.create(source=kbp, destination=lhr, distance=2100)
+        self.lhr_jfk = Route.objects.create(source=lhr, destination=jfk, distance=5500)
+        self.kbp_jfk = Route.objects.create(source=kbp, destination=jfk, distance=7500)
+
+        self.first_leg = self.sample_flight(self.kbp_lhr, 10, 12)
+        self.short_connection = self.sample_flight(self.lhr_jfk, 12.5, 14)
+        self.long_connection = self.sample_flight(self.lhr_jfk, 13.5, 15)
+        self.direct = self.sample_flight(self.kbp_jfk, 11, 16)
+
+    def sample_flight(self, route, departure_hour, arrival_hour):
+        return Flight.objects.create(
+            route=route,
+            airplane=self.airplane,
+            departure_time=self.day + datetime.timedelta(hours=departure_hour),
+            arrival_time=self.day + datetime.timedelta(hours=arrival_hour),
+        )
+
+    def search(self, **params):
+        params = {
+            "source": "KBP",
+            "destination": "JFK",
+            "departure_after": self.day.isoformat(),
+            **params,
+        }
+        response = self.client.get(ITINERARY_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [[leg["id"] for leg in itinerary["legs"]] for itinerary in response.data]
+
+    def test_itineraries_ordered_by_arrival(self):
+        self.assertEqual(
+            self.search(),
+            [[self.first_leg.id, self.long_connection.id], [self.direct.id]],
+        )
+
+    def test_min_connection(self):
+        self.assertEqual(
+            self.search(min_connection=20)[0],
+            [self.first_leg.id, self.short_connection.id],
+        )
+
+    def test_max_connections(self):
+        self.assertEqual(self.search(max_connections=0), [[self.direct.id]])
+
+    def test_departure_window(self):
+        self.assertEqual(
+            self.search(
+                departure_before=(self.day + datetime.timedelta(hours=10.5)).isoformat()
+            ),
+            [[self.first_leg.id, self.long_connection.id]],
+        )
+
+    def test_index_updated_on_flight_changes(self):
+        self.search()
+        with self.captureOnCommitCallbacks(execute=True):
+            earlier = self.sample_flight(self.kbp_jfk, 9, 11)
+            self.direct.delete()
+
+        self.assertEqual(
+            self.search(),
+            [[earlier.id], [self.first_leg.id, self.long_connection.id]],
+        )
+
+    def test_index_updated_on_route_changes(self):
+        self.search()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lhr_jfk.destination = sample_airport(airport_code="CDG")
+            self.lhr_jfk.save()
+
+        self.assertEqual(self.search(), [[self.direct.id]])
+        self.assertEqual(
+            self.search(destination="CDG"),
+            [[self.first_leg.id, self.long_connection.id]],
+        )
+
+    def test_index_not_updated_before_commit(self):
+        self.search()
+        direct_id = self.direct.id
+        with self.captureOnCommitCallbacks():
+            self.direct.delete()
+
+        self.assertIn(direct_id, itinerary_index.legs)
+
+    def test_index_rebuilt_on_concurrent_changes(self):
+        self.search()
+        # changed by another process, signals are not sent
+        invalidate_model_cache(sender=Flight)
+        (earlier,) = Flight.objects.bulk_create(
+            [
+                Flight(
+                    route=self.kbp_jfk,
+                    airplane=self.airplane,
+                    departure_time=self.day + datetime.timedelta(hours=9),
+                    arrival_time=self.day + datetime.timedelta(hours=10),
+                )
+            ]
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.direct.delete()
+
+        self.assertEqual(
+            self.search(),
+            [[earlier.id], [self.first_leg.id, self.long_connection.id]],
+        )
+
+    def test_unknown_airport(self):
+        self.assertEqual(self.search(destination="XXX"), [])
+
+    def test_source_and_destination_required(self):
+        response = self.client.get(ITINERARY_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -9,7 +9,7 @@ from django.test import TestCase
 from airplane.models import AirplaneType, Airline, Airplane
 from airplane.tests.test_airplane_api import sample_airplane
 from airport.tests.test_airport_api import sample_route
-from flight.models import Crew, Flight, Meal, Order, Ticket
+from flight.models import Crew, Flight, Meal, Order, Ticket, SeatInventory
 
 
 class FlightModelsTests(TestCase):
@@ -128,3 +128,107 @@ class FlightModelsTests(TestCase):
             Ticket.validate_ticket(
                 row=31, seat=8, airplane=airplane, error_to_raise=ValidationError
             )
+
+    def test_seat_inventory_created_with_flight(self):
+        flight = Flight.objects.first()
+
+        self.assertEqual(flight.inventory.tickets_sold, 1)
+
+    def test_seat_inventory_follows_tickets(self):
+        flight = Flight.objects.first()
+        order = Order.objects.first()
+        meal = Meal.objects.first()
+
+        ticket = Ticket.objects.create(
+            row=1, seat=2, flight=flight, order=order, meal=meal, ticket_class="ECONOMY"
+        )
+        self.assertEqual(SeatInventory.objects.get(flight=flight).tickets_sold, 2)
+
+        ticket.delete()
+        self.assertEqual(SeatInventory.objects.get(flight=flight).tickets_sold, 1)
+
+        order.delete()
+        self.assertEqual(SeatInventory.objects.get(flight=flight).tickets_sold, 0)
+
+    def test_seat_map_follows_tickets(self):
+        flight = Flight.objects.first()
+        order = Order.objects.first()
+        meal = Meal.objects.first()
+        seats_in_row = flight.airplane.seats_in_row
+
+        ticket = Ticket.objects.create(
+            row=2, seat=3, flight=flight, order=order, meal=meal, ticket_class="ECONOMY"
+        )
+        inventory = SeatInventory.objects.get(flight=flight)
+        self.assertTrue(inventory.is_taken(1, 1, seats_in_row))
+        self.assertTrue(inventory.is_taken(2, 3, seats_in_row))
+        self.assertFalse(inventory.is_taken(2, 4, seats_in_row))
+
+        ticket.delete()
+        inventory.refresh_from_db()
+        self.assertFalse(inventory.is_taken(2, 3, seats_in_row))
+
+    def test_seat_map_follows_edited_ticket(self):
+        flight = Flight.objects.first()
+        seats_in_row = flight.airplane.seats_in_row
+        ticket = Ticket.objects.get(row=1, seat=1)
+
+        ticket.row, ticket.seat = 2, 3
+        ticket.save()
+
+        inventory = SeatInventory.objects.get(flight=flight)
+        self.assertFalse(inventory.is_taken(1, 1, seats_in_row))
+        self.assertTrue(inventory.is_taken(2, 3, seats_in_row))
+        self.assertEqual(inventory.tickets_sold, 1)
+
+    def test_seat_map_follows_updated_tickets(self):
+        flight = Flight.objects.first()
+        seats_in_row = flight.airplane.seats_in_row
+
+        Ticket.objects.filter(flight=flight).update(seat=4)
+
+        inventory = SeatInventory.objects.get(flight=flight)
+        self.assertFalse(inventory.is_taken(1, 1, seats_in_row))
+        self.assertTrue(inventory.is_taken(1, 4, seats_in_row))
+        self.assertEqual(inventory.tickets_sold, 1)
+
+    def test_seat_map_follows_resized_airplane(self):
+        flight = Flight.objects.first()
+        airplane = flight.airplane
+        Ticket.objects.create(
+            row=2,
+            seat=1,
+            flight=flight,
+            order=Order.objects.first(),
+            meal=Meal.objects.first(),
+        )
+
+        airplane.seats_in_row += 1
+        airplane.save()
+
+        inventory = SeatInventory.objects.get(flight=flight)
+        self.assertTrue(inventory.is_taken(1, 1, airplane.seats_in_row))
+        self.assertTrue(inventory.is_taken(2, 1, airplane.seats_in_row))
+        self.assertFalse(
+            inventory.is_taken(1, airplane.seats_in_row, airplane.seats_in_row)
+        )
+
+    def test_validate_ticket_rejects_taken_seat(self):
+        flight = Flight.objects.first()
+
+        with self.assertRaises(ValidationError):
+            Ticket.validate_ticket(
+                row=1,
+                seat=1,
+                airplane=flight.airplane,
+                error_to_raise=ValidationError,
+                flight=flight,
+            )
+
+        Ticket.validate_ticket(
+            row=1,
+            seat=2,
+            airplane=flight.airplane,
+            error_to_raise=ValidationError,
+            flight=flight,
+        )
@@ -0,0 +1,138 @@
+import datetime
+from itertools import permutations
+
+from django.db import connection
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from airplane.models import Airline, Airplane, AirplaneType
+from airport.models import Airport, City, Country, Route
+from flight.models import Flight
+from flight.views import FlightViewSet
+
+FILTERS = {
+    "source": {"source": "AAA"},
+    "destination": {"destination": "AAB"},
+    "source_destination": {"source": "AAA", "destination": "AAB"},
+    "dates": {"date_from": "2023-03-10", "date_to": "2023-03-11"},
+    "airline": {"airline": "{airline}"},
+    "min_tickets_available": {"min_tickets_available": 100},
+    "source_dates": {
+        "source": "AAA",
+        "date_from": "2023-03-10",
+        "date_to": "2023-03-11",
+    },
+    "airline_dates": {
+        "airline": "{airline}",
+        "date_from": "2023-03-10",
+        "date_to": "2023-03-11",
+    },
+    "all": {
+        "source": "AAA",
+        "destination": "AAB",
+        "date_from": "2023-03-01",
+        "date_to": "2023-03-31",
+        "airline": "{airline}",
+        "min_tickets_available": 100,
+    },
+}
+
+
+ROUTE_INDEX = "flight_route_departure_idx"
+AIRPLANE_INDEX = "flight_airplane_departure_idx"
+DEPARTURE_INDEX = "flight_departure_idx"
+
+# indexes the flights of a filter may be read from, a day of departures is
+# as narrow as the flights of one route
+FILTER_INDEXES = {
+    "source": {ROUTE_INDEX},
+    "destination": {ROUTE_INDEX},
+    "source_destination": {ROUTE_INDEX},
+    "dates": {DEPARTURE_INDEX},
+    "airline": {AIRPLANE_INDEX},
+    "min_tickets_available": {DEPARTURE_INDEX},
+    "source_dates": {ROUTE_INDEX, DEPARTURE_INDEX},
+    "airline_dates": {AIRPLANE_INDEX},
+    "all": {ROUTE_INDEX, DEPARTURE_INDEX},
+}
+
+
+class FlightQueryPlanTests(TestCase):
+    """Every flight filter combination is answered from an index"""
+
+    @classmethod
+    def setUpTestData(cls):
+        country = Country.objects.create(name="test_country")
+        city = City.objects.create(name="test_city", country=country)
+        airports = Airport.objects.bulk_create(
+            Airport(name=f"test_airport_{code}", airport_code=code, city=city)
+            for code in (f"AA{chr(ord('A') + index)}" for index in range(10))
+        )
+        routes = Route.objects.bulk_create(
+            Route(source=source, destination=destination, distance=1000)
+            for source, destination in permutations(airports, 2)
+        )
+
+        airplane_type = AirplaneType.objects.create(name="test_type")
+        airlines = Airline.objects.bulk_create(
+            Airline(name=f"test_airline_{index}") for index in range(5)
+        )
+        cls.airline = airlines[0]
+        airplanes = Airplane.objects.bulk_create(
+            Airplane(
+                name=f"test_airplane_{index}",
+                rows=30,
+                seats_in_row=6,
+                airplane_type=airplane_type,
+                airline=airlines[index % len(airlines)],
+            )
+            for index in range(20)
+        )
+
+        start = datetime.datetime(2023, 1, 1)
+        flights = []
+        for index in range(3000):
+            departure_time = start + datetime.timedelta(hours=index)
+            flights.append(
+                Flight(
+                    route=routes[index % len(routes)],
+                    airplane=airplanes[index % len(airplanes)],
+                    departure_time=departure_time,
+                    arrival_time=departure_time + datetime.timedelta(hours=2),
+                )
+            )
+        Flight.objects.bulk_create(flights)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def get_queryset(self, params):
+        request = Request(APIRequestFactory().get("/", params))
+        view = FlightViewSet(request=request, action="list", format_kwarg=None)
+        return view.get_queryset().order_by("departure_time", "id")[:20]
+
+    def assert_index_scan(self, plan, indexes):
+        table = Flight._meta.db_table
+        if connection.vendor == "postgresql":
+            # bitmap heap scans name their index on the line below
+            self.assertNotIn(f"Seq Scan on {table}", plan)
+            lines = [plan]
+        else:
+            lines = [line for line in plan.splitlines() if f" {table} " in line]
+        self.assertTrue(lines)
+        for line in lines:
+            self.assertTrue(
+                any(index in line for index in indexes),
+                f"{line} uses none of {indexes}",
+            )
+
+    def test_filters_use_index_scan(self):
+        for name, params in FILTERS.items():
+            params = {
+                key: str(value).format(airline=self.airline.id)
+                for key, value in params.items()
+            }
+            with self.subTest(name):
+                plan = self.get_queryset(params).explain()
+                self.assert_index_scan(plan, FILTER_INDEXES[name])
@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from flight.models import Crew, Meal, Order, Ticket
+from flight.tests.test_flight_api import sample_flight
+
+FLIGHT_URL = reverse("flight:flight-list")
+ORDER_URL = reverse("flight:order-list")
+
+
+class FlightValuesSerializerParityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.flights = [sample_flight() for _ in range(3)]
+        captain = Crew.objects.create(
+            first_name="Kali", last_name="White", position="Captain"
+        )
+        pilot = Crew.objects.create(
+            first_name="Iryna", last_name="Koval", position="Pilot"
+        )
+        self.flights[0].crew_members.add(pilot, captain)
+        self.flights[1].crew_members.add(captain)
+
+        meal = Meal.objects.create(meal=Meal.VEGETARIAN)
+        for flight in self.flights[:2]:
+            order = Order.objects.create(user=self.user)
+            Ticket.objects.create(row=2, seat=1, flight=flight, order=order, meal=meal)
+            Ticket.objects.create(
+                row=1,
+                seat=3,
+                flight=flight,
+                order=order,
+                meal=meal,
+                ticket_class=Ticket.BUSINESS,
+            )
+        Order.objects.create(user=self.user)
+
+    def get(self, url, fast, params=None):
+        cache.clear()
+        with override_settings(FAST_LIST_SERIALIZERS=fast):
+            return self.client.get(url, params)
+
+    def assert_parity(self, url, params=None):
+        fast = self.get(url, fast=True, params=params)
+        plain = self.get(url, fast=False, params=params)
+
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, plain.content)
+        return fast
+
+    def test_flight_list_parity(self):
+        response = self.assert_parity(FLIGHT_URL)
+
+        flight = next(
+            item
+            for item in response.json()["results"]
+            if item["id"] == self.flights[0].id
+        )
+        self.assertEqual(flight["crew_members"], ["Kali White", "Iryna Koval"])
+        self.assertEqual(flight["tickets_available"], 238)
+
+    def test_paginated_flight_list_parity(self):
+        first_page = self.assert_parity(FLIGHT_URL, {"page_size": 2})
+
+        self.assert_parity(first_page.json()["next"])
+
+    def test_filtered_flight_list_parity(self):
+        route = self.flights[0].route
+
+        self.assert_parity(
+            FLIGHT_URL,
+            {"source": route.source.airport_code, "min_tickets_available": 1},
+        )
+
+    def test_order_list_parity(self):
+        response = self.assert_parity(ORDER_URL)
+
+        tickets = response.json()["results"][1]["tickets"]
+        self.assertEqual([ticket["row"] for ticket in tickets], [1, 2])
+        self.assertEqual(response.json()["results"][0]["tickets"], [])
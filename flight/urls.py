@@ -1,13 +1,50 @@
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, include, re_path
 from rest_framework import routers
 
-from .views import CrewViewSet, FlightViewSet, OrderViewSet
+from .views import (
+    CrewViewSet,
+    FlightViewSet,
+    ItineraryViewSet,
+    OrderViewSet,
+    SeatHoldViewSet,
+)
 
 router = routers.DefaultRouter()
 router.register("crew-members", CrewViewSet, basename="crew-members")
 router.register("flights", FlightViewSet)
 router.register("orders", OrderViewSet)
+router.register("itineraries", ItineraryViewSet, basename="itineraries")
+router.register("seat-holds", SeatHoldViewSet, basename="seat-holds")
 
-urlpatterns = [path("", include(router.urls))]
+# served instead of the router views when ASYNC_READ_VIEWS is enabled
+async_urlpatterns = [
+    path(
+        "flights/",
+        FlightViewSet.as_async_view({"get": "list", "post": "create"}),
+        name="flight-list",
+    ),
+    re_path(
+        r"^flights/(?P<pk>[^/.]+)/$",
+        FlightViewSet.as_async_view(
+            {
+                "get": "retrieve",
+                "put": "update",
+                "patch": "partial_update",
+                "delete": "destroy",
+            }
+        ),
+        name="flight-detail",
+    ),
+    re_path(
+        r"^flights/(?P<pk>[^/.]+)/seat-map/$",
+        FlightViewSet.as_async_view({"get": "seat_map"}),
+        name="flight-seat-map",
+    ),
+]
+
+urlpatterns = (async_urlpatterns if settings.ASYNC_READ_VIEWS else []) + [
+    path("", include(router.urls))
+]
 
 app_name = "flight"
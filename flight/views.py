@@ -1,19 +1,60 @@
-from django.db.models import F, Count
-from rest_framework import mixins, viewsets
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import IsAuthenticated
+from datetime import datetime, time, timedelta
+
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
-from .models import Crew, Flight, Order
+from airplane.models import Airline, AirplaneType
+from airport_API_service.conditional import (
+    ConditionalListModelMixin,
+    ConditionalRetrieveModelMixin,
+)
+from airport_API_service.renderers import CSVRenderer, NDJSONRenderer
+from airport_API_service.throttling import ScopedSlidingWindowThrottle
+from airport_API_service.views import AsyncReadMixin, ValuesListModelMixin
+from .exports import MANIFEST_COLUMNS, ORDER_COLUMNS, export_response
+from .holds import SeatsUnavailable, get_seat_hold_backend
+from .itineraries import itinerary_index
+from .models import Crew, Flight, Order, Ticket
+from .pagination import FlightPagination, OrderPagination
 from .permissions import IsAdminOrIfAuthenticatedReadOnly
 from .serializers import (
     CrewSerializer,
     FlightSerializer,
     FlightListSerializer,
+    FlightListValuesSerializer,
     OrderSerializer,
     OrderListSerializer,
+    OrderListValuesSerializer,
     FlightDetailSerializer,
+    FlightFilterSerializer,
+    FlightSeatMapSerializer,
+    ItinerarySearchSerializer,
+    ItinerarySerializer,
     OrderDetailSerializer,
+    SeatHoldSerializer,
+)
+
+
+EXPORT_RENDERERS = (CSVRenderer, NDJSONRenderer)
+
+export_schema = extend_schema(
+    parameters=[
+        OpenApiParameter(
+            "format",
+            str,
+            enum=[renderer.format for renderer in EXPORT_RENDERERS],
+            description="Export format, CSV by default (or use the Accept header)",
+        )
+    ],
+    responses={200: OpenApiTypes.STR},
 )
 
 
@@ -23,22 +64,83 @@ class CrewViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
 
-class FlightViewSet(viewsets.ModelViewSet):
+class FlightViewSet(
+    ConditionalListModelMixin,
+    ConditionalRetrieveModelMixin,
+    ValuesListModelMixin,
+    AsyncReadMixin,
+    viewsets.ModelViewSet,
+):
     queryset = (
         Flight.objects.select_related(
-            "route__source__city__country",
+            "route",
             "airplane",
-            "route__destination__city__country",
+            "inventory",
         )
         .prefetch_related("crew_members")
         .annotate(
             tickets_available=(
-                F("airplane__rows") * F("airplane__seats_in_row") - Count("ticket")
+                F("airplane__rows") * F("airplane__seats_in_row")
+                - Coalesce("inventory__tickets_sold", 0)
             )
         )
     )
     serializer_class = FlightSerializer
+    values_serializer_class = FlightListValuesSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    pagination_class = FlightPagination
+    conditional_lookups = (
+        "updated_at",
+        "inventory__updated_at",
+        "route__updated_at",
+        "airplane__updated_at",
+    )
+    conditional_models = (Crew, Airline, AirplaneType)
+
+    def get_queryset(self):
+        if self.action == "manifest":
+            return Flight.objects.all()
+
+        queryset = super().get_queryset()
+
+        if self.action != "list":
+            return queryset
+
+        filters = FlightFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+        params = filters.validated_data
+
+        if "source" in params:
+            queryset = queryset.filter(
+                route__source__airport_code=params["source"].upper()
+            )
+
+        if "destination" in params:
+            queryset = queryset.filter(
+                route__destination__airport_code=params["destination"].upper()
+            )
+
+        if "date_from" in params:
+            queryset = queryset.filter(
+                departure_time__gte=datetime.combine(params["date_from"], time.min)
+            )
+
+        if "date_to" in params:
+            queryset = queryset.filter(
+                departure_time__lt=datetime.combine(
+                    params["date_to"] + timedelta(days=1), time.min
+                )
+            )
+
+        if "airline" in params:
+            queryset = queryset.filter(airplane__airline_id=params["airline"])
+
+        if "min_tickets_available" in params:
+            queryset = queryset.filter(
+                tickets_available__gte=params["min_tickets_available"]
+            )
+
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -47,15 +149,127 @@ class FlightViewSet(viewsets.ModelViewSet):
         if self.action == "retrieve":
             return FlightDetailSerializer
 
+        if self.action == "seat_map":
+            return FlightSeatMapSerializer
+
         return FlightSerializer
 
+    @extend_schema(parameters=[FlightFilterSerializer])
+    def list(self, request, *args, **kwargs):
+        """List of flights with filters by airports, dates and airline"""
+        return super().list(request, *args, **kwargs)
+
+    @action(methods=["GET"], detail=True, url_path="seat-map")
+    def seat_map(self, request, pk=None):
+        """Packed seat occupancy of specific flight"""
+        flight = self.get_object()
+        serializer = self.get_serializer(flight)
 
-class OrderPagination(PageNumberPagination):
-    page_size = 10
-    max_page_size = 100
+        return Response(serializer.data)
+
+    async def aseat_map(self, request, pk=None):
+        serializer = self.get_serializer(await self.aget_object())
+        return Response(serializer.data)
+
+    @export_schema
+    @action(
+        methods=["GET"],
+        detail=True,
+        permission_classes=(IsAdminUser,),
+        renderer_classes=EXPORT_RENDERERS,
+    )
+    def manifest(self, request, pk=None):
+        """Passenger manifest of specific flight, streamed as CSV or NDJSON"""
+        flight = self.get_object()
+        tickets = Ticket.objects.filter(flight=flight).order_by("row", "seat")
+
+        return export_response(
+            request, tickets, MANIFEST_COLUMNS, f"flight-{flight.id}-manifest"
+        )
+
+
+class ItineraryViewSet(GenericViewSet):
+    serializer_class = ItinerarySerializer
+    permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_classes = (ScopedSlidingWindowThrottle,)
+    throttle_scope = "search"
+
+    @extend_schema(parameters=[ItinerarySearchSerializer])
+    def list(self, request):
+        """Direct and connecting flights between two airports"""
+        search = ItinerarySearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+
+        paths = itinerary_index.search(**search.validated_data)
+        flights = Flight.objects.select_related("route").in_bulk(
+            {leg.flight_id for path in paths for leg in path}
+        )
+
+        itineraries = [
+            {
+                "departure_time": path[0].departure_time,
+                "arrival_time": path[-1].arrival_time,
+                "connections": len(path) - 1,
+                "legs": [flights[leg.flight_id] for leg in path],
+            }
+            for path in paths
+            if all(leg.flight_id in flights for leg in path)
+        ]
+        serializer = self.get_serializer(itineraries, many=True)
+
+        return Response(serializer.data)
+
+
+HOLD_TOKEN_PARAMETER = OpenApiParameter("token", str, OpenApiParameter.PATH)
+
+
+class SeatHoldViewSet(GenericViewSet):
+    serializer_class = SeatHoldSerializer
+    permission_classes = (IsAuthenticated,)
+    lookup_field = "token"
+
+    def get_hold(self, token):
+        hold = get_seat_hold_backend().get(token)
+        if hold is None or hold.user_id != self.request.user.id:
+            raise NotFound("hold has expired or does not exist")
+        return hold
+
+    @extend_schema(
+        responses={
+            201: SeatHoldSerializer,
+            409: OpenApiResponse(description="Seats are held by another customer"),
+        }
+    )
+    def create(self, request):
+        """Reserve seats of a flight for SEAT_HOLD_TTL seconds"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            serializer.save()
+        except SeatsUnavailable as error:
+            return Response(
+                {
+                    "detail": "seats are held by another customer",
+                    "seats": [{"row": row, "seat": seat} for row, seat in error.seats],
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(parameters=[HOLD_TOKEN_PARAMETER])
+    def retrieve(self, request, token=None):
+        return Response(self.get_serializer(self.get_hold(token)).data)
+
+    @extend_schema(parameters=[HOLD_TOKEN_PARAMETER])
+    def destroy(self, request, token=None):
+        """Release held seats before the hold expires"""
+        get_seat_hold_backend().release(self.get_hold(token).token)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class OrderViewSet(
+    ValuesListModelMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -63,12 +277,16 @@ class OrderViewSet(
 ):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    values_serializer_class = OrderListValuesSerializer
     permission_classes = (IsAuthenticated,)
     pagination_class = OrderPagination
+    throttle_scope = "orders"
 
     def get_queryset(self):
-        queryset = Order.objects.filter(user=self.request.user).prefetch_related(
-            "tickets__meal", "tickets__flight__route__source__city__country", "tickets"
+        queryset = Order.objects.filter(user_id=self.request.user.id).prefetch_related(
+            "tickets__meal",
+            "tickets__flight__route",
+            "tickets",
         )
         return queryset
 
@@ -81,5 +299,21 @@ class OrderViewSet(
 
         return OrderSerializer
 
+    @export_schema
+    @action(methods=["GET"], detail=False, renderer_classes=EXPORT_RENDERERS)
+    def export(self, request):
+        """Tickets of all orders of the user, streamed as CSV or NDJSON"""
+        tickets = Ticket.objects.filter(order__user_id=request.user.id).order_by(
+            "-order__created_at", "-order_id", "row", "seat"
+        )
+
+        return export_response(request, tickets, ORDER_COLUMNS, "orders")
+
+    def get_throttles(self):
+        if self.action == "create":
+            return super().get_throttles() + [ScopedSlidingWindowThrottle()]
+
+        return super().get_throttles()
+
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
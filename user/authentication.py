@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+# user fields copied into tokens
+TOKEN_USER_CLAIMS = ("email", "is_staff", "is_superuser")
+
+
+def _claims_key(user_id):
+    return f"jwt-claims:{user_id}"
+
+
+def user_claims(user):
+    return {claim: getattr(user, claim) for claim in TOKEN_USER_CLAIMS}
+
+
+def add_user_claims(token, user):
+    for claim, value in user_claims(user).items():
+        token[claim] = value
+    return token
+
+
+def _store_claims(user_id, claims):
+    # tokens issued before then have expired
+    timeout = api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+    cache.set(_claims_key(user_id), claims, timeout)
+
+
+def publish_user_claims(user):
+    """Reject tokens of `user` carrying other claims than the current ones"""
+    _store_claims(user.pk, user_claims(user))
+
+
+def revoke_user_tokens(user_id):
+    """Reject every token of the user"""
+    _store_claims(user_id, {})
+
+
+def load_user_claims(user_id):
+    """Claims of the user from the database, empty for inactive and deleted ones"""
+    user = (
+        get_user_model()
+        .objects.filter(pk=user_id, is_active=True)
+        .only(*TOKEN_USER_CLAIMS)
+        .first()
+    )
+    claims = user_claims(user) if user is not None else {}
+    # claims published meanwhile are newer
+    timeout = api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+    cache.add(_claims_key(user_id), claims, timeout)
+    return claims
+
+
+def is_token_revoked(token):
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        return True
+
+    claims = cache.get(_claims_key(user_id))
+    if claims is None:
+        # evicted or never published, e.g. by another process
+        claims = load_user_claims(user_id)
+
+    return not claims or any(
+        token.get(claim) != value for claim, value in claims.items()
+    )
+
+
+class ClaimsUser(TokenUser):
+    """User backed by the claims of a token, see `TOKEN_USER_CLAIMS`"""
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+
+class ValidatedTokenCache:
+    """LRU of validated tokens by their raw value, dropped once expired"""
+
+    def __init__(self, size):
+        self.size = size
+        self.lock = threading.Lock()
+        self.tokens = OrderedDict()
+
+    def get(self, raw_token):
+        with self.lock:
+            token = self.tokens.get(raw_token)
+            if token is None:
+                return None
+            if token["exp"] <= time.time():
+                del self.tokens[raw_token]
+                return None
+            self.tokens.move_to_end(raw_token)
+            return token
+
+    def set(self, raw_token, token):
+        with self.lock:
+            self.tokens[raw_token] = token
+            self.tokens.move_to_end(raw_token)
+            while len(self.tokens) > self.size:
+                self.tokens.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.tokens.clear()
+
+
+validated_tokens = ValidatedTokenCache(settings.JWT_VALIDATED_TOKEN_CACHE_SIZE)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticate with the claims of the token, without loading the user.
+
+    Decoded tokens are kept in a small LRU. Tokens with outdated claims
+    or of inactive and deleted users are rejected by the claims published
+    to the cache on every user change, so requests only query the database
+    when the claims of a user are missing from the cache. The cache must
+    be shared by all processes, see `JWT_STATELESS_AUTH`.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = validated_tokens.get(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            validated_tokens.set(raw_token, token)
+
+        return token
+
+    def get_user(self, validated_token):
+        if is_token_revoked(validated_token):
+            raise AuthenticationFailed(
+                _("Token has been revoked"), code="token_revoked"
+            )
+
+        return ClaimsUser(validated_token)
@@ -0,0 +1,15 @@
+from drf_spectacular.contrib import rest_framework_simplejwt as simplejwt_schema
+
+
+class StatelessJWTScheme(simplejwt_schema.SimpleJWTScheme):
+    target_class = "user.authentication.StatelessJWTAuthentication"
+
+
+class TokenObtainPairSerializerExtension(
+    simplejwt_schema.TokenObtainPairSerializerExtension
+):
+    target_class = "user.serializers.TokenObtainPairSerializer"
+
+
+class TokenRefreshSerializerExtension(simplejwt_schema.TokenRefreshSerializerExtension):
+    target_class = "user.serializers.TokenRefreshSerializer"
@@ -1,5 +1,10 @@
 from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from user.authentication import add_user_claims, is_token_revoked
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -22,3 +27,21 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    """Token pair carrying the user claims `StatelessJWTAuthentication` uses"""
+
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """Refuse to refresh tokens with outdated claims"""
+
+    def validate(self, attrs):
+        if is_token_revoked(self.token_class(attrs["refresh"])):
+            raise InvalidToken(_("Token has been revoked"))
+
+        return super().validate(attrs)
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import publish_user_claims, revoke_user_tokens
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def publish_token_claims(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    if instance.is_active:
+        publish_user_claims(instance)
+    else:
+        revoke_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_tokens(sender, instance, **kwargs):
+    revoke_user_tokens(instance.pk)
@@ -0,0 +1,204 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from flight.tests.test_flight_api import sample_crew_member
+from user.authentication import (
+    ClaimsUser,
+    StatelessJWTAuthentication,
+    ValidatedTokenCache,
+    validated_tokens,
+)
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+REFRESH_URL = reverse("user:token_refresh")
+ME_URL = reverse("user:manage")
+CREW_URL = reverse("flight:crew-members-list")
+COUNTRY_URL = reverse("airport:country-list")
+
+
+class StatelessAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        validated_tokens.clear()
+        authentication = mock.patch.object(
+            APIView, "authentication_classes", [StatelessJWTAuthentication]
+        )
+        authentication.start()
+        self.addCleanup(authentication.stop)
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+
+    def obtain_tokens(self, email="test@test.com", password="testpass"):
+        response = self.client.post(TOKEN_URL, {"email": email, "password": password})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def authenticate(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_token_carries_user_claims(self):
+        self.authenticate(self.obtain_tokens()["access"])
+
+        response = self.client.get(CREW_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user = response.wsgi_request.user
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(
+            (user.id, user.email, user.is_staff),
+            (self.user.id, "test@test.com", False),
+        )
+
+    def test_no_user_query(self):
+        self.authenticate(self.obtain_tokens()["access"])
+        sample_crew_member()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(CREW_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        table = get_user_model()._meta.db_table
+        self.assertFalse([query for query in queries if table in query["sql"]])
+
+    def test_token_decoded_once(self):
+        access = self.obtain_tokens()["access"]
+        self.authenticate(access)
+
+        first = self.client.get(CREW_URL).wsgi_request.user.token
+        second = self.client.get(CREW_URL).wsgi_request.user.token
+
+        self.assertIs(first, second)
+
+    def test_staff_claim_grants_admin_access(self):
+        get_user_model().objects.create_superuser("admin@test.com", "testpass")
+        self.authenticate(self.obtain_tokens("admin@test.com")["access"])
+
+        response = self.client.post(COUNTRY_URL, {"name": "Spain"})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_invalid_token_rejected(self):
+        self.authenticate("not-a-token")
+
+        response = self.client.get(CREW_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_changed_claims_revoke_tokens(self):
+        tokens = self.obtain_tokens()
+        self.user.is_staff = True
+        self.user.save()
+
+        self.authenticate(tokens["access"])
+        outdated = self.client.get(CREW_URL)
+        refreshed = self.client.post(REFRESH_URL, {"refresh": tokens["refresh"]})
+        self.authenticate(self.obtain_tokens()["access"])
+        renewed = self.client.get(CREW_URL)
+
+        self.assertEqual(outdated.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(refreshed.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(renewed.status_code, status.HTTP_200_OK)
+        self.assertTrue(renewed.wsgi_request.user.is_staff)
+
+    def test_unchanged_claims_keep_tokens(self):
+        tokens = self.obtain_tokens()
+        self.user.first_name = "Sam"
+        self.user.save()
+
+        self.authenticate(tokens["access"])
+        response = self.client.get(CREW_URL)
+        refreshed = self.client.post(REFRESH_URL, {"refresh": tokens["refresh"]})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(refreshed.status_code, status.HTTP_200_OK)
+
+    def test_inactive_user_rejected(self):
+        self.authenticate(self.obtain_tokens()["access"])
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(CREW_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_rejected(self):
+        self.authenticate(self.obtain_tokens()["access"])
+        self.user.delete()
+
+        response = self.client.get(CREW_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_evicted_claims_loaded_from_database(self):
+        self.authenticate(self.obtain_tokens()["access"])
+        # changed by another process, its published claims evicted since
+        get_user_model().objects.filter(pk=self.user.pk).update(is_staff=True)
+        cache.clear()
+
+        response = self.client.get(CREW_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_rejected_after_eviction(self):
+        self.authenticate(self.obtain_tokens()["access"])
+        self.user.delete()
+        cache.clear()
+
+        response = self.client.get(CREW_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_loaded_claims_cached(self):
+        self.authenticate(self.obtain_tokens()["access"])
+        cache.clear()
+        table = get_user_model()._meta.db_table
+
+        with CaptureQueriesContext(connection) as first:
+            self.client.get(CREW_URL)
+        with CaptureQueriesContext(connection) as second:
+            response = self.client.get(CREW_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue([query for query in first if table in query["sql"]])
+        self.assertFalse([query for query in second if table in query["sql"]])
+
+    def test_manage_user_loads_user(self):
+        self.authenticate(self.obtain_tokens()["access"])
+
+        response = self.client.patch(ME_URL, {"email": "new@test.com"})
+        renewed = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(renewed.data["email"], "new@test.com")
+
+
+class ValidatedTokenCacheTests(SimpleTestCase):
+    def test_least_recently_used_evicted(self):
+        tokens = ValidatedTokenCache(size=2)
+        valid = {"exp": time.time() + 60}
+        tokens.set("a", valid)
+        tokens.set("b", valid)
+        tokens.get("a")
+
+        tokens.set("c", valid)
+
+        self.assertIs(tokens.get("a"), valid)
+        self.assertIsNone(tokens.get("b"))
+        self.assertIs(tokens.get("c"), valid)
+
+    def test_expired_token_dropped(self):
+        tokens = ValidatedTokenCache(size=2)
+        tokens.set("a", {"exp": time.time() - 1})
+
+        self.assertIsNone(tokens.get("a"))
+        self.assertEqual(len(tokens.tokens), 0)